@@ -0,0 +1,32 @@
+"""
+Measure the cost of a memoized call on a cache hit and a cache miss, against calling the version uncached.
+
+Run with: python -m benchmarks.bench_cache
+"""
+
+import timeit
+
+from funcversion import VersionedFunction
+
+NUMBER = 200_000
+
+
+def _price(product_id, quantity):
+    return sum(i * product_id for i in range(50)) * quantity
+
+
+def main() -> None:
+    func = VersionedFunction('benchmarks.bench_cache.price')
+    func.add_version('1.0.0', _price)
+    scale = 1e9 / NUMBER
+    uncached = timeit.timeit(lambda: func(7, 3), number=NUMBER) * scale
+    func.enable_cache(maxsize=None)
+    hit = timeit.timeit(lambda: func(7, 3), number=NUMBER) * scale
+    keys = iter(range(10**9))
+    miss = timeit.timeit(lambda: func(next(keys), 3), number=NUMBER) * scale
+    print(f'{"uncached (ns)":>14}  {"hit (ns)":>9}  {"miss (ns)":>10}')
+    print(f'{uncached:>14.1f}  {hit:>9.1f}  {miss:>10.1f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+"""
+Compare generic and compiled dispatch of the latest version for positional, keyword and method calls.
+
+Run with: python -m benchmarks.bench_compiled
+"""
+
+import timeit
+
+from funcversion import VersionedFunction
+
+NUMBER = 200_000
+REPEAT = 5
+
+
+def _target(a, b, *, scale=1):
+    return (a + b) * scale
+
+
+class _Calculator:
+    def compute(self, a, b):
+        return a + b
+
+
+def _build(name: str, func) -> VersionedFunction:
+    versioned = VersionedFunction(f'benchmarks.bench_compiled.{name}')
+    versioned.add_version('1.0.0', func)
+    versioned.add_version('2.0.0', func)
+    return versioned
+
+
+def _best_ns(stmt) -> float:
+    return min(timeit.repeat(stmt, number=NUMBER, repeat=REPEAT)) / NUMBER * 1e9
+
+
+def _cases(generic: VersionedFunction, compiled: VersionedFunction) -> dict:
+    class Generic:
+        compute = _build('generic_method', _Calculator.compute)
+
+    class Compiled:
+        compute = _build('compiled_method', _Calculator.compute).compile()
+
+    generic_obj, compiled_obj, plain_obj = Generic(), Compiled(), _Calculator()
+    return {
+        'positional': (lambda: _target(1, 2), lambda: generic(1, 2), lambda: compiled(1, 2)),
+        'keyword': (lambda: _target(1, 2, scale=3), lambda: generic(1, 2, scale=3), lambda: compiled(1, 2, scale=3)),
+        'method': (lambda: plain_obj.compute(1, 2), lambda: generic_obj.compute(1, 2), lambda: compiled_obj.compute(1, 2)),
+    }
+
+
+def main() -> None:
+    generic = _build('generic', _target)
+    compiled = _build('compiled', _target).compile()
+
+    print(f'{"call":>10}  {"direct (ns)":>12}  {"generic (ns)":>13}  {"compiled (ns)":>14}')
+    for name, (direct, generic_call, compiled_call) in _cases(generic, compiled).items():
+        print(f'{name:>10}  {_best_ns(direct):>12.1f}  {_best_ns(generic_call):>13.1f}  {_best_ns(compiled_call):>14.1f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,52 @@
+"""
+Measure the per-call overhead of calling the latest version of a VersionedFunction, of calling a pinned
+version, and of calling inside a use_versions() scope, compared to calling the underlying function directly.
+
+Run with: python -m benchmarks.bench_dispatch
+"""
+
+import timeit
+
+from funcversion import VersionedFunction, use_versions
+
+VERSION_COUNTS = (2, 20, 200)
+NUMBER = 100_000
+REPEAT = 5
+
+
+def _target(a, b):
+    return a + b
+
+
+def _build(count: int) -> VersionedFunction:
+    func = VersionedFunction(f'benchmarks.bench_dispatch.func_{count}')
+    for minor in range(count):
+        func.add_version(f'1.{minor}.0', _target)
+    return func
+
+
+def _best_ns(stmt, number: int = NUMBER) -> float:
+    return min(timeit.repeat(stmt, number=number, repeat=REPEAT)) / number * 1e9
+
+
+def main() -> None:
+    direct = _best_ns(lambda: _target(1, 2))
+    print(
+        f'{"versions":>8}  {"direct (ns)":>12}  {"versioned (ns)":>15}  {"pinned (ns)":>12}  {"scoped (ns)":>12}  '
+        f'{"overhead (ns)":>14}'
+    )
+    for count in VERSION_COUNTS:
+        func = _build(count)
+        pinned = func['1.0.0']
+        versioned = _best_ns(lambda: func(1, 2))
+        pinned_ns = _best_ns(lambda: pinned(1, 2))
+        with use_versions({func: '^1.0'}):
+            scoped = _best_ns(lambda: func(1, 2))
+        print(
+            f'{count:>8}  {direct:>12.1f}  {versioned:>15.1f}  {pinned_ns:>12.1f}  {scoped:>12.1f}  '
+            f'{versioned - direct:>14.1f}'
+        )
+
+
+if __name__ == '__main__':
+    main()
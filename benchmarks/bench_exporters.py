@@ -0,0 +1,49 @@
+"""
+Measure how long rendering a scrape takes for thousands of instrumented function versions, when none, some or all
+of them have been called since the previous scrape.
+
+Run with: python -m benchmarks.bench_exporters
+"""
+
+import time
+
+from funcversion import VersionedFunction
+from funcversion.exporters import MetricsExporter
+
+FUNCTIONS = 2_000
+
+
+def _target(x):
+    return x
+
+
+def _build(index: int) -> VersionedFunction:
+    func = VersionedFunction(f'benchmarks.bench_exporters.func_{index}')
+    func.add_version('1.0.0', _target)
+    func.add_version('2.0.0', _target)
+    func.enable_metrics()
+    func(1)
+    func(1, _version='1.0.0')
+    return func
+
+
+def _scrape(exporter: MetricsExporter) -> tuple[float, int]:
+    start = time.perf_counter()
+    size = sum(len(chunk) for chunk in exporter.render())
+    return time.perf_counter() - start, size
+
+
+def main() -> None:
+    funcs = [_build(index) for index in range(FUNCTIONS)]
+    exporter = MetricsExporter()
+    print(f'{FUNCTIONS * 2} series')
+    print(f'{"scrape":>16}  {"time (ms)":>10}  {"size (KiB)":>11}')
+    for label, called in (('first', 0), ('unchanged', 0), ('1% called', FUNCTIONS // 100), ('all called', FUNCTIONS)):
+        for func in funcs[:called]:
+            func(1)
+        elapsed, size = _scrape(exporter)
+        print(f'{label:>16}  {elapsed * 1e3:>10.1f}  {size / 1024:>11,.0f}')
+
+
+if __name__ == '__main__':
+    main()
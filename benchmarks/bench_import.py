@@ -0,0 +1,54 @@
+"""
+Measure the start-up cost of funcversion: importing the package, and decorating thousands of functions.
+
+Every measurement runs in a fresh interpreter, so module and parser caches start out cold.
+
+Run with: python -m benchmarks.bench_import
+"""
+
+import statistics
+import subprocess
+import sys
+
+FUNCTION_COUNTS = (1_000, 5_000)
+REPEAT = 7
+
+_IMPORT_CODE = """
+import time
+start = time.perf_counter()
+import funcversion
+print(time.perf_counter() - start)
+"""
+
+_DECORATE_CODE = """
+import time
+from funcversion import version
+
+def make(i):
+    def func():
+        return i
+    func.__qualname__ = f'func_{{i}}'
+    return func
+
+start = time.perf_counter()
+for i in range({count}):
+    for version_id in ('1.0.0', '1.1.0', '2.0.0-rc1'):
+        version(version_id)(make(i))
+print(time.perf_counter() - start)
+"""
+
+
+def _median_ms(code: str) -> float:
+    timings = [float(subprocess.check_output([sys.executable, '-c', code], text=True)) for _ in range(REPEAT)]
+    return statistics.median(timings) * 1e3
+
+
+def main() -> None:
+    print(f'{"import funcversion":>28}: {_median_ms(_IMPORT_CODE):8.2f} ms')
+    for count in FUNCTION_COUNTS:
+        label = f'decorate {count} x 3 versions'
+        print(f'{label:>28}: {_median_ms(_DECORATE_CODE.format(count=count)):8.2f} ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,46 @@
+"""
+Compare calling a VersionedFunction per record with map() on the serial, thread and process executors.
+
+Run with: python -m benchmarks.bench_map
+"""
+
+import time
+
+from funcversion import version
+
+RECORDS = 1_000_000
+CHUNKSIZE = 10_000
+
+
+@version('1.0.0')
+def transform(record):
+    return record * 2
+
+
+@version('2.0.0')
+def transform(record):
+    return record * 3
+
+
+def _seconds(run) -> float:
+    began = time.perf_counter()
+    run()
+    return time.perf_counter() - began
+
+
+def main() -> None:
+    records = range(RECORDS)
+    cases = {
+        'per-call loop': lambda: [transform(r, _version='1.0.0') for r in records],
+        'map serial': lambda: list(transform.map(records, _version='1.0.0')),
+        'map thread': lambda: list(transform.map(records, _version='1.0.0', executor='thread', chunksize=CHUNKSIZE)),
+        'map process': lambda: list(transform.map(records, _version='1.0.0', executor='process', chunksize=CHUNKSIZE)),
+    }
+    print(f'{"case":>14}  {"seconds":>8}  {"records/s":>12}')
+    for name, run in cases.items():
+        seconds = _seconds(run)
+        print(f'{name:>14}  {seconds:>8.3f}  {RECORDS / seconds:>12,.0f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,46 @@
+"""
+Measure the per-call cost of enabling metrics, for generic and compiled dispatch, and the cost of reading them.
+
+Run with: python -m benchmarks.bench_metrics
+"""
+
+import timeit
+
+from funcversion import VersionedFunction, metrics
+
+NUMBER = 1_000_000
+
+
+def _target(a, b):
+    return a + b
+
+
+def _build(name: str) -> VersionedFunction:
+    func = VersionedFunction(f'benchmarks.bench_metrics.{name}')
+    func.add_version('1.0.0', _target)
+    func.add_version('2.0.0', _target)
+    return func
+
+
+def main() -> None:
+    scale = 1e9 / NUMBER
+    print(f'{"dispatch":>8}  {"disabled (ns)":>14}  {"enabled (ns)":>13}  {"overhead (ns)":>14}')
+    for label, compiled in (('generic', False), ('compiled', True)):
+        func = _build(label)
+        if compiled:
+            func.compile()
+        disabled = timeit.timeit(lambda: func(1, 2), number=NUMBER) * scale
+        func.enable_metrics()
+        enabled = timeit.timeit(lambda: func(1, 2), number=NUMBER) * scale
+        print(f'{label:>8}  {disabled:>14.1f}  {enabled:>13.1f}  {enabled - disabled:>14.1f}')
+
+    for count in (100, 1_000):
+        for i in range(count):
+            func = _build(f'snapshot_{count}_{i}')
+            func.enable_metrics()
+        seconds = timeit.timeit(metrics.snapshot, number=10) / 10
+        print(f'snapshot() of {len(metrics.snapshot())} functions: {seconds * 1e3:.1f} ms')
+
+
+if __name__ == '__main__':
+    main()
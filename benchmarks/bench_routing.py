@@ -0,0 +1,47 @@
+"""
+Measure the per-call cost of weighted traffic splitting, random and sticky, and of adaptive fastest-version
+selection against plain latest-version dispatch.
+
+Run with: python -m benchmarks.bench_routing
+"""
+
+import timeit
+
+from funcversion import VersionedFunction
+
+NUMBER = 1_000_000
+
+
+def _target(a, b):
+    return a + b
+
+
+def _build(name: str, versions: int) -> VersionedFunction:
+    func = VersionedFunction(f'benchmarks.bench_routing.{name}')
+    for major in range(1, versions + 1):
+        func.add_version(f'{major}.0.0', _target)
+    return func
+
+
+def main() -> None:
+    print(f'{"versions":>8}  {"latest (ns)":>12}  {"random (ns)":>12}  {"sticky (ns)":>12}  {"adaptive (ns)":>13}')
+    for versions in (2, 4, 16):
+        func = _build(f'func_{versions}', versions)
+        latest = timeit.timeit(lambda: func(1, 2), number=NUMBER)
+        weights = {f'{major}.0.0': 1 for major in range(1, versions + 1)}
+        func.route(weights)
+        routed = timeit.timeit(lambda: func(1, 2), number=NUMBER)
+        func.route(weights, key=lambda a, b: a)
+        sticky = timeit.timeit(lambda: func(1, 2), number=NUMBER)
+        func.select_fastest(weights)
+        adaptive = timeit.timeit(lambda: func(1, 2), number=NUMBER)
+        func.stop_routing()
+        scale = 1e9 / NUMBER
+        print(
+            f'{versions:>8}  {latest * scale:>12.1f}  {routed * scale:>12.1f}  {sticky * scale:>12.1f}  '
+            f'{adaptive * scale:>13.1f}'
+        )
+
+
+if __name__ == '__main__':
+    main()
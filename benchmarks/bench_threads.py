@@ -0,0 +1,99 @@
+"""
+Measure call throughput of a VersionedFunction as the number of reader threads grows, first with a quiet registry
+and then while a writer thread keeps adding, deprecating and removing versions. Every call is checked, so the
+stress run also fails loudly if a reader ever observes an inconsistent registry.
+
+Throughput only scales with the thread count on free-threaded Python builds (3.13t and later); with the GIL the
+numbers show the cost of contention instead.
+
+Run with: python -m benchmarks.bench_threads
+"""
+
+import sys
+import threading
+import time
+import warnings
+
+from funcversion import VersionedFunction
+
+THREAD_COUNTS = (1, 2, 4, 8)
+CALLS_PER_THREAD = 200_000
+
+
+def _target(a, b):
+    return a + b
+
+
+def _build(name: str) -> VersionedFunction:
+    func = VersionedFunction(f'benchmarks.bench_threads.{name}')
+    for minor in range(10):
+        func.add_version(f'1.{minor}.0', _target)
+    return func
+
+
+def _reader(func: VersionedFunction, start: threading.Barrier, errors: list) -> None:
+    start.wait()
+    try:
+        for i in range(CALLS_PER_THREAD):
+            if func(i, 1) != i + 1 or func(i, 2, _version='^1.0') != i + 2:
+                raise AssertionError('Unexpected result')
+    except Exception as e:  # Reported by the main thread
+        errors.append(e)
+
+
+def _writer(func: VersionedFunction, stop: threading.Event, errors: list) -> None:
+    try:
+        minor = 10
+        while not stop.is_set():
+            version_id = f'1.{minor}.0'
+            func.add_version(version_id, _target)
+            func.deprecate_version(version_id)
+            func.remove_version(version_id)
+            minor += 1
+    except Exception as e:  # Reported by the main thread
+        errors.append(e)
+
+
+def _run(func: VersionedFunction, threads: int, with_writer: bool) -> float:
+    errors: list = []
+    start = threading.Barrier(threads + 1)
+    stop = threading.Event()
+    readers = [threading.Thread(target=_reader, args=(func, start, errors)) for _ in range(threads)]
+    writer = threading.Thread(target=_writer, args=(func, stop, errors))
+    for thread in readers:
+        thread.start()
+    if with_writer:
+        writer.start()
+
+    start.wait()
+    began = time.perf_counter()
+    for thread in readers:
+        thread.join()
+    elapsed = time.perf_counter() - began
+    stop.set()
+    if with_writer:
+        writer.join()
+
+    if errors:
+        raise errors[0]
+    return threads * CALLS_PER_THREAD * 2 / elapsed
+
+
+def main() -> None:
+    gil = getattr(sys, '_is_gil_enabled', lambda: True)()
+    print(f'Python {sys.version.split()[0]}, GIL {"enabled" if gil else "disabled"}')
+    print(f'{"threads":>7}  {"quiet (calls/s)":>16}  {"with writer (calls/s)":>22}  {"scaling":>8}')
+    func = _build('func')
+    baseline = None
+    with warnings.catch_warnings():
+        # Readers may hit a version the writer has just deprecated
+        warnings.simplefilter('ignore', DeprecationWarning)
+        for threads in THREAD_COUNTS:
+            quiet = _run(func, threads, with_writer=False)
+            contended = _run(func, threads, with_writer=True)
+            baseline = baseline or quiet
+            print(f'{threads:>7}  {quiet:>16,.0f}  {contended:>22,.0f}  {quiet / baseline:>7.2f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -1,7 +1,22 @@
 # funcversion/__init__.py
 
-from .core import VersionedFunction
+from .context import use_versions
+from .core import AsyncVersionedFunction, PinnedVersion, VersionedFunction, VersionInfo, freeze, is_frozen, unfreeze
 from .exceptions import VersionNotFoundError
+from .releases import declare_release, use_release
 from .version import version
 
-__all__ = ['VersionedFunction', 'VersionNotFoundError', 'version']
+__all__ = [
+    'AsyncVersionedFunction',
+    'PinnedVersion',
+    'VersionedFunction',
+    'VersionInfo',
+    'VersionNotFoundError',
+    'declare_release',
+    'freeze',
+    'is_frozen',
+    'unfreeze',
+    'use_release',
+    'use_versions',
+    'version',
+]
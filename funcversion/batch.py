@@ -0,0 +1,143 @@
+import os
+from collections import deque
+from itertools import islice
+from typing import TYPE_CHECKING, Any, Callable, Iterable, Iterator, Optional, Union
+
+if TYPE_CHECKING:
+    from concurrent.futures import Executor, Future
+
+# Names accepted for the `executor` argument of VersionedFunction.map()
+EXECUTORS = ('serial', 'thread', 'process')
+
+
+def map_chunks(
+    target: Callable[[Any], Any],
+    remote_target: Callable[[list[Any]], list[Any]],
+    iterable: Iterable[Any],
+    executor: Union[str, 'Executor'],
+    chunksize: int,
+    ordered: bool,
+    max_workers: Optional[int],
+) -> Iterator[Any]:
+    """
+    Apply a resolved version to every item of an iterable, serially or on a thread or process pool.
+
+    Items are submitted in chunks and only a bounded number of chunks is in flight at any time, so arbitrarily
+    long iterables are streamed rather than materialized. Pools created here are shut down once the returned
+    iterator is exhausted or closed; executors passed in are left running.
+
+    Args:
+        target (Callable[[Any], Any]): The callable to apply in this process.
+        remote_target (Callable[[list[Any]], list[Any]]): A picklable callable applying the version to a chunk in
+            a worker process.
+        iterable (Iterable[Any]): The items.
+        executor (Union[str, Executor]): 'serial', 'thread', 'process' or a `concurrent.futures.Executor`.
+        chunksize (int): The number of items submitted to a worker at once.
+        ordered (bool): Yield results in input order, or as soon as their chunk completes.
+        max_workers (int, optional): The pool size; defaults to the number of CPUs.
+
+    Returns:
+        Iterator[Any]: The results.
+
+    Raises:
+        ValueError: If the executor or chunksize is not valid.
+    """
+    if chunksize < 1:
+        raise ValueError(f'chunksize must be at least 1, got {chunksize}.')
+    if executor == 'serial':
+        return map(target, iterable)
+    if isinstance(executor, str) and executor not in EXECUTORS:
+        raise ValueError(f"Unknown executor '{executor}', expected one of {', '.join(EXECUTORS)} or an Executor.")
+    return _map_on_pool(target, remote_target, iterable, executor, chunksize, ordered, max_workers)
+
+
+def _map_on_pool(
+    target: Callable[[Any], Any],
+    remote_target: Callable[[list[Any]], list[Any]],
+    iterable: Iterable[Any],
+    executor: Union[str, 'Executor'],
+    chunksize: int,
+    ordered: bool,
+    max_workers: Optional[int],
+) -> Iterator[Any]:
+    """
+    Stream chunks of items through a pool; see map_chunks().
+    """
+    # Serial maps run without a pool
+    from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+
+    workers = max_workers or os.cpu_count() or 1
+    if executor == 'thread':
+        pool = ThreadPoolExecutor(workers)
+    elif executor == 'process':
+        pool = ProcessPoolExecutor(workers)
+    else:
+        pool = executor
+    chunk_target = remote_target if isinstance(pool, ProcessPoolExecutor) else _chunk_applier(target)
+
+    items = iter(iterable)
+    pending: deque[Future] = deque()
+    try:
+        while True:
+            # Keep every worker busy with one chunk in reserve, without reading further ahead
+            while len(pending) < workers * 2:
+                chunk = list(islice(items, chunksize))
+                if not chunk:
+                    break
+                pending.append(pool.submit(chunk_target, chunk))
+            if not pending:
+                return
+            if ordered:
+                yield from pending.popleft().result()
+            else:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    pending.remove(future)
+                    yield from future.result()
+    finally:
+        for future in pending:
+            future.cancel()
+        if pool is not executor:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+
+def _chunk_applier(target: Callable[[Any], Any]) -> Callable[[list[Any]], list[Any]]:
+    """
+    Return a callable applying `target` to every item of a chunk.
+
+    Args:
+        target (Callable[[Any], Any]): The callable to apply.
+
+    Returns:
+        Callable[[list[Any]], list[Any]]: The chunk callable.
+    """
+
+    def apply(chunk: list[Any]) -> list[Any]:
+        return [target(item) for item in chunk]
+
+    return apply
+
+
+def apply_remote(func_key: str, module: Optional[str], version_id: str, chunk: list[Any]) -> list[Any]:
+    """
+    Apply a version of a registered function to a chunk of items in a worker process.
+
+    The function is looked up in the worker's registry, importing its module first if the worker was spawned
+    rather than forked, so only the function key travels to the worker instead of the implementation.
+
+    Args:
+        func_key (str): The key of the versioned function.
+        module (str, optional): The module registering the function.
+        version_id (str): The resolved version identifier.
+        chunk (list[Any]): The items.
+
+    Returns:
+        list[Any]: The results.
+
+    Raises:
+        VersionNotFoundError: If the function is not registered in the worker.
+    """
+    from .core import _lookup_versioned_function
+
+    target = _lookup_versioned_function(func_key, module)._pin_target(version_id)
+    return [target(item) for item in chunk]
@@ -0,0 +1,296 @@
+import sys
+import threading
+from collections import OrderedDict
+from time import monotonic
+from typing import Any, Callable, Hashable, Optional
+
+# Default number of bytes all version caches in the process may hold together
+DEFAULT_MEMORY_BUDGET = 64 * 2**20
+
+# CO_GENERATOR | CO_ASYNC_GENERATOR, whose results can only be consumed once
+_GENERATOR_CODE_FLAGS = 0x20 | 0x200
+# CO_COROUTINE
+_COROUTINE_CODE_FLAG = 0x80
+
+# Separates positional from keyword arguments in cache keys
+_KWARGS_MARK = object()
+
+# Every cached entry in the process, least recently used first, for enforcing the memory budget
+_entries: OrderedDict['_Entry', None] = OrderedDict()
+# Guards _entries, the budget and the contents of every VersionCache
+_lock = threading.Lock()
+_budget = DEFAULT_MEMORY_BUDGET
+_usage = 0
+
+
+class CachePolicy:
+    """
+    How results of a version are memoized; see `@version(..., cache=...)` and VersionedFunction.enable_cache().
+    """
+
+    __slots__ = ('maxsize', 'ttl')
+
+    def __init__(self, maxsize: Optional[int] = 1024, ttl: Optional[float] = None) -> None:
+        """
+        Initialize the CachePolicy.
+
+        Args:
+            maxsize (int, optional): The maximum number of results kept per version, or None for no limit other
+                than the process-wide memory budget.
+            ttl (float, optional): The seconds after which a result expires, or None to keep it until evicted.
+
+        Raises:
+            ValueError: If maxsize or ttl is not positive.
+        """
+        if maxsize is not None and maxsize < 1:
+            raise ValueError(f'maxsize must be at least 1, got {maxsize}.')
+        if ttl is not None and ttl <= 0:
+            raise ValueError(f'ttl must be positive, got {ttl}.')
+        self.maxsize = maxsize
+        self.ttl = ttl
+
+    def __repr__(self) -> str:
+        """
+        Return a string representation of the CachePolicy.
+        """
+        return f'<CachePolicy maxsize: {self.maxsize} ttl: {self.ttl}>'
+
+
+class _Entry:
+    """
+    A cached result.
+    """
+
+    __slots__ = ('cache', 'key', 'value', 'expires', 'size')
+
+    def __init__(self, cache: 'VersionCache', key: Hashable, value: Any, expires: Optional[float], size: int) -> None:
+        """
+        Initialize the _Entry.
+
+        Args:
+            cache (VersionCache): The cache holding the entry.
+            key (Hashable): The call arguments.
+            value (Any): The result.
+            expires (float, optional): The `time.monotonic()` time the result expires at, if any.
+            size (int): The estimated size in bytes.
+        """
+        self.cache = cache
+        self.key = key
+        self.value = value
+        self.expires = expires
+        self.size = size
+
+
+class VersionCache:
+    """
+    The memoized results of one implementation of a version, keyed by the call arguments.
+
+    Entries are evicted least recently used first, when the version holds `maxsize` results or when all caches
+    together exceed the process-wide memory budget. Sizes are estimated shallowly with `sys.getsizeof()` of the
+    arguments and the result, so the budget bounds the cache bookkeeping rather than deep object graphs. Results
+    are computed outside the lock, so concurrent misses of the same arguments may compute them more than once.
+    """
+
+    def __init__(self, name: str, version_id: str, func: Callable, policy: CachePolicy) -> None:
+        """
+        Initialize the VersionCache.
+
+        Args:
+            name (str): The key of the versioned function.
+            version_id (str): The version identifier.
+            func (Callable): The implementation whose results are cached.
+            policy (CachePolicy): The eviction policy.
+        """
+        self.name: str = name
+        self.version: str = version_id
+        self.func = func
+        self.policy = policy
+        self.hits: int = 0
+        self.misses: int = 0
+        self.nbytes: int = 0
+        self._data: OrderedDict[Hashable, _Entry] = OrderedDict()
+        # Set once the version is removed or re-registered, so calls still in flight don't store their results
+        self._closed = False
+
+    def __len__(self) -> int:
+        """
+        Return the number of cached results.
+        """
+        return len(self._data)
+
+    def wrap(self, target: Callable) -> Callable:
+        """
+        Return a callable serving calls of the implementation from the cache.
+
+        Generator functions are not cached, as their results can only be consumed once, and calls with unhashable
+        arguments bypass the cache.
+
+        Args:
+            target (Callable): The callable invoking the implementation.
+
+        Returns:
+            Callable: The caching callable, or `target` itself if the implementation can't be cached.
+        """
+        flags = getattr(getattr(self.func, '__code__', None), 'co_flags', 0)
+        if flags & _GENERATOR_CODE_FLAGS:
+            return target
+        lookup = self._lookup
+        store = self._store
+
+        if flags & _COROUTINE_CODE_FLAG:
+
+            async def call_async(*args: Any, **kwargs: Any) -> Any:
+                key = (*args, _KWARGS_MARK, *kwargs.items()) if kwargs else args
+                try:
+                    found, value = lookup(key)
+                except TypeError:
+                    return await target(*args, **kwargs)
+                if found:
+                    return value
+                value = await target(*args, **kwargs)
+                store(key, value)
+                return value
+
+            return call_async
+
+        def call(*args: Any, **kwargs: Any) -> Any:
+            key = (*args, _KWARGS_MARK, *kwargs.items()) if kwargs else args
+            try:
+                found, value = lookup(key)
+            except TypeError:
+                # Unhashable arguments
+                return target(*args, **kwargs)
+            if found:
+                return value
+            value = target(*args, **kwargs)
+            store(key, value)
+            return value
+
+        return call
+
+    def clear(self) -> None:
+        """
+        Drop all cached results.
+        """
+        global _usage
+        with _lock:
+            for entry in self._data.values():
+                del _entries[entry]
+                _usage -= entry.size
+            self._data.clear()
+            self.nbytes = 0
+
+    def close(self) -> None:
+        """
+        Drop all cached results and stop caching new ones.
+        """
+        self._closed = True
+        self.clear()
+
+    def _lookup(self, key: Hashable) -> tuple[bool, Any]:
+        """
+        Look up a cached result, marking it as recently used.
+
+        Args:
+            key (Hashable): The call arguments.
+
+        Returns:
+            tuple[bool, Any]: Whether a result was found, and the result.
+
+        Raises:
+            TypeError: If the arguments are unhashable.
+        """
+        with _lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                if entry.expires is None or entry.expires > monotonic():
+                    self._data.move_to_end(key)
+                    _entries.move_to_end(entry)
+                    self.hits += 1
+                    return True, entry.value
+                self._evict(entry)
+            self.misses += 1
+            return False, None
+
+    def _store(self, key: Hashable, value: Any) -> None:
+        """
+        Cache a result, evicting the least recently used results as needed.
+
+        Args:
+            key (Hashable): The call arguments.
+            value (Any): The result.
+        """
+        global _usage
+        size = sys.getsizeof(key) + sys.getsizeof(value)
+        ttl = self.policy.ttl
+        entry = _Entry(self, key, value, None if ttl is None else monotonic() + ttl, size)
+        with _lock:
+            if self._closed or size > _budget:
+                return
+            previous = self._data.get(key)
+            if previous is not None:
+                self._evict(previous)
+            maxsize = self.policy.maxsize
+            if maxsize is not None and len(self._data) >= maxsize:
+                self._evict(next(iter(self._data.values())))
+            self._data[key] = entry
+            _entries[entry] = None
+            self.nbytes += size
+            _usage += size
+            _enforce_budget()
+
+    def _evict(self, entry: _Entry) -> None:
+        """
+        Remove an entry; must be called with the lock held.
+        """
+        global _usage
+        del self._data[entry.key]
+        del _entries[entry]
+        self.nbytes -= entry.size
+        _usage -= entry.size
+
+    def __repr__(self) -> str:
+        """
+        Return a string representation of the VersionCache.
+        """
+        return (
+            f'<VersionCache {self.name} version: {self.version} entries: {len(self._data)} hits: {self.hits} '
+            f'misses: {self.misses}>'
+        )
+
+
+def _enforce_budget() -> None:
+    """
+    Evict the least recently used entries of any cache until the budget is met; must be called with the lock held.
+    """
+    while _usage > _budget:
+        entry = next(iter(_entries))
+        entry.cache._evict(entry)
+
+
+def set_memory_budget(max_bytes: int) -> None:
+    """
+    Set how many bytes all version caches in the process may hold together, evicting entries if needed.
+
+    Args:
+        max_bytes (int): The budget in bytes, as estimated by `sys.getsizeof()`.
+
+    Raises:
+        ValueError: If the budget is negative.
+    """
+    global _budget
+    if max_bytes < 0:
+        raise ValueError(f'The memory budget must not be negative, got {max_bytes}.')
+    with _lock:
+        _budget = max_bytes
+        _enforce_budget()
+
+
+def memory_usage() -> tuple[int, int]:
+    """
+    Return the estimated bytes held by all version caches and the budget.
+
+    Returns:
+        tuple[int, int]: The usage and the budget in bytes.
+    """
+    return _usage, _budget
@@ -0,0 +1,115 @@
+from contextvars import ContextVar, Token
+from types import MappingProxyType, TracebackType
+from typing import TYPE_CHECKING, Mapping, Optional, Type, Union
+
+from .semver import parse_range
+
+if TYPE_CHECKING:
+    from .core import VersionedFunction
+
+# Versions pinned by the innermost active use_versions() scope, keyed by function key, or None outside of any scope.
+# Outer scopes are merged in on entry, so a call only needs a single lookup.
+_active_versions: ContextVar[Optional[Mapping[str, str]]] = ContextVar('funcversion_active_versions', default=None)
+
+# Tokens restoring the enclosing scope of each active scope, innermost last. They are kept per context rather than on
+# the scope, so one use_versions() instance can be entered by concurrent tasks or threads.
+_scope_tokens: ContextVar[tuple[Token, ...]] = ContextVar('funcversion_scope_tokens', default=())
+
+
+class use_versions:
+    """
+    Pin versions of versioned functions for the current context.
+
+    Inside the scope, calls without an explicit ``_version`` dispatch to the pinned version or range instead of the
+    latest version. Scopes are stored in a ContextVar, so they are local to the current thread or asyncio task and
+    can be used with both ``with`` and ``async with``; one scope may be entered by several tasks or threads at once.
+    Nested scopes inherit and may override the outer pins.
+
+    Example:
+        >>> with use_versions({'svc.handlers.render': '1.x'}):
+        ...     render(page)  # Dispatches to the highest 1.x version
+    """
+
+    __slots__ = ('pins',)
+
+    def __init__(self, pins: Mapping[Union[str, 'VersionedFunction'], str]) -> None:
+        """
+        Initialize the scope.
+
+        Args:
+            pins (Mapping[Union[str, VersionedFunction], str]): Versions or version ranges keyed by function key
+                (e.g. 'svc.handlers.render') or by the versioned function itself.
+
+        Raises:
+            InvalidVersionError: If a pinned version or range is not valid.
+        """
+        resolved: dict[str, str] = {}
+        for func, version_spec in pins.items():
+            # Validate eagerly, so an invalid range fails here rather than on the first call inside the scope
+            parse_range(version_spec)
+            resolved[func if isinstance(func, str) else func.name] = version_spec
+        self.pins: Mapping[str, str] = MappingProxyType(resolved)
+
+    @classmethod
+    def _from_resolved(cls, pins: Mapping[str, str]) -> 'use_versions':
+        """
+        Create a scope from pins that are already validated and keyed by function key, skipping validation.
+
+        Args:
+            pins (Mapping[str, str]): Versions keyed by function key; not copied, so it must not be mutated.
+
+        Returns:
+            use_versions: The scope.
+        """
+        scope = cls.__new__(cls)
+        scope.pins = pins
+        return scope
+
+    def __enter__(self) -> 'use_versions':
+        """
+        Activate the pins, on top of any enclosing scope.
+        """
+        outer = _active_versions.get()
+        token = _active_versions.set(self.pins if outer is None else {**outer, **self.pins})
+        _scope_tokens.set((*_scope_tokens.get(), token))
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        """
+        Restore the enclosing scope.
+        """
+        tokens = _scope_tokens.get()
+        _scope_tokens.set(tokens[:-1])
+        _active_versions.reset(tokens[-1])
+
+    async def __aenter__(self) -> 'use_versions':
+        """
+        Activate the pins for the current asyncio task.
+        """
+        return self.__enter__()
+
+    async def __aexit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        """
+        Restore the enclosing scope of the current asyncio task.
+        """
+        self.__exit__(exc_type, exc_value, traceback)
+
+
+def active_versions() -> Mapping[str, str]:
+    """
+    Return the versions pinned in the current context.
+
+    Returns:
+        Mapping[str, str]: Versions or version ranges keyed by function key.
+    """
+    return _active_versions.get() or {}
@@ -1,308 +1,2110 @@
-import warnings
+import gc
+import importlib
+import operator
+import threading
+import weakref
+from bisect import bisect_left, bisect_right
 from collections import defaultdict
-from types import MethodType
-from typing import Any, Callable, Optional, Type, Union
+from functools import partial
+from types import CodeType, MappingProxyType, MethodType
+from typing import TYPE_CHECKING, Any, Callable, Hashable, Iterable, Iterator, Mapping, Optional, Type, Union
 
-from packaging import version as pkg_version  # For semantic versioning
+from .context import _active_versions
+from .exceptions import (
+    InvalidVersionError,
+    NoVersionsFoundError,
+    RegistryFrozenError,
+    VersionExistsError,
+    VersionNotFoundError,
+)
+from .semver import VersionKey, parse_range, parse_version
 
-from .exceptions import InvalidVersionError, NoVersionsFoundError, VersionExistsError, VersionNotFoundError
+# The modules of optional features are imported when a function first uses them, so that importing funcversion and
+# registering versions only load what every versioned function needs
+if TYPE_CHECKING:
+    from concurrent.futures import Executor
+    from datetime import datetime
 
-# Global registry to store function versions
+    from .cache import CachePolicy, VersionCache
+    from .fallback import Fallback
+    from .hedging import Hedge
+    from .routing import AdaptiveRouter, Router
+    from .shadow import Shadow
+    from .singleflight import SingleFlight
+
+# Global registry to store function versions. The dicts are replaced rather than mutated, see _Snapshot
 _version_registry: defaultdict[str, dict[str, Callable]] = defaultdict(dict)
 
 # Registry to store VersionedFunction instances
 _versioned_functions_registry: dict[str, 'VersionedFunction'] = {}
 
+# Serializes all writers: registration, removal, deprecation, compilation and freezing. Readers never take it.
+_registry_lock = threading.RLock()
 
-class VersionedFunction:
+# Maximum number of resolved version ranges cached per VersionedFunction snapshot
+_RANGE_CACHE_SIZE = 256
+
+# Code flags of coroutine and async generator functions, i.e. inspect.CO_COROUTINE | inspect.CO_ASYNC_GENERATOR
+_ASYNC_CODE_FLAGS = 0x80 | 0x200
+# Code flags of generator and async generator functions, whose work only happens once they are iterated
+_GENERATOR_CODE_FLAGS = 0x20 | 0x200
+
+# Whether freeze() has been called; see freeze() and unfreeze()
+_frozen: bool = False
+_gc_frozen: bool = False
+
+
+class _VersionIndex:
     """
-    A callable wrapper that manages different versions of a function.
+    An immutable, ascending index of version identifiers and their parsed keys.
+
+    Every identifier is parsed exactly once when it is inserted. Updates return a new index,
+    so readers always see a consistent ordering.
     """
 
-    def __init__(self, func_key: str) -> None:
+    __slots__ = ('ids', 'keys', 'parsed')
+
+    def __init__(
+        self,
+        ids: tuple[str, ...] = (),
+        keys: tuple[VersionKey, ...] = (),
+        parsed: Optional[dict[str, VersionKey]] = None,
+    ) -> None:
+        self.ids: tuple[str, ...] = ids
+        self.keys: tuple[VersionKey, ...] = keys
+        self.parsed: dict[str, VersionKey] = parsed if parsed is not None else {}
+
+    @classmethod
+    def build(cls, version_ids: Iterable[str]) -> '_VersionIndex':
         """
-        Initialize the VersionedFunction.
+        Build an index from an unordered collection of version identifiers.
 
         Args:
-            func_key (str): The unique key of the function being versioned.
+            version_ids (Iterable[str]): The version identifiers to index.
+
+        Returns:
+            _VersionIndex: The new index.
         """
-        self.name: str = func_key
-        self.versions: dict[str, Callable] = _version_registry[func_key]
+        return cls.from_parsed({version_id: parse_version(version_id) for version_id in version_ids})
 
-    def __call__(self, *args: Any, _version: str | None = None, **kwargs: Any) -> Any:
+    @classmethod
+    def from_parsed(cls, parsed: dict[str, VersionKey]) -> '_VersionIndex':
         """
-        Call the specified version of the function.
+        Build an index from version identifiers that have already been parsed.
 
         Args:
-            _version (str, optional): The version to execute. Defaults to the latest version.
-            *args: Positional arguments for the function.
-            **kwargs: Keyword arguments for the function.
+            parsed (dict[str, VersionKey]): Mapping of version identifiers to their parsed versions.
 
         Returns:
-            Any: The result of the function call.
-
-        Raises:
-            VersionNotFoundError: If the specified version does not exist.
-            NoVersionsFoundError: If no versions are registered and no version is specified.
+            _VersionIndex: The new index.
         """
-        if _version is not None:
-            return self._call_specific_version(_version, *args, **kwargs)
-        else:
-            return self._call_latest_version(*args, **kwargs)
+        ordered = sorted(parsed.items(), key=lambda item: item[1])
+        return cls(tuple(v for v, _ in ordered), tuple(k for _, k in ordered), parsed)
 
-    def __get__(self, instance: Optional[Any], owner: Type[Any]) -> Union['VersionedFunction', MethodType]:
+    def insert(self, version_id: str, key: Optional[VersionKey] = None) -> '_VersionIndex':
         """
-        Descriptor method to support instance methods and inheritance.
+        Return a new index with the version inserted at its sorted position.
 
         Args:
-            instance (Any, optional): The instance accessing the method.
-            owner (Type[Any]): The owner class.
+            version_id (str): The version identifier to insert.
+            key (VersionKey, optional): The already parsed version, if available.
 
         Returns:
-            Union[VersionedFunction, MethodType]: The bound method or self.
+            _VersionIndex: The new index.
         """
-        # Merge versions from base classes
-        merged_versions = self._get_versions_in_mro(owner)
-        self.versions = merged_versions
-
-        if instance is None:
-            # Accessed via class, return self
-            return self
-        else:
-            # Return a bound method
-            return MethodType(self, instance)
+        if key is None:
+            key = parse_version(version_id)
+        pos = bisect_right(self.keys, key)
+        parsed = dict(self.parsed)
+        parsed[version_id] = key
+        return _VersionIndex(
+            self.ids[:pos] + (version_id,) + self.ids[pos:],
+            self.keys[:pos] + (key,) + self.keys[pos:],
+            parsed,
+        )
 
-    def add_version(self, version_id: str, func: Callable) -> None:
+    def remove(self, version_id: str) -> '_VersionIndex':
         """
-        Add a new version to the function.
+        Return a new index without the given version.
 
         Args:
-            version_id (str): The version identifier (e.g., "1.0.0").
-            func (Callable): The function implementation.
+            version_id (str): The version identifier to remove.
 
-        Raises:
-            VersionAlreadyExistsError: If the version_id is already registered.
-            InvalidVersionError: If the version_id is not a valid semantic version.
+        Returns:
+            _VersionIndex: The new index.
         """
-        self._validate_new_version(version_id)
-        self.versions[version_id] = func
+        pos = self.position(version_id)
+        parsed = dict(self.parsed)
+        del parsed[version_id]
+        return _VersionIndex(self.ids[:pos] + self.ids[pos + 1 :], self.keys[:pos] + self.keys[pos + 1 :], parsed)
 
-    @property
-    def available_versions(self) -> list[str]:
+    def position(self, version_id: str) -> int:
         """
-        Return a list of available version IDs, sorted in ascending order.
+        Locate a version in the index.
+
+        Args:
+            version_id (str): The version identifier to locate.
 
         Returns:
-            list[str]: list of version identifiers.
+            int: The position of the version in ascending order.
+
+        Raises:
+            KeyError: If the version is not indexed.
         """
-        return sorted(self.versions.keys(), key=lambda v: pkg_version.parse(v))
+        pos = bisect_left(self.keys, self.parsed[version_id])
+        # Identifiers such as '1.0' and '1.0.0' compare equal, so step over equal keys to the exact match
+        while self.ids[pos] != version_id:
+            pos += 1
+        return pos
 
     @property
-    def deprecated_versions(self) -> list[str]:
+    def latest(self) -> Optional[str]:
         """
-        Return a list of deprecated version IDs.
+        Return the highest indexed version, or None if the index is empty.
+        """
+        return self.ids[-1] if self.ids else None
 
-        Returns:
-            list[str]: list of deprecated version identifiers.
+    def __len__(self) -> int:
+        return len(self.ids)
+
+
+class VersionInfo:
+    """
+    Metadata a VersionedFunction keeps for one of its versions.
+    """
+
+    __slots__ = ('version', 'deprecated', 'sunset', 'tags', 'deprecated_calls')
+
+    def __init__(self, version_id: str) -> None:
         """
-        return [version for version, func in self.versions.items() if getattr(func, '_deprecated', False)]
+        Initialize the VersionInfo.
 
-    @property
-    def callables(self) -> dict[str, Callable]:
+        Args:
+            version_id (str): The version identifier the metadata belongs to.
         """
-        list all callable implementations with their version IDs.
+        self.version: str = version_id
+        self.deprecated: bool = False
+        self.sunset: Optional['datetime'] = None
+        self.tags: set[str] = set()
+        self.deprecated_calls: int = 0
 
-        Returns:
-            dict[str, Callable]: Mapping of version IDs to callables.
+    def __repr__(self) -> str:
         """
-        return dict(self.versions)
+        Return a string representation of the VersionInfo.
+        """
+        return f'<VersionInfo {self.version} deprecated: {self.deprecated} tags: {sorted(self.tags)}>'
 
-    @property
-    def current_version(self) -> str:
+
+class _Snapshot:
+    """
+    An immutable snapshot of everything the call path needs to know about a function's versions.
+
+    Writers build a new snapshot while holding the registry lock and publish it with a single attribute assignment,
+    so callers never lock and always see versions, ordering and deprecations that belong together. Only the cache
+    of resolved version ranges is filled in after publication; it belongs to the snapshot and is discarded with it.
+    """
+
+    __slots__ = (
+        'versions',
+        'index',
+        'info',
+        'deprecated',
+        'latest',
+        'latest_func',
+        'targets',
+        'serving_version',
+        'serving',
+        'serving_deprecated',
+        'ranges',
+    )
+
+    def __init__(
+        self,
+        versions: dict[str, Callable],
+        index: _VersionIndex,
+        info: dict[str, VersionInfo],
+        targets: Optional[dict[str, Callable]] = None,
+    ) -> None:
         """
-        Return the current version of the function.
+        Initialize the snapshot.
 
-        Returns:
-            str: The current version identifier.
+        Args:
+            versions (dict[str, Callable]): The implementations by version; must not be mutated afterwards.
+            index (_VersionIndex): The ordering of the versions.
+            info (dict[str, VersionInfo]): The metadata by version; must not be mutated afterwards.
+            targets (dict[str, Callable], optional): The callables invoking each version, if they differ from the
+                implementations, e.g. because metrics are enabled; must not be mutated afterwards.
         """
-        return self._get_latest_version()
+        self.versions: dict[str, Callable] = versions
+        self.index: _VersionIndex = index
+        self.info: dict[str, VersionInfo] = info
+        # The deprecated versions in ascending order
+        self.deprecated: dict[str, VersionInfo] = {
+            version_id: info[version_id] for version_id in index.ids if info[version_id].deprecated
+        }
+        self.latest: Optional[str] = index.latest
+        self.latest_func: Optional[Callable] = None if self.latest is None else versions[self.latest]
+        self.targets: dict[str, Callable] = versions if targets is None else targets
+        # The version serving unpinned calls and its callable: the latest version unless a shadow holds it back,
+        # possibly wrapped by the shadow; see VersionedFunction._select_serving()
+        self.serving_version: Optional[str] = self.latest
+        self.serving: Optional[Callable] = None if self.latest is None else self.targets[self.latest]
+        self.serving_deprecated: bool = self.latest in self.deprecated
+        # Resolved version ranges, shared with the next snapshot unless versions are added or removed
+        self.ranges: dict[str, str] = {}
+
+
+class PinnedVersion(partial):
+    """
+    A callable pinned to one version of a VersionedFunction.
+
+    Calling a pinned version goes straight to the implementation without any version dispatch: it is a
+    `functools.partial` of the implementation, exposed as `func`, so the call happens in C without an extra Python
+    frame. The owning VersionedFunction re-targets the pin when the version is deprecated, removed or registered
+    again.
+    """
+
+    __slots__ = ('name', 'version', '_view')
 
-    def deprecate_version(self, version_id: str) -> None:
+    def __new__(cls, name: str, version_id: str, func: Callable) -> 'PinnedVersion':
         """
-        Deprecate a specific version of the function.
+        Create the PinnedVersion.
 
         Args:
-            version_id (str): The version identifier to deprecate.
+            name (str): The key of the versioned function.
+            version_id (str): The pinned version identifier.
+            func (Callable): The callable to invoke.
+        """
+        self = super().__new__(cls, func)
+        self.name = name
+        self.version = version_id
+        # The merged view the pin was taken from, which may provide versions the registered function lacks
+        self._view: Optional[_MergedVersionedFunction] = None
+        return self
 
-        Raises:
-            VersionNotFoundError: If the specified version does not exist.
+    def __get__(self, instance: Optional[Any], owner: Optional[Type[Any]] = None) -> Union['PinnedVersion', MethodType]:
         """
-        if self._version_exists(version_id):
-            self.versions[version_id]._deprecated = True
-        else:
-            raise VersionNotFoundError(f"Version '{version_id}' not found for function '{self.name}'.")
+        Bind like a plain function, so pinned versions of methods can be stored on classes.
+        """
+        return self if instance is None else MethodType(self, instance)
 
-    def remove_version(self, version_id: str) -> None:
+    def __repr__(self) -> str:
         """
-        Remove a specific version of the function.
+        Return a string representation of the PinnedVersion.
+        """
+        return f'<PinnedVersion {self.name} version: {self.version}>'
+
+    def _retarget(self, func: Callable) -> None:
+        """
+        Make the pin invoke another callable, in place so that every holder of the pin follows.
 
         Args:
-            version_id (str): The version identifier to remove.
+            func (Callable): The callable to invoke.
+        """
+        # The pickle protocol's setter is the only way to replace the function of a partial
+        self.__setstate__((func, (), None, None))
+
+    def __reduce__(self) -> tuple[Callable, tuple[Any, ...]]:
+        """
+        Pickle by reference: the function key and pinned version are re-bound from the registry when unpickled.
+
+        Pins taken from a class that inherits versions are re-bound through that class instead, so inherited versions
+        are found again.
 
         Raises:
-            VersionNotFoundError: If the specified version does not exist.
+            TypeError: If the function is not registered.
         """
-        if self._version_exists(version_id):
-            del self.versions[version_id]
-        else:
-            raise VersionNotFoundError(f"Version '{version_id}' not found for function '{self.name}'.")
+        if self._view is not None:
+            return _restore_view_pinned_version, (self._view, self.version)
+        func = _versioned_functions_registry.get(self.name)
+        if func is None:
+            raise TypeError(f"Cannot pickle pinned version of function '{self.name}': it is not registered.")
+        return _restore_pinned_version, (self.name, func._module(), self.version)
 
-    def _get_latest_version(self) -> str:
+
+class _BoundVersionedFunction(partial):
+    """
+    A versioned function bound to an instance, or to a class for classmethods, as returned by attribute access.
+
+    It calls the function with the instance prepended, like a bound method does, and forwards other attributes to
+    the function. It is a `functools.partial` rather than a MethodType so that pinning through it keeps the
+    instance: ``obj.method.bind('1.0.0')`` returns the pinned version bound to ``obj``.
+    """
+
+    __slots__ = ()
+
+    @property
+    def __func__(self) -> 'VersionedFunction':
         """
-        Determine the latest version based on semantic versioning.
+        Return the versioned function, like a bound method does.
+        """
+        return self.func
+
+    @property
+    def __self__(self) -> Any:
+        """
+        Return the instance or class the function is bound to, like a bound method does.
+        """
+        return self.args[0]
+
+    def bind(self, version_spec: str) -> MethodType:
+        """
+        Return the function's pinned version bound to the same instance or class; see VersionedFunction.bind().
+
+        Args:
+            version_spec (str): The version or version range to pin.
 
         Returns:
-            str: The latest version identifier.
+            MethodType: The bound pinned callable.
+
+        Raises:
+            VersionNotFoundError: If no version matches.
         """
-        if not self.versions:
-            raise NoVersionsFoundError(f"No versions registered for function '{self.name}'.")
+        return MethodType(self.func.bind(version_spec), self.args[0])
 
-        # Sort versions using semantic versioning
-        sorted_versions = sorted(
-            self.versions.keys(),
-            key=lambda v: pkg_version.parse(v),
-            reverse=True,
-        )
-        return sorted_versions[0]
+    def __getitem__(self, version_spec: str) -> MethodType:
+        """
+        Return the function's pinned version bound to the same instance or class, e.g. ``obj.method['1.0.0']``.
+        """
+        return self.bind(version_spec)
 
-    def _get_versions_in_mro(self, owner: Type[Any]) -> dict[str, Callable]:
+    def __getattr__(self, name: str) -> Any:
+        """
+        Look up other attributes on the versioned function, like a bound method does.
         """
-        Get versions from the method resolution order (MRO) for inheritance.
-        Traverse MRO in reverse to ensure subclass versions override base class versions.
+        return getattr(self.func, name)
 
-        :param owner: The owner class.
-        :return: A dictionary of versions.
+    def __eq__(self, other: object) -> bool:
         """
-        versions: dict[str, Callable] = {}
-        attr_name = self.name.split('.')[-1]
+        Compare equal to the same function bound to the same object, like bound methods do.
+        """
+        if not isinstance(other, _BoundVersionedFunction):
+            return NotImplemented
+        return self.func is other.func and self.args[0] is other.args[0]
 
-        # Reverse MRO to ensure subclass versions override base class versions
-        for cls in reversed(owner.mro()):
-            cls_attr = cls.__dict__.get(attr_name)
-            if isinstance(cls_attr, VersionedFunction):
-                versions.update(cls_attr.versions)
-            elif isinstance(cls_attr, (classmethod, staticmethod)) and isinstance(cls_attr.__func__, VersionedFunction):
-                versions.update(cls_attr.__func__.versions)
-        return versions
+    def __hash__(self) -> int:
+        """
+        Hash consistently with __eq__.
+        """
+        return hash((id(self.func), id(self.args[0])))
 
     def __repr__(self) -> str:
         """
-        Return a string representation of the VersionedFunction.
+        Return a string representation of the bound function.
+        """
+        return f'<bound {self.func!r} of {self.args[0]!r}>'
 
-        Returns:
-            str: The string representation.
+    def __reduce__(self) -> tuple[Callable, tuple[Any, str]]:
         """
-        return f'<VersionedFunction {self.name} versions: {self.available_versions}>'
+        Pickle by reference to the attribute of the bound object, like bound methods do.
+        """
+        return getattr, (self.args[0], self.func.__name__)
 
-    # Helper Methods to Reduce Conditional Complexity
 
-    def _call_specific_version(self, _version: str, *args: Any, **kwargs: Any) -> Any:
+class VersionedFunction:
+    """
+    A callable wrapper that manages different versions of a function.
+    """
+
+    def __init__(self, func_key: str) -> None:
         """
-        Call a specific version of the function.
+        Initialize the VersionedFunction.
 
         Args:
-            _version (str): The version to call.
-            *args: Positional arguments.
-            **kwargs: Keyword arguments.
+            func_key (str): The unique key of the function being versioned.
+
+        Raises:
+            RegistryFrozenError: If the registry has been frozen.
+        """
+        if _frozen:
+            raise RegistryFrozenError(f"Cannot create function '{func_key}': the version registry is frozen.")
+        self.name: str = func_key
+        versions = _version_registry[func_key]
+        info = {version_id: VersionInfo(version_id) for version_id in versions}
+        # Everything the call path reads, replaced as a whole whenever versions or deprecations change
+        self._snapshot: _Snapshot = _Snapshot(versions, _VersionIndex.build(versions), info)
+        # Per-owner dispatch targets, keyed by id(owner) and evicted when the owner is collected
+        self._owner_cache: dict[int, VersionedFunction] = {}
+        # Merged views that include this function's versions and must be refreshed when they change; created with the
+        # first view, as most functions never have one and a WeakSet is costly to create and to iterate
+        self._views: Optional[weakref.WeakSet[_MergedVersionedFunction]] = None
+        # Pinned callables handed out by bind(), keyed by version or range
+        self._pins: dict[str, PinnedVersion] = {}
+        # Whether the versions are classmethods, bound to the owner class on attribute access; set by @version
+        self._classmethod: bool = False
+        self._shadow: Optional['Shadow'] = None
+        self._router: Optional['Router'] = None
+        self._fallback: Optional['Fallback'] = None
+        self._instrumented: bool = False
+        # Memoization policies set for single versions, for all versions, and the resulting caches by version
+        self._cache_policies: dict[str, 'CachePolicy'] = {}
+        self._cache_all: Optional['CachePolicy'] = None
+        self._caches: dict[str, 'VersionCache'] = {}
+        self._compiled: bool = False
+
+    def __call__(self, *args: Any, _version: str | None = None, **kwargs: Any) -> Any:
+        """
+        Call the specified version of the function.
+
+        Args:
+            _version (str, optional): The version or version range (e.g. '^1.2') to execute. Defaults to the
+                version pinned by an active `use_versions()` scope, or else the latest version.
+            *args: Positional arguments for the function.
+            **kwargs: Keyword arguments for the function.
 
         Returns:
-            Any: Result of the function call.
+            Any: The result of the function call.
 
         Raises:
-            VersionNotFoundError: If the version does not exist.
+            VersionNotFoundError: If the specified version does not exist.
+            NoVersionsFoundError: If no versions are registered and no version is specified.
         """
-        if self._version_exists(_version):
-            func = self.versions[_version]
-            self._warn_if_deprecated(func, _version)
-            return func(*args, **kwargs)
+        if _version is None:
+            pins = _active_versions.get()
+            if pins is not None:
+                _version = pins.get(self.name)
+        if _version is not None:
+            return self._call_specific_version(_version, *args, **kwargs)
         else:
-            raise VersionNotFoundError(f"Version '{_version}' not found for function '{self.name}'.")
+            return self._call_latest_version(*args, **kwargs)
 
-    def _call_latest_version(self, *args: Any, **kwargs: Any) -> Any:
+    def __get__(self, instance: Optional[Any], owner: Type[Any]) -> Union['VersionedFunction', _BoundVersionedFunction]:
         """
-        Call the latest version of the function.
+        Descriptor method to support instance methods, classmethods and inheritance.
 
         Args:
-            *args: Positional arguments.
-            **kwargs: Keyword arguments.
+            instance (Any, optional): The instance accessing the method.
+            owner (Type[Any]): The owner class.
 
         Returns:
-            Any: Result of the function call.
+            Union[VersionedFunction, _BoundVersionedFunction]: The function bound to the instance, or to the owner
+            for classmethods, or else the owner's versioned function.
+        """
+        # Versions merged from base classes are resolved once per owner
+        target = self._owner_cache.get(id(owner))
+        if target is None:
+            target = self._resolve_owner(owner)
+
+        if self._classmethod:
+            return _BoundVersionedFunction(target, owner)
+        if instance is None:
+            # Accessed via class, return the owner's versioned function
+            return target
+        return _BoundVersionedFunction(target, instance)
+
+    def __getitem__(self, version_spec: str) -> PinnedVersion:
+        """
+        Return a callable pinned to a specific version or range, e.g. ``greet['1.0.0']`` or ``greet['^1.2']``.
+
+        Args:
+            version_spec (str): The version or version range to pin.
+
+        Returns:
+            PinnedVersion: The pinned callable.
 
         Raises:
-            NoVersionsFoundError: If no versions are registered.
+            VersionNotFoundError: If no version matches.
         """
-        if not self.versions:
-            raise NoVersionsFoundError(f"No versions registered for function '{self.name}'.")
-        latest_version = self._get_latest_version()
-        func = self.versions[latest_version]
-        self._warn_if_deprecated(func, latest_version)
-        return func(*args, **kwargs)
+        return self.bind(version_spec)
 
-    def _warn_if_deprecated(self, func: Callable, _version: str) -> None:
+    def bind(self, version_spec: str) -> PinnedVersion:
         """
-        Issue a deprecation warning if the function version is deprecated.
+        Return a callable pinned to a specific version or range.
+
+        The pinned callable skips version dispatch entirely and is cached, so repeated calls to bind() return
+        the same object. A range is re-resolved to its highest matching version whenever versions are added or
+        removed. Pinning a method through an instance or a classmethod through its class, e.g.
+        ``obj.method.bind('1.0.0')``, binds the pin to that instance or class like the attribute itself; pins taken
+        from the class of an instance method are unbound and take the instance as their first argument.
 
         Args:
-            func (Callable): The function to check.
-            _version (str): The version identifier.
+            version_spec (str): The version or version range to pin.
+
+        Returns:
+            PinnedVersion: The pinned callable.
+
+        Raises:
+            VersionNotFoundError: If no version matches.
         """
-        if getattr(func, '_deprecated', False):
-            warnings.warn(
-                f"Version '{_version}' of function '{self.name}' is deprecated.",
-                DeprecationWarning,
-            )
+        pin = self._pins.get(version_spec)
+        if pin is None:
+            with _registry_lock:
+                pin = self._pins.get(version_spec)
+                if pin is None:
+                    self.resolve_version(version_spec)
+                    pin = PinnedVersion(self.name, version_spec, self._pin_target(version_spec))
+                    self._pins[version_spec] = pin
+        return pin
 
-    def _validate_new_version(self, version_id: str) -> None:
+    def resolve_version(self, version_spec: str) -> str:
         """
-        Validate that the new version can be added.
+        Resolve a version or version range to a registered version.
+
+        Exact versions resolve to themselves. Ranges such as ``'^1.2'``, ``'~2.0'``, ``'1.x'`` or ``'>=1.0,<2'``
+        resolve to the highest matching version, preferring final releases over pre-releases. Resolved ranges
+        are cached until versions are added or removed.
 
         Args:
-            version_id (str): The version identifier to validate.
+            version_spec (str): The version or version range.
+
+        Returns:
+            str: The resolved version identifier.
 
         Raises:
-            VersionAlreadyExistsError: If the version is already registered or invalid.
+            VersionNotFoundError: If no version matches.
         """
-        if self._version_exists(version_id):
-            raise VersionExistsError(f"Version '{version_id}' is already registered for function '{self.name}'.")
-        if not self._is_valid_semantic_version(version_id):
-            raise InvalidVersionError(f"Version '{version_id}' is not a valid semantic version.")
+        return self._resolve(self._snapshot, version_spec)
 
-    def _version_exists(self, version_id: str) -> bool:
+    def map(
+        self,
+        iterable: Iterable[Any],
+        _version: Optional[str] = None,
+        executor: Union[str, 'Executor'] = 'serial',
+        chunksize: int = 1,
+        ordered: bool = True,
+        max_workers: Optional[int] = None,
+    ) -> Iterator[Any]:
         """
-        Check if a version exists.
+        Call one version of the function on every item of an iterable.
+
+        The version is resolved once up front, so items don't pay for version dispatch, and results are streamed
+        back lazily. With the 'thread' or 'process' executor, items are sent to a pool in chunks of `chunksize`,
+        keeping only a few chunks in flight. Worker processes look the function up by its key in their own
+        registry, so the module defining it must be importable there.
 
         Args:
-            version_id (str): The version identifier to check.
+            iterable (Iterable[Any]): The items, each passed as the single argument of a call.
+            _version (str, optional): The version or version range to call. Defaults to the version pinned by an
+                active `use_versions()` scope, or else the latest version.
+            executor (Union[str, Executor]): 'serial', 'thread', 'process' or a `concurrent.futures.Executor`.
+            chunksize (int): The number of items submitted to a worker at once.
+            ordered (bool): Yield results in input order, or as soon as they are ready.
+            max_workers (int, optional): The pool size; defaults to the number of CPUs.
 
         Returns:
-            bool: True if exists, False otherwise.
+            Iterator[Any]: The results.
+
+        Raises:
+            VersionNotFoundError: If no version matches.
+            NoVersionsFoundError: If no versions are registered and no version is specified.
+            ValueError: If the executor or chunksize is not valid.
         """
-        return version_id in self.versions
+        if _version is None:
+            pins = _active_versions.get()
+            if pins is not None:
+                _version = pins.get(self.name)
+        snapshot = self._snapshot
+        if _version is not None:
+            version_id = self._resolve(snapshot, _version)
+        elif snapshot.serving_version is not None:
+            version_id = snapshot.serving_version
+        else:
+            raise NoVersionsFoundError(f"No versions registered for function '{self.name}'.")
+        module = getattr(snapshot.versions[version_id], '__module__', None)
+        from .batch import apply_remote, map_chunks
+
+        return map_chunks(
+            self._pin_target(version_id),
+            partial(apply_remote, self.name, module, version_id),
+            iterable,
+            executor,
+            chunksize,
+            ordered,
+            max_workers,
+        )
 
-    @staticmethod
-    def _is_valid_semantic_version(version_id: str) -> bool:
+    def shadow(
+        self,
+        version_spec: str,
+        sample_rate: float = 0.01,
+        compare: Optional[Callable[[Any, Any], bool]] = None,
+        max_workers: int = 1,
+        max_pending: int = 100,
+    ) -> 'Shadow':
         """
-        Validate semantic versioning.
+        Dark-launch a candidate version by running it alongside the serving version on a sample of calls.
+
+        Only unpinned calls are shadowed. The serving call never waits on the candidate, which runs in a bounded
+        background thread pool, or as a background task for async functions. Results are compared and mismatches,
+        errors, latency deltas and dropped samples are recorded on the returned Shadow. Any previous shadow is
+        stopped.
 
         Args:
-            version_id (str): The version identifier to validate.
+            version_spec (str): The candidate version or version range, resolved once.
+            sample_rate (float): The fraction of calls to shadow, between 0 and 1.
+            compare (Callable[[Any, Any], bool], optional): Returns whether the serving and candidate results
+                match. Defaults to equality.
+            max_workers (int): The number of background threads.
+            max_pending (int): The maximum number of queued or running shadow runs before samples are dropped.
 
         Returns:
-            bool: True if valid, False otherwise.
+            Shadow: The shadow and its statistics.
+
+        Raises:
+            VersionNotFoundError: If no version matches.
+            ValueError: If the sample rate is not between 0 and 1.
         """
-        try:
-            pkg_version.parse(version_id)
-            return True
-        except pkg_version.InvalidVersion:
-            return False
+        from .shadow import Shadow
+
+        with _registry_lock:
+            shadow = Shadow(
+                self.name,
+                self.resolve_version(version_spec),
+                sample_rate,
+                compare or operator.eq,
+                max_workers,
+                max_pending,
+                isinstance(self, AsyncVersionedFunction),
+            )
+            previous, self._shadow = self._shadow, shadow
+            self._republish()
+        if previous is not None:
+            previous.stop()
+        return shadow
+
+    def stop_shadow(self) -> Optional['Shadow']:
+        """
+        Stop shadowing calls.
+
+        Returns:
+            Optional[Shadow]: The stopped shadow with its final statistics, or None if there was none.
+        """
+        with _registry_lock:
+            shadow, self._shadow = self._shadow, None
+            self._republish()
+        if shadow is not None:
+            shadow.stop()
+        return shadow
+
+    def route(self, weights: Mapping[str, float], key: Optional[Callable[..., Hashable]] = None) -> 'Router':
+        """
+        Split unpinned calls between versions by weight.
+
+        Each call picks a version at random in proportion to its weight, or, if `key` is given, by a stable hash
+        of the key derived from the call's arguments, so equal keys always reach the same version. Calling
+        route() again replaces the weights at runtime; the call path never locks. Versions that are later removed
+        stop receiving calls and the remaining weights are renormalized.
+
+        Args:
+            weights (Mapping[str, float]): The relative weight of each version or version range, e.g.
+                `{'2.0.0': 95, '3.0.0': 5}`. Ranges are resolved once.
+            key (Callable[..., Hashable], optional): Receives the call's arguments and returns the sticky
+                routing key, e.g. `lambda user, *args, **kwargs: user.id`.
+
+        Returns:
+            Router: The router.
+
+        Raises:
+            VersionNotFoundError: If no version matches a version specifier.
+            ValueError: If a weight is negative or all weights are zero.
+        """
+        from .routing import Router
+
+        with _registry_lock:
+            resolved: dict[str, float] = {}
+            for version_spec, weight in weights.items():
+                version_id = self.resolve_version(version_spec)
+                resolved[version_id] = resolved.get(version_id, 0) + weight
+            router = Router(self.name, resolved, key)
+            self._router = router
+            self._republish()
+        return router
+
+    def select_fastest(
+        self,
+        versions: Iterable[str],
+        key: Optional[Callable[..., Hashable]] = None,
+        window: int = 20,
+        min_samples: int = 5,
+        explore_every: int = 100,
+        max_buckets: int = 64,
+    ) -> 'AdaptiveRouter':
+        """
+        Route unpinned calls to whichever of several equivalent versions is fastest, as measured on live calls.
+
+        Each version is measured on `min_samples` calls first; afterwards calls go to the version with the lowest
+        moving average latency, and every `explore_every`-th call measures one of the others again. If `key` is
+        given, the fastest version is found separately for each value it returns, e.g.
+        `key=lambda items: len(items).bit_length()` to compare versions per order of magnitude of the input size.
+        Like route(), this replaces any routing, and stop_routing() stops it.
+
+        Args:
+            versions (Iterable[str]): The equivalent versions or version ranges, resolved once.
+            key (Callable[..., Hashable], optional): Receives the call's arguments and returns its bucket.
+            window (int): The number of recent calls latencies are averaged over.
+            min_samples (int): The number of calls measuring each version before the fastest one is picked.
+            explore_every (int): Every how many calls of a bucket one of the slower versions is measured again.
+            max_buckets (int): The maximum number of buckets; calls with further keys share one bucket.
+
+        Returns:
+            AdaptiveRouter: The router and its measurements.
+
+        Raises:
+            VersionNotFoundError: If no version matches a version specifier.
+            ValueError: If no version is given, a version is a generator function whose latency can't be measured
+                by its call, explore_every is less than 2 or another setting is less than 1.
+        """
+        from .routing import AdaptiveRouter
+
+        with _registry_lock:
+            resolved = [self.resolve_version(version_spec) for version_spec in versions]
+            snapshot = self._snapshot
+            for version_id in resolved:
+                code = getattr(snapshot.versions[version_id], '__code__', None)
+                if getattr(code, 'co_flags', 0) & _GENERATOR_CODE_FLAGS:
+                    raise ValueError(f"Version '{version_id}' of function '{self.name}' is a generator function.")
+            router = AdaptiveRouter(
+                self.name,
+                resolved,
+                key,
+                window,
+                min_samples,
+                explore_every,
+                max_buckets,
+                isinstance(self, AsyncVersionedFunction),
+            )
+            self._router = router
+            self._republish()
+        return router
+
+    def stop_routing(self) -> Optional['Router']:
+        """
+        Stop splitting calls, so that unpinned calls go to the latest version again.
+
+        Returns:
+            Optional[Router]: The stopped router, or None if there was none.
+        """
+        with _registry_lock:
+            router, self._router = self._router, None
+            self._republish()
+        return router
+
+    def enable_fallback(
+        self,
+        exceptions: Union[Type[BaseException], tuple[Type[BaseException], ...]] = Exception,
+        depth: int = 1,
+        threshold: float = 0.5,
+        min_calls: int = 20,
+        window: int = 20,
+        reset_timeout: float = 30.0,
+    ) -> 'Fallback':
+        """
+        Fall back to older versions when the serving version fails, and stop calling versions that keep failing.
+
+        When an unpinned call raises one of `exceptions`, it is retried with the next older versions, up to `depth`
+        of them and skipping deprecated ones. Every version has a circuit breaker: once its failure rate over about
+        the last `window` calls reaches `threshold`, calls skip it until a probe call succeeds after `reset_timeout`
+        seconds. If all versions of the chain are skipped, CircuitOpenError is raised. With a router, each routed
+        version falls back on its own. Pinned calls are never redirected.
+
+        Args:
+            exceptions (Union[Type[BaseException], tuple[Type[BaseException], ...]]): The exceptions that count as
+                failures; others propagate immediately.
+            depth (int): The number of older versions to fall back to.
+            threshold (float): The failure rate opening a version's breaker, between 0 and 1.
+            min_calls (int): The number of calls before a breaker may open.
+            window (int): The number of recent calls failure rates are averaged over.
+            reset_timeout (float): The seconds before an open breaker lets a probe call through.
+
+        Returns:
+            Fallback: The fallback, with the circuit breaker of each version in `breakers`.
+
+        Raises:
+            ValueError: If a setting is out of range.
+        """
+        from .fallback import Fallback
+
+        fallback = Fallback(self.name, exceptions, depth, threshold, min_calls, window, reset_timeout)
+        with _registry_lock:
+            self._fallback = fallback
+            self._republish()
+        return fallback
+
+    def disable_fallback(self) -> Optional['Fallback']:
+        """
+        Stop falling back, so that unpinned calls only reach the serving version again.
+
+        Returns:
+            Optional[Fallback]: The disabled fallback with its final breaker states, or None if there was none.
+        """
+        with _registry_lock:
+            fallback, self._fallback = self._fallback, None
+            self._republish()
+        return fallback
+
+    def enable_metrics(self) -> None:
+        """
+        Count and time every call of every version, readable through `funcversion.metrics.snapshot()`.
+
+        Each call records its latency into a fixed-size histogram of the version it reached, and failed calls are
+        counted as errors. Shadow runs of a candidate version are not recorded.
+        """
+        with _registry_lock:
+            self._instrumented = True
+            self._republish()
+
+    def disable_metrics(self) -> None:
+        """
+        Stop recording metrics. The metrics recorded so far remain readable.
+        """
+        with _registry_lock:
+            self._instrumented = False
+            self._republish()
+
+    def enable_cache(self, maxsize: Optional[int] = 1024, ttl: Optional[float] = None) -> None:
+        """
+        Memoize the results of every version by the call arguments, for pure functions called with repeated arguments.
+
+        Each version keeps its own least-recently-used cache, and all caches in the process share one memory budget,
+        see `funcversion.cache.set_memory_budget()`. Removing or re-registering a version drops its cached results
+        only. Versions registered with their own `cache=` policy keep it.
+
+        Args:
+            maxsize (int, optional): The maximum number of results kept per version, or None for no limit other than
+                the memory budget.
+            ttl (float, optional): The seconds after which a result expires, or None to keep it until evicted.
+
+        Raises:
+            ValueError: If maxsize or ttl is not positive.
+        """
+        from .cache import CachePolicy
+
+        policy = CachePolicy(maxsize, ttl)
+        with _registry_lock:
+            self._cache_all = policy
+            self._republish()
+
+    def disable_cache(self) -> None:
+        """
+        Stop memoizing results of any version and drop the cached results.
+        """
+        with _registry_lock:
+            self._cache_all = None
+            self._cache_policies = {}
+            self._republish()
+
+    def cache_info(self, version_id: str) -> Optional['VersionCache']:
+        """
+        Return the cache of a version, with its hit and miss counts.
+
+        Args:
+            version_id (str): The version identifier.
+
+        Returns:
+            Optional[VersionCache]: The cache, or None if the version's results are not memoized.
+        """
+        return self._caches.get(version_id)
+
+    def _set_cache_policy(self, version_id: str, policy: 'CachePolicy') -> None:
+        """
+        Memoize the results of a single version, as requested by `@version(..., cache=...)`.
+
+        Args:
+            version_id (str): The version identifier.
+            policy (CachePolicy): The eviction policy.
+        """
+        with _registry_lock:
+            self._cache_policies = {**self._cache_policies, version_id: policy}
+            self._republish()
+
+    def compile(self) -> 'VersionedFunction':
+        """
+        Switch this function to compiled dispatch.
+
+        A ``__call__`` trampoline matching the implementations' signature is generated and re-generated whenever
+        the versions change, so unversioned calls reach the latest version with a single extra frame. If the
+        registered versions don't share one signature, the generic dispatch path keeps being used until they do.
+
+        Returns:
+            VersionedFunction: The function itself.
+        """
+        with _registry_lock:
+            if not self._compiled:
+                # Give this instance its own subclass, so the generated __call__ doesn't affect other functions
+                self.__class__ = type(f'Compiled{type(self).__name__}', (type(self),), {'__slots__': ()})
+                self._compiled = True
+                self._install_trampoline()
+                for view in list(self._views or ()):
+                    view.compile()
+        return self
+
+    @property
+    def compiled(self) -> bool:
+        """
+        Return whether compiled dispatch is enabled.
+
+        Returns:
+            bool: True if compiled, False otherwise.
+        """
+        return self._compiled
+
+    def add_version(self, version_id: str, func: Callable) -> None:
+        """
+        Add a new version to the function.
+
+        Args:
+            version_id (str): The version identifier (e.g., "1.0.0").
+            func (Callable): The function implementation.
+
+        Raises:
+            VersionAlreadyExistsError: If the version_id is already registered.
+            InvalidVersionError: If the version_id is not a valid semantic version.
+            RegistryFrozenError: If the registry has been frozen.
+        """
+        with _registry_lock:
+            self._check_not_frozen()
+            key = self._validate_new_version(version_id)
+            snapshot = self._snapshot
+            versions = {**snapshot.versions, version_id: func}
+            _version_registry[self.name] = versions
+            self._publish(
+                versions, snapshot.index.insert(version_id, key), {**snapshot.info, version_id: VersionInfo(version_id)}
+            )
+
+    @property
+    def versions(self) -> Mapping[str, Callable]:
+        """
+        Return a read-only view of the implementations, keyed by version identifier.
+
+        Returns:
+            Mapping[str, Callable]: Mapping of version IDs to callables.
+        """
+        return MappingProxyType(self._snapshot.versions)
+
+    @property
+    def available_versions(self) -> list[str]:
+        """
+        Return a list of available version IDs, sorted in ascending order.
+
+        Returns:
+            list[str]: list of version identifiers.
+        """
+        return list(self._snapshot.index.ids)
+
+    @property
+    def deprecated_versions(self) -> list[str]:
+        """
+        Return a list of deprecated version IDs.
+
+        Returns:
+            list[str]: list of deprecated version identifiers.
+        """
+        return list(self._snapshot.deprecated)
+
+    @property
+    def callables(self) -> dict[str, Callable]:
+        """
+        list all callable implementations with their version IDs.
+
+        Returns:
+            dict[str, Callable]: Mapping of version IDs to callables.
+        """
+        return dict(self._snapshot.versions)
+
+    @property
+    def current_version(self) -> str:
+        """
+        Return the current version of the function.
+
+        Returns:
+            str: The current version identifier.
+        """
+        return self._get_latest_version()
+
+    def version_info(self, version_id: str) -> VersionInfo:
+        """
+        Return the metadata kept for a specific version.
+
+        Args:
+            version_id (str): The version identifier.
+
+        Returns:
+            VersionInfo: The version's metadata.
+
+        Raises:
+            VersionNotFoundError: If the specified version does not exist.
+        """
+        try:
+            return self._snapshot.info[version_id]
+        except KeyError:
+            raise VersionNotFoundError(f"Version '{version_id}' not found for function '{self.name}'.") from None
+
+    def deprecate_version(self, version_id: str, sunset: Optional['datetime'] = None) -> None:
+        """
+        Deprecate a specific version of the function.
+
+        Args:
+            version_id (str): The version identifier to deprecate.
+            sunset (datetime, optional): When the version is expected to be removed.
+
+        Raises:
+            VersionNotFoundError: If the specified version does not exist.
+            RegistryFrozenError: If the registry has been frozen.
+        """
+        with _registry_lock:
+            self._check_not_frozen()
+            snapshot = self._snapshot
+            previous = self.version_info(version_id)
+            # The published snapshot keeps its metadata; the deprecation takes effect with the next one
+            info = VersionInfo(version_id)
+            info.deprecated = True
+            info.sunset = sunset
+            info.tags = set(previous.tags)
+            info.deprecated_calls = previous.deprecated_calls
+            self._publish(snapshot.versions, snapshot.index, {**snapshot.info, version_id: info})
+
+    def remove_version(self, version_id: str) -> None:
+        """
+        Remove a specific version of the function.
+
+        Args:
+            version_id (str): The version identifier to remove.
+
+        Raises:
+            VersionNotFoundError: If the specified version does not exist.
+            RegistryFrozenError: If the registry has been frozen.
+        """
+        with _registry_lock:
+            self._check_not_frozen()
+            snapshot = self._snapshot
+            if version_id not in snapshot.versions:
+                raise VersionNotFoundError(f"Version '{version_id}' not found for function '{self.name}'.")
+            versions = dict(snapshot.versions)
+            del versions[version_id]
+            info = dict(snapshot.info)
+            del info[version_id]
+            _version_registry[self.name] = versions
+            self._publish(versions, snapshot.index.remove(version_id), info)
+
+    def previous_version(self, version_id: str) -> Optional[str]:
+        """
+        Return the version immediately preceding the given one.
+
+        Args:
+            version_id (str): The version identifier to start from.
+
+        Returns:
+            Optional[str]: The previous version identifier, or None if version_id is the oldest.
+
+        Raises:
+            VersionNotFoundError: If the specified version does not exist.
+        """
+        index = self._snapshot.index
+        pos = self._position(index, version_id)
+        return index.ids[pos - 1] if pos > 0 else None
+
+    def next_version(self, version_id: str) -> Optional[str]:
+        """
+        Return the version immediately following the given one.
+
+        Args:
+            version_id (str): The version identifier to start from.
+
+        Returns:
+            Optional[str]: The next version identifier, or None if version_id is the latest.
+
+        Raises:
+            VersionNotFoundError: If the specified version does not exist.
+        """
+        index = self._snapshot.index
+        pos = self._position(index, version_id) + 1
+        return index.ids[pos] if pos < len(index) else None
+
+    def _get_latest_version(self) -> str:
+        """
+        Determine the latest version based on semantic versioning.
+
+        Returns:
+            str: The latest version identifier.
+        """
+        latest = self._snapshot.latest
+        if latest is None:
+            raise NoVersionsFoundError(f"No versions registered for function '{self.name}'.")
+        return latest
+
+    def _publish(self, versions: dict[str, Callable], index: _VersionIndex, info: dict[str, VersionInfo]) -> None:
+        """
+        Publish a new snapshot and propagate the change to pinned callables, the trampoline and merged views.
+
+        Must be called with the registry lock held.
+
+        Args:
+            versions (dict[str, Callable]): The implementations by version.
+            index (_VersionIndex): The ordering of the versions.
+            info (dict[str, VersionInfo]): The metadata by version.
+        """
+        snapshot = _Snapshot(versions, index, info, self._wrap_targets(versions))
+        previous = self._snapshot
+        if index is previous.index or index.ids == previous.index.ids:
+            # Ranges resolve the same way until versions are added or removed
+            snapshot.ranges = previous.ranges
+        self._select_serving(snapshot)
+        self._snapshot = snapshot
+        for version_spec, pin in self._pins.items():
+            pin._retarget(self._pin_target(version_spec))
+        if self._compiled:
+            self._install_trampoline()
+        if self._views:
+            for view in list(self._views):
+                view._merge()
+
+    def _republish(self) -> None:
+        """
+        Publish a new snapshot of the current versions, after its serving hooks changed.
+
+        Must be called with the registry lock held.
+        """
+        snapshot = self._snapshot
+        self._publish(snapshot.versions, snapshot.index, snapshot.info)
+
+    def _wrap_targets(self, versions: dict[str, Callable]) -> Optional[dict[str, Callable]]:
+        """
+        Wrap the implementations of a snapshot that is about to be published with their caches and metrics.
+
+        Args:
+            versions (dict[str, Callable]): The implementations by version.
+
+        Returns:
+            Optional[dict[str, Callable]]: The wrapped callables by version, or None if nothing needs wrapping.
+        """
+        self._update_caches(versions)
+        if not self._wraps_targets():
+            return None
+        return {version_id: self._wrap_target(version_id, func) for version_id, func in versions.items()}
+
+    def _wraps_targets(self) -> bool:
+        """
+        Check whether calls of this function's versions go through any wrappers.
+
+        Returns:
+            bool: True if metrics or caches are enabled.
+        """
+        return self._instrumented or bool(self._caches)
+
+    def _wrap_target(self, version_id: str, func: Callable) -> Callable:
+        """
+        Wrap one of this function's implementations with its cache and metrics, if enabled.
+
+        Args:
+            version_id (str): The version identifier.
+            func (Callable): The implementation.
+
+        Returns:
+            Callable: The callable invoking the version.
+        """
+        target = func
+        cache = self._caches.get(version_id)
+        if cache is not None:
+            target = cache.wrap(target)
+        if self._instrumented:
+            from .metrics import instrument
+
+            # Cache hits are counted as calls too
+            target = instrument(self.name, version_id, target)
+        return target
+
+    def _update_caches(self, versions: dict[str, Callable]) -> None:
+        """
+        Create, keep or drop the cache of each version for a snapshot that is about to be published.
+
+        A cache is kept as long as its version is registered with the same implementation and policy. Removing or
+        re-registering a version drops its cached results, and those of no other version.
+
+        Args:
+            versions (dict[str, Callable]): The implementations by version.
+        """
+        if not self._caches and not self._cache_policies and self._cache_all is None:
+            return
+        from .cache import VersionCache
+
+        self._cache_policies = {
+            version_id: policy for version_id, policy in self._cache_policies.items() if version_id in versions
+        }
+        caches = {}
+        for version_id, func in versions.items():
+            policy = self._cache_policies.get(version_id, self._cache_all)
+            if policy is None:
+                continue
+            cache = self._caches.get(version_id)
+            if cache is None or cache.func is not func or cache.policy is not policy:
+                cache = VersionCache(self.name, version_id, func, policy)
+            caches[version_id] = cache
+        for version_id, cache in self._caches.items():
+            if caches.get(version_id) is not cache:
+                cache.close()
+        self._caches = caches
+
+    def _select_serving(self, snapshot: _Snapshot) -> None:
+        """
+        Select what serves unpinned calls in a snapshot that is about to be published.
+
+        This is the latest version, unless a router splits calls between versions, or the latest version is the
+        candidate of the active shadow: a dark-launched candidate serves no traffic, so the version preceding it
+        keeps serving, and routers leave it out. Served versions fall back to older ones if enabled, and calls are
+        wrapped by the shadow.
+
+        Args:
+            snapshot (_Snapshot): The new snapshot.
+        """
+        router = self._router
+        shadow = self._shadow
+        if snapshot.latest is None or (router is None and shadow is None and self._fallback is None):
+            # The snapshot already serves the latest version
+            return
+        candidate = snapshot.versions.get(shadow.version) if shadow is not None else None
+
+        routed = None
+        if router is not None:
+            # Deprecated targets go through the generic path, which warns
+            targets = {
+                version_id: partial(self._call_specific_version, version_id)
+                if version_id in snapshot.deprecated
+                else self._serving_target(snapshot, version_id)
+                for version_id in router.weights
+                if version_id in snapshot.versions and (candidate is None or version_id != shadow.version)
+            }
+            routed = router.compile(targets)
+        if routed is not None:
+            snapshot.serving_version = max(targets, key=router.weights.__getitem__)
+            snapshot.serving_deprecated = False
+            snapshot.serving = routed
+        else:
+            if candidate is not None and snapshot.latest == shadow.version:
+                ids = snapshot.index.ids
+                if len(ids) < 2:
+                    # The candidate is the only version, so there is nothing to compare it with
+                    candidate = None
+                else:
+                    snapshot.serving_version = ids[-2]
+                    snapshot.serving_deprecated = ids[-2] in snapshot.deprecated
+            snapshot.serving = self._serving_target(snapshot, snapshot.serving_version)
+        if candidate is not None:
+            snapshot.serving = shadow.wrap(snapshot.serving, candidate)
+
+    def _serving_target(self, snapshot: _Snapshot, version_id: str) -> Callable:
+        """
+        Return the callable serving unpinned calls of a version, falling back to older versions if enabled.
+
+        Args:
+            snapshot (_Snapshot): The new snapshot.
+            version_id (str): The served version.
+
+        Returns:
+            Callable: The callable.
+        """
+        target = snapshot.targets[version_id]
+        fallback = self._fallback
+        flags = getattr(getattr(snapshot.versions[version_id], '__code__', None), 'co_flags', 0)
+        if fallback is None or flags & _GENERATOR_CODE_FLAGS:
+            return target
+        chain = [(version_id, target)]
+        ids = snapshot.index.ids
+        for older in reversed(ids[: self._position(snapshot.index, version_id)]):
+            if len(chain) > fallback.depth:
+                break
+            if older not in snapshot.deprecated:
+                chain.append((older, snapshot.targets[older]))
+        return fallback.wrap(chain, isinstance(self, AsyncVersionedFunction))
+
+    def _install_trampoline(self) -> None:
+        """
+        (Re-)generate the compiled ``__call__`` for the current versions.
+        """
+        cls = type(self)
+        snapshot = self._snapshot
+        trampoline = None
+        if snapshot.latest is not None:
+            targets = {version_id: self._pin_target(version_id) for version_id in snapshot.versions}
+            # Deprecated latest versions take the generic path, which warns
+            latest = self._call_latest_version if snapshot.serving_deprecated else snapshot.serving
+            from .dispatch import build_trampoline
+
+            trampoline = build_trampoline(self.name, latest, targets, snapshot.versions.values())
+        if trampoline is not None:
+            cls.__call__ = trampoline
+        elif '__call__' in cls.__dict__:
+            del cls.__call__
+
+    def _pin_target(self, version_spec: str) -> Callable:
+        """
+        Return what a pinned callable for a version or range should invoke.
+
+        Active versions are called directly. Deprecated or missing versions go through the regular dispatch
+        path, so they warn or raise exactly like ``_version`` calls do.
+
+        Args:
+            version_spec (str): The pinned version or version range.
+
+        Returns:
+            Callable: The callable to invoke.
+        """
+        snapshot = self._snapshot
+        try:
+            version_id = self._resolve(snapshot, version_spec)
+        except VersionNotFoundError:
+            return partial(self._call_specific_version, version_spec)
+        if version_id in snapshot.deprecated:
+            return partial(self._call_specific_version, version_id)
+        return snapshot.targets[version_id]
+
+    def _resolve_owner(self, owner: Type[Any]) -> 'VersionedFunction':
+        """
+        Resolve and cache the versioned function that serves attribute access through `owner`.
+
+        If no base class contributes versions this is the function itself, otherwise it is a
+        merged view that stays up to date as any of the participating functions change.
+
+        Args:
+            owner (Type[Any]): The owner class.
+
+        Returns:
+            VersionedFunction: The dispatch target for the owner.
+        """
+        key = id(owner)
+        with _registry_lock:
+            target = self._owner_cache.get(key)
+            if target is not None:
+                return target
+
+            participants = self._get_versioned_functions_in_mro(owner)
+            if len(participants) > 1:
+                target = self._create_view(owner, participants)
+            else:
+                target = self
+
+            self._owner_cache[key] = target
+            weakref.finalize(owner, self._owner_cache.pop, key, None)
+        return target
+
+    def _create_view(self, owner: Type[Any], participants: list['VersionedFunction']) -> '_MergedVersionedFunction':
+        """
+        Create a merged view of this function and the functions it inherits versions from.
+
+        Args:
+            owner (Type[Any]): The owner class the view is created for.
+            participants (list[VersionedFunction]): The functions to merge, base classes first.
+
+        Returns:
+            _MergedVersionedFunction: The merged view.
+        """
+        return _MergedVersionedFunction(self, owner, participants)
+
+    def _get_versioned_functions_in_mro(self, owner: Type[Any]) -> list['VersionedFunction']:
+        """
+        Get the versioned functions sharing this function's name in the method resolution order (MRO).
+        Only classes from the one defining this function upwards are considered, and the result is
+        ordered base-first so that subclass versions override base class versions when merged.
+
+        :param owner: The owner class.
+        :return: A list of versioned functions, base classes first.
+        """
+        functions: list[VersionedFunction] = []
+        attr_name = self.name.split('.')[-1]
+
+        for cls in getattr(owner, '__mro__', ()):
+            cls_attr = cls.__dict__.get(attr_name)
+            if isinstance(cls_attr, (classmethod, staticmethod)):
+                cls_attr = cls_attr.__func__
+            if cls_attr is self or (functions and isinstance(cls_attr, VersionedFunction)):
+                functions.append(cls_attr)
+
+        # Reverse MRO to ensure subclass versions override base class versions
+        functions.reverse()
+        return functions
+
+    def __repr__(self) -> str:
+        """
+        Return a string representation of the VersionedFunction.
+
+        Returns:
+            str: The string representation.
+        """
+        return f'<VersionedFunction {self.name} versions: {self.available_versions}>'
+
+    @property
+    def __name__(self) -> str:
+        """
+        Return the function's name, without its module and enclosing classes.
+        """
+        return self.name.rsplit('.', 1)[-1]
+
+    def __reduce__(self) -> tuple[Callable, tuple[Any, ...]]:
+        """
+        Pickle by reference: only the function key is stored, and the function is looked up in the registry of
+        the unpickling process, importing its module if needed.
+
+        Raises:
+            TypeError: If the function is not registered.
+        """
+        if _versioned_functions_registry.get(self.name) is not self:
+            raise TypeError(f"Cannot pickle function '{self.name}': it is not registered.")
+        return _restore_versioned_function, (self.name, self._module())
+
+    def _module(self) -> Optional[str]:
+        """
+        Return the module defining the function's implementations, for re-importing it in another process.
+
+        Returns:
+            Optional[str]: The module name, or None if it cannot be determined.
+        """
+        latest_func = self._snapshot.latest_func
+        return getattr(latest_func, '__module__', None)
+
+    # Helper Methods to Reduce Conditional Complexity
+
+    def _call_specific_version(self, _version: str, *args: Any, **kwargs: Any) -> Any:
+        """
+        Call a specific version of the function.
+
+        Args:
+            _version (str): The version or version range to call.
+            *args: Positional arguments.
+            **kwargs: Keyword arguments.
+
+        Returns:
+            Any: Result of the function call.
+
+        Raises:
+            VersionNotFoundError: If no version matches.
+        """
+        snapshot = self._snapshot
+        func = snapshot.targets.get(_version)
+        if func is None:
+            _version = self._resolve(snapshot, _version)
+            func = snapshot.targets[_version]
+        info = snapshot.deprecated.get(_version)
+        if info is not None:
+            self._warn_deprecated(info)
+        return func(*args, **kwargs)
+
+    def _call_latest_version(self, *args: Any, **kwargs: Any) -> Any:
+        """
+        Call the latest version of the function.
+
+        Args:
+            *args: Positional arguments.
+            **kwargs: Keyword arguments.
+
+        Returns:
+            Any: Result of the function call.
+
+        Raises:
+            NoVersionsFoundError: If no versions are registered.
+        """
+        snapshot = self._snapshot
+        func = snapshot.serving
+        if func is None:
+            raise NoVersionsFoundError(f"No versions registered for function '{self.name}'.")
+        if snapshot.serving_deprecated:
+            self._warn_deprecated(snapshot.deprecated[snapshot.serving_version])
+        return func(*args, **kwargs)
+
+    def _resolve(self, snapshot: _Snapshot, version_spec: str) -> str:
+        """
+        Resolve a version or version range against a snapshot, caching resolved ranges in the snapshot.
+
+        Args:
+            snapshot (_Snapshot): The snapshot to resolve against.
+            version_spec (str): The version or version range.
+
+        Returns:
+            str: The resolved version identifier.
+
+        Raises:
+            VersionNotFoundError: If no version matches.
+        """
+        if version_spec in snapshot.versions:
+            return version_spec
+        resolved = snapshot.ranges.get(version_spec)
+        if resolved is not None:
+            return resolved
+
+        try:
+            version_range = parse_range(version_spec)
+        except (InvalidVersionError, TypeError, AttributeError):
+            version_range = None
+        if version_range is not None:
+            resolved = version_range.best_match(snapshot.index.ids, snapshot.index.keys)
+        if resolved is None:
+            raise VersionNotFoundError(f"Version '{version_spec}' not found for function '{self.name}'.")
+
+        if len(snapshot.ranges) >= _RANGE_CACHE_SIZE:
+            snapshot.ranges.clear()
+        snapshot.ranges[version_spec] = resolved
+        return resolved
+
+    def _warn_deprecated(self, info: VersionInfo) -> None:
+        """
+        Report a call to a deprecated version; the warning is only issued once per call site.
+
+        Args:
+            info (VersionInfo): The metadata of the deprecated version.
+        """
+        from .deprecation import report_deprecated_call
+
+        info.deprecated_calls += 1
+        message = f"Version '{info.version}' of function '{self.name}' is deprecated"
+        if info.sunset is not None:
+            message += f' and will be removed after {info.sunset.isoformat()}'
+        report_deprecated_call(self.name, info.version, f'{message}.')
+
+    def _validate_new_version(self, version_id: str) -> VersionKey:
+        """
+        Validate that the new version can be added.
+
+        Args:
+            version_id (str): The version identifier to validate.
+
+        Returns:
+            VersionKey: The parsed version, so it does not need to be parsed again.
+
+        Raises:
+            VersionAlreadyExistsError: If the version is already registered or invalid.
+        """
+        if self._version_exists(version_id):
+            raise VersionExistsError(f"Version '{version_id}' is already registered for function '{self.name}'.")
+        return parse_version(version_id)
+
+    def _check_not_frozen(self) -> None:
+        """
+        Ensure the registry may still be modified.
+
+        Raises:
+            RegistryFrozenError: If the registry has been frozen.
+        """
+        if _frozen:
+            raise RegistryFrozenError(f"Cannot modify function '{self.name}': the version registry is frozen.")
+
+    def _position(self, index: _VersionIndex, version_id: str) -> int:
+        """
+        Locate a registered version in a version index.
+
+        Args:
+            index (_VersionIndex): The version index to search.
+            version_id (str): The version identifier to locate.
+
+        Returns:
+            int: The position of the version in ascending order.
+
+        Raises:
+            VersionNotFoundError: If the specified version does not exist.
+        """
+        if version_id not in index.parsed:
+            raise VersionNotFoundError(f"Version '{version_id}' not found for function '{self.name}'.")
+        return index.position(version_id)
+
+    def _version_exists(self, version_id: str) -> bool:
+        """
+        Check if a version exists.
+
+        Args:
+            version_id (str): The version identifier to check.
+
+        Returns:
+            bool: True if exists, False otherwise.
+        """
+        return version_id in self._snapshot.versions
+
+
+class _OriginAttribute:
+    """
+    An attribute of a merged view that is stored on the function found on the view's owner class.
+    """
+
+    def __set_name__(self, owner: Type[Any], name: str) -> None:
+        """
+        Remember the name of the attribute.
+        """
+        self.name = name
+
+    def __get__(self, view: Optional['_MergedVersionedFunction'], owner: Optional[Type[Any]] = None) -> Any:
+        """
+        Read the attribute from the view's origin.
+        """
+        return self if view is None else getattr(view._origin, self.name)
+
+    def __set__(self, view: '_MergedVersionedFunction', value: Any) -> None:
+        """
+        Write the attribute to the view's origin.
+        """
+        setattr(view._origin, self.name, value)
+
+
+class _MergedVersionedFunction(VersionedFunction):
+    """
+    The versions of a VersionedFunction merged with those it inherits through an owner's MRO.
+
+    Views are created by `VersionedFunction.__get__` and cached per owner class. They are refreshed
+    whenever one of the participating functions changes, and mutations are forwarded to the
+    function that actually provides the version. Routing, shadowing and fallbacks configured through a view are
+    kept on the function found on the owner class, and apply to the calls made through the view.
+    """
+
+    _router = _OriginAttribute()
+    _shadow = _OriginAttribute()
+    _fallback = _OriginAttribute()
+
+    def __init__(self, origin: VersionedFunction, owner: Type[Any], participants: list[VersionedFunction]) -> None:
+        """
+        Initialize the merged view.
+
+        Args:
+            origin (VersionedFunction): The function found on the owner class.
+            owner (Type[Any]): The owner class.
+            participants (list[VersionedFunction]): The functions to merge, base classes first.
+        """
+        self.name = origin.name
+        self._origin = origin
+        self._owner = weakref.ref(owner)
+        self._participants = participants
+        self._owner_cache = {}
+        self._views = None
+        self._pins = {}
+        self._classmethod = origin._classmethod
+        self._instrumented = False
+        self._cache_policies = {}
+        self._cache_all = None
+        self._caches = {}
+        self._compiled = False
+        self._snapshot = _Snapshot({}, _VersionIndex(), {})
+        self._merge()
+        if origin._compiled:
+            self.compile()
+        for participant in participants:
+            if participant._views is None:
+                participant._views = weakref.WeakSet()
+            participant._views.add(self)
+
+    def _merge(self) -> None:
+        """
+        Rebuild the merged versions and index from the participating functions.
+        """
+        versions: dict[str, Callable] = {}
+        parsed: dict[str, VersionKey] = {}
+        info: dict[str, VersionInfo] = {}
+        sources: dict[str, VersionedFunction] = {}
+        for participant in self._participants:
+            snapshot = participant._snapshot
+            versions.update(snapshot.versions)
+            parsed.update(snapshot.index.parsed)
+            info.update(snapshot.info)
+            sources.update(dict.fromkeys(snapshot.versions, participant))
+        self._sources = sources
+        self._publish(versions, _VersionIndex.from_parsed(parsed), info)
+
+    def _wrap_targets(self, versions: dict[str, Callable]) -> Optional[dict[str, Callable]]:
+        """
+        Wrap the implementations with the caches and metrics of the participating functions providing them.
+
+        Calls are cached and recorded by the function that provides the version, whichever class they are made
+        through.
+        """
+        sources = self._sources
+        if not any(source._wraps_targets() for source in sources.values()):
+            return None
+        return {version_id: sources[version_id]._wrap_target(version_id, func) for version_id, func in versions.items()}
+
+    def _republish(self) -> None:
+        """
+        Republish the function found on the owner class, which refreshes this view and its other views.
+
+        Must be called with the registry lock held.
+        """
+        self._origin._republish()
+
+    def __get__(self, instance: Optional[Any], owner: Type[Any]) -> Union['VersionedFunction', _BoundVersionedFunction]:
+        """
+        Bind the view directly; it has already been resolved for its owner.
+        """
+        if self._classmethod:
+            return _BoundVersionedFunction(self, owner)
+        return self if instance is None else _BoundVersionedFunction(self, instance)
+
+    def __reduce__(self) -> tuple[Callable, tuple[Any, ...]]:
+        """
+        Pickle by reference to the attribute of the owner class, which resolves the view again when unpickled.
+        """
+        owner = self._owner()
+        if owner is None:
+            return self._origin.__reduce__()
+        return getattr, (owner, self.__name__)
+
+    def bind(self, version_spec: str) -> PinnedVersion:
+        """
+        Return a callable pinned to a specific version or range of the merged versions; see VersionedFunction.bind().
+
+        The pin remembers the view, so that it is pickled through the owner class and inherited versions are found
+        again when unpickled.
+        """
+        pin = super().bind(version_spec)
+        if pin._view is None:
+            pin._view = self
+        return pin
+
+    def add_version(self, version_id: str, func: Callable) -> None:
+        """
+        Add a new version to the function found on the owner class.
+        """
+        self._origin.add_version(version_id, func)
+
+    def enable_metrics(self) -> None:
+        """
+        Record metrics of the function found on the owner class.
+        """
+        self._origin.enable_metrics()
+
+    def disable_metrics(self) -> None:
+        """
+        Stop recording metrics of the function found on the owner class.
+        """
+        self._origin.disable_metrics()
+
+    def enable_cache(self, maxsize: Optional[int] = 1024, ttl: Optional[float] = None) -> None:
+        """
+        Memoize the results of the function found on the owner class.
+        """
+        self._origin.enable_cache(maxsize, ttl)
+
+    def disable_cache(self) -> None:
+        """
+        Stop memoizing the results of the function found on the owner class.
+        """
+        self._origin.disable_cache()
+
+    def cache_info(self, version_id: str) -> Optional['VersionCache']:
+        """
+        Return the cache of a version on the function that provides it.
+        """
+        return self._source(version_id).cache_info(version_id)
+
+    def deprecate_version(self, version_id: str, sunset: Optional['datetime'] = None) -> None:
+        """
+        Deprecate a version on the function that provides it.
+        """
+        self._source(version_id).deprecate_version(version_id, sunset)
+
+    def remove_version(self, version_id: str) -> None:
+        """
+        Remove a version from the function that provides it.
+        """
+        self._source(version_id).remove_version(version_id)
+
+    def _source(self, version_id: str) -> VersionedFunction:
+        """
+        Return the participating function that provides a version.
+
+        Args:
+            version_id (str): The version identifier.
+
+        Returns:
+            VersionedFunction: The providing function.
+
+        Raises:
+            VersionNotFoundError: If the specified version does not exist.
+        """
+        try:
+            return self._sources[version_id]
+        except KeyError:
+            raise VersionNotFoundError(f"Version '{version_id}' not found for function '{self.name}'.") from None
+
+
+def _lookup_versioned_function(func_key: str, module: Optional[str]) -> VersionedFunction:
+    """
+    Look up a registered function by its key, importing the module defining it if it isn't registered yet.
+
+    Args:
+        func_key (str): The key of the versioned function.
+        module (str, optional): The module defining the function.
+
+    Returns:
+        VersionedFunction: The registered function.
+
+    Raises:
+        VersionNotFoundError: If the function is not registered, even after importing its module.
+    """
+    func = _versioned_functions_registry.get(func_key)
+    if func is None and module is not None:
+        importlib.import_module(module)
+        func = _versioned_functions_registry.get(func_key)
+    if func is None:
+        raise VersionNotFoundError(f"Function '{func_key}' is not registered.")
+    return func
+
+
+def _restore_versioned_function(func_key: str, module: Optional[str]) -> VersionedFunction:
+    """
+    Unpickle a VersionedFunction; see VersionedFunction.__reduce__().
+    """
+    return _lookup_versioned_function(func_key, module)
+
+
+def _restore_pinned_version(func_key: str, module: Optional[str], version_spec: str) -> PinnedVersion:
+    """
+    Unpickle a PinnedVersion; see PinnedVersion.__reduce__().
+    """
+    return _lookup_versioned_function(func_key, module).bind(version_spec)
+
+
+def _restore_view_pinned_version(view: VersionedFunction, version_spec: str) -> PinnedVersion:
+    """
+    Unpickle a PinnedVersion taken from a merged view, which was itself unpickled through its owner class.
+    """
+    return view.bind(version_spec)
+
+
+class AsyncVersionedFunction(VersionedFunction):
+    """
+    A VersionedFunction whose versions are coroutine functions or async generator functions.
+
+    Calls return the implementation's own coroutine or async generator, without wrapping it in another coroutine,
+    so awaiting it costs nothing beyond the version dispatch. The wrapper also exposes its name and the latest
+    implementation's code object and defaults the way function-like objects such as Cython functions do, so that
+    `inspect.iscoroutinefunction()`, `inspect.isasyncgenfunction()` and `asyncio.iscoroutinefunction()` recognize it
+    and frameworks take their native async paths.
+    """
+
+    def __init__(self, func_key: str) -> None:
+        """
+        Initialize the AsyncVersionedFunction.
+
+        Args:
+            func_key (str): The unique key of the function being versioned.
+        """
+        super().__init__(func_key)
+        # Coalescing settings, (ttl, maxsize) if enabled, and the resulting single-flight groups by version
+        self._coalescing: Optional[tuple[Optional[float], int]] = None
+        self._flights: dict[str, 'SingleFlight'] = {}
+
+    @property
+    def __code__(self) -> CodeType:
+        """
+        Return the code object of the latest implementation.
+
+        Raises:
+            AttributeError: If there is no latest version or it isn't a plain function.
+        """
+        return self._latest_attribute('__code__')
+
+    @property
+    def __defaults__(self) -> Optional[tuple[Any, ...]]:
+        """
+        Return the default values of the latest implementation.
+        """
+        return self._latest_attribute('__defaults__')
+
+    @property
+    def __kwdefaults__(self) -> Optional[dict[str, Any]]:
+        """
+        Return the keyword-only default values of the latest implementation.
+        """
+        return self._latest_attribute('__kwdefaults__')
+
+    def _latest_attribute(self, attr_name: str) -> Any:
+        """
+        Look up an attribute of the latest implementation.
+
+        Args:
+            attr_name (str): The attribute name.
+
+        Returns:
+            Any: The attribute value.
+
+        Raises:
+            AttributeError: If there is no latest version or it lacks the attribute.
+        """
+        return getattr(self._snapshot.latest_func, attr_name)
+
+    def hedged(self, primary: str, backup: str, after_ms: float = 50) -> 'Hedge':
+        """
+        Return an async callable that hedges slow calls of one version with another.
+
+        Each call starts the primary version and, if it hasn't completed within `after_ms` milliseconds, also starts
+        the backup version; the first successful result is returned and the other call is cancelled. This caps the
+        tail latency of a new version with an occasional slow path by falling back to a stable one, while the new
+        version keeps answering most calls. Both versions follow the function's changes like bind() does.
+
+        Args:
+            primary (str): The version or version range to call first.
+            backup (str): The version or version range to start after the hedge delay.
+            after_ms (float): The hedge delay in milliseconds.
+
+        Returns:
+            Hedge: The hedged callable, with counts of calls, hedged calls and calls won by the backup.
+
+        Raises:
+            VersionNotFoundError: If no version matches the primary or backup.
+            ValueError: If the hedge delay is negative.
+        """
+        if after_ms < 0:
+            raise ValueError(f'after_ms must not be negative, got {after_ms}.')
+        from .hedging import Hedge
+
+        return Hedge(self.name, primary, backup, self.bind(primary), self.bind(backup), after_ms / 1000)
+
+    def enable_coalescing(self, ttl: Optional[float] = None, maxsize: int = 1024) -> None:
+        """
+        Share one execution between concurrent identical calls of the same version.
+
+        Calls with equal, hashable arguments that arrive while an identical call is running await its result instead
+        of running the implementation again. The shared execution runs as a task in the context of the first caller,
+        and cancelling a caller never cancels it. With a `ttl`, successful results are also reused for that many
+        seconds, and once they expire a single call recomputes them while identical calls wait.
+
+        Args:
+            ttl (float, optional): The seconds successful results are reused, or None to only share running calls.
+            maxsize (int): The maximum number of results kept per version.
+
+        Raises:
+            ValueError: If ttl or maxsize is not positive.
+        """
+        if ttl is not None and ttl <= 0:
+            raise ValueError(f'ttl must be positive, got {ttl}.')
+        if maxsize < 1:
+            raise ValueError(f'maxsize must be at least 1, got {maxsize}.')
+        with _registry_lock:
+            self._coalescing = (ttl, maxsize)
+            self._republish()
+
+    def disable_coalescing(self) -> None:
+        """
+        Stop sharing executions between identical calls. Calls already running finish normally.
+        """
+        with _registry_lock:
+            self._coalescing = None
+            self._republish()
+
+    def coalescing_info(self, version_id: str) -> Optional['SingleFlight']:
+        """
+        Return the single-flight group of a version, with its execution and coalesced call counts.
+
+        Args:
+            version_id (str): The version identifier.
+
+        Returns:
+            Optional[SingleFlight]: The group, or None if calls of the version are not coalesced.
+        """
+        return self._flights.get(version_id)
+
+    def _wrap_targets(self, versions: dict[str, Callable]) -> Optional[dict[str, Callable]]:
+        """
+        Wrap the implementations of a snapshot that is about to be published, coalescing calls if enabled.
+        """
+        flights = {}
+        if self._coalescing is not None:
+            from .singleflight import SingleFlight
+
+            ttl, maxsize = self._coalescing
+            for version_id, func in versions.items():
+                flight = self._flights.get(version_id)
+                if flight is None or flight.func is not func or (flight.ttl, flight.maxsize) != self._coalescing:
+                    flight = SingleFlight(self.name, version_id, func, ttl, maxsize)
+                flights[version_id] = flight
+        self._flights = flights
+        return super()._wrap_targets(versions)
+
+    def _wraps_targets(self) -> bool:
+        """
+        Check whether calls of this function's versions go through any wrappers.
+
+        Returns:
+            bool: True if coalescing, metrics or caches are enabled.
+        """
+        return bool(self._flights) or super()._wraps_targets()
+
+    def _wrap_target(self, version_id: str, func: Callable) -> Callable:
+        """
+        Wrap one of this function's implementations with its single-flight group, cache and metrics, if enabled.
+        """
+        flight = self._flights.get(version_id)
+        if flight is not None:
+            func = flight.wrap(func)
+        return super()._wrap_target(version_id, func)
+
+    def _create_view(self, owner: Type[Any], participants: list[VersionedFunction]) -> '_MergedVersionedFunction':
+        """
+        Create an async merged view of this function and the functions it inherits versions from.
+        """
+        return _AsyncMergedVersionedFunction(self, owner, participants)
+
+
+class _AsyncMergedVersionedFunction(_MergedVersionedFunction, AsyncVersionedFunction):
+    """
+    A merged view of an AsyncVersionedFunction.
+    """
+
+    def enable_coalescing(self, ttl: Optional[float] = None, maxsize: int = 1024) -> None:
+        """
+        Coalesce calls of the function found on the owner class.
+        """
+        self._origin.enable_coalescing(ttl, maxsize)
+
+    def disable_coalescing(self) -> None:
+        """
+        Stop coalescing calls of the function found on the owner class.
+        """
+        self._origin.disable_coalescing()
+
+    def coalescing_info(self, version_id: str) -> Optional['SingleFlight']:
+        """
+        Return the single-flight group of a version on the function that provides it.
+        """
+        return self._source(version_id).coalescing_info(version_id)
+
+
+def is_async_function(func: Callable) -> bool:
+    """
+    Check whether a function is a coroutine function or an async generator function.
+
+    Args:
+        func (Callable): The function to check.
+
+    Returns:
+        bool: True if calling it returns a coroutine or an async generator, False otherwise.
+    """
+    return bool(getattr(getattr(func, '__code__', None), 'co_flags', 0) & _ASYNC_CODE_FLAGS)
+
+
+def freeze(gc_freeze: bool = False) -> None:
+    """
+    Freeze the version registry for the steady-state of a fully imported application.
+
+    Every registered function is switched to compiled dispatch, so the latest version, deprecations and the
+    per-version dispatch table are resolved once. Any further registration, removal or deprecation, or creating a
+    new VersionedFunction, raises RegistryFrozenError.
+
+    Args:
+        gc_freeze (bool): Also call `gc.freeze()`, moving all tracked objects into the permanent generation so
+            that pre-fork servers share those pages copy-on-write with their workers.
+    """
+    global _frozen, _gc_frozen
+    with _registry_lock:
+        for func in list(_versioned_functions_registry.values()):
+            func.compile()
+        _frozen = True
+        if gc_freeze:
+            gc.freeze()
+            _gc_frozen = True
+
+
+def unfreeze() -> None:
+    """
+    Make the version registry mutable again after freeze().
+
+    Functions keep compiled dispatch. If freeze() also froze the garbage collector, `gc.unfreeze()` is called.
+    """
+    global _frozen, _gc_frozen
+    with _registry_lock:
+        _frozen = False
+        if _gc_frozen:
+            gc.unfreeze()
+            _gc_frozen = False
+
+
+def is_frozen() -> bool:
+    """
+    Return whether the version registry is frozen.
+
+    Returns:
+        bool: True if frozen, False otherwise.
+    """
+    return _frozen
@@ -0,0 +1,132 @@
+import sys
+import time
+import warnings
+from typing import NamedTuple, Optional
+
+# Call counts per (function key, version, filename, line number) of every call site of a deprecated version
+_site_counts: dict[tuple[str, str, str, int], list[int]] = {}
+
+# Interval in seconds between automatic summaries, or None to only emit them on demand
+_summary_interval: Optional[float] = None
+_last_summary: float = time.monotonic()
+
+
+class DeprecationRecord(NamedTuple):
+    """Aggregated calls to a deprecated version from a single call site."""
+
+    function: str
+    version: str
+    filename: str
+    lineno: int
+    calls: int
+
+    @property
+    def suppressed(self) -> int:
+        """
+        Return the number of calls that did not issue a warning.
+
+        Returns:
+            int: The number of suppressed warnings.
+        """
+        return self.calls - 1
+
+
+def report_deprecated_call(func_key: str, version_id: str, message: str) -> None:
+    """
+    Report a call to a deprecated version.
+
+    The first call from each call site issues a DeprecationWarning attributed to that call site. Later calls
+    from the same site only increment a counter, so hot loops don't pay for the warnings machinery or flood logs.
+
+    Args:
+        func_key (str): The key of the versioned function.
+        version_id (str): The deprecated version identifier.
+        message (str): The warning message.
+    """
+    # Find the first frame outside of funcversion, and the matching stacklevel for warnings.warn()
+    frame = sys._getframe(1)
+    stacklevel = 2
+    while frame.f_back is not None and _is_internal(frame.f_globals.get('__name__', '')):
+        frame = frame.f_back
+        stacklevel += 1
+
+    key = (func_key, version_id, frame.f_code.co_filename, frame.f_lineno)
+    count = _site_counts.get(key)
+    if count is None:
+        warnings.warn(message, DeprecationWarning, stacklevel=stacklevel)
+        # Only remember the site once the warning went through, so 'error' filters keep raising
+        _site_counts[key] = [1]
+    else:
+        count[0] += 1
+        if _summary_interval is not None and time.monotonic() - _last_summary >= _summary_interval:
+            emit_deprecation_summary()
+
+
+def deprecation_summary(reset: bool = False) -> list[DeprecationRecord]:
+    """
+    Return the aggregated calls to deprecated versions, most frequent first.
+
+    Args:
+        reset (bool): Clear the collected counts afterwards, which also re-enables the warning at each site.
+
+    Returns:
+        list[DeprecationRecord]: One record per function, version and call site.
+    """
+    records = [
+        DeprecationRecord(func_key, version_id, filename, lineno, count[0])
+        for (func_key, version_id, filename, lineno), count in list(_site_counts.items())
+    ]
+    if reset:
+        _site_counts.clear()
+    records.sort(key=lambda record: record.calls, reverse=True)
+    return records
+
+
+def emit_deprecation_summary(reset: bool = True) -> None:
+    """
+    Log a summary of the calls to deprecated versions to the 'funcversion' logger.
+
+    Args:
+        reset (bool): Clear the collected counts afterwards.
+    """
+    global _last_summary
+    # Warning about deprecated calls doesn't need logging, only emitting summaries does
+    import logging
+
+    _last_summary = time.monotonic()
+    logger = logging.getLogger('funcversion')
+    for record in deprecation_summary(reset=reset):
+        logger.warning(
+            "Deprecated version '%s' of function '%s' called %d times (%d warnings suppressed) at %s:%d",
+            record.version,
+            record.function,
+            record.calls,
+            record.suppressed,
+            record.filename,
+            record.lineno,
+        )
+
+
+def set_deprecation_summary_interval(seconds: Optional[float]) -> None:
+    """
+    Emit deprecation summaries automatically from the call path at most once per interval.
+
+    Args:
+        seconds (float, optional): The interval in seconds, or None to only emit summaries on demand.
+    """
+    global _summary_interval, _last_summary
+    _summary_interval = seconds
+    _last_summary = time.monotonic()
+
+
+def _is_internal(module_name: str) -> bool:
+    """
+    Check whether a module belongs to funcversion.
+
+    Args:
+        module_name (str): The module name.
+
+    Returns:
+        bool: True if internal, False otherwise.
+    """
+    return module_name == 'funcversion' or module_name.startswith('funcversion.')
@@ -0,0 +1,154 @@
+import inspect
+from typing import Any, Callable, Iterable, Optional
+
+from .context import _active_versions
+
+# Template for a generated dispatch trampoline; see build_trampoline()
+_TRAMPOLINE_TEMPLATE = """\
+def __call__({params}):
+    if _version is None:
+        _pins = _active_versions.get()
+        if _pins is None or (_version := _pins.get(_name)) is None:
+            return _latest({args})
+    target = _targets.get(_version)
+    if target is None:
+        return {self_name}._call_specific_version(_version, {args})
+    return target({args})
+"""
+
+# Names used by the template, which implementations' parameters must not shadow
+_RESERVED_NAMES = frozenset(('_version', '_pins', '_active_versions', '_name', '_latest', '_targets', 'target'))
+
+
+def build_trampoline(
+    name: str, latest: Callable, targets: dict[str, Callable], implementations: Iterable[Callable]
+) -> Optional[Callable]:
+    """
+    Generate a ``__call__`` that matches the signature of the registered implementations.
+
+    The generated function takes the VersionedFunction as its first argument, followed by the implementation's
+    own parameters and a keyword-only ``_version``. Unversioned calls outside of a `use_versions()` scope go straight
+    to `latest` and versioned calls are looked up in `targets`, so the implementation is reached with a single extra
+    frame and no argument packing. Versions missing from `targets` fall back to ``_call_specific_version``.
+
+    Args:
+        name (str): The key of the versioned function, used for the trampoline's qualified name.
+        latest (Callable): The callable serving unversioned calls.
+        targets (dict[str, Callable]): The callables serving each version identifier.
+        implementations (Iterable[Callable]): All registered implementations.
+
+    Returns:
+        Optional[Callable]: The trampoline, or None if the implementations don't share one introspectable
+        signature and the generic dispatch path must be used.
+    """
+    signature = _shared_signature(implementations)
+    if signature is None or any(param in _RESERVED_NAMES for param in signature.parameters):
+        return None
+
+    self_name = '_vf_self'
+    while self_name in signature.parameters:
+        self_name = f'_{self_name}'
+
+    namespace: dict[str, Any] = {
+        '__name__': __name__,
+        '_active_versions': _active_versions,
+        '_name': name,
+        '_latest': latest,
+        '_targets': targets,
+    }
+    params, args = _render_parameters(signature, self_name, namespace)
+    source = _TRAMPOLINE_TEMPLATE.format(params=', '.join(params), args=', '.join(args), self_name=self_name)
+    exec(compile(source, f'<funcversion trampoline {name}>', 'exec'), namespace)
+
+    trampoline = namespace['__call__']
+    trampoline.__qualname__ = f'{name}.__call__'
+    return trampoline
+
+
+def _shared_signature(implementations: Iterable[Callable]) -> Optional[inspect.Signature]:
+    """
+    Return the signature shared by all implementations, ignoring annotations.
+
+    Args:
+        implementations (Iterable[Callable]): The implementations to inspect.
+
+    Returns:
+        Optional[inspect.Signature]: The shared signature, or None if there is none.
+    """
+    shared = None
+    for func in implementations:
+        try:
+            signature = inspect.signature(func)
+        except (TypeError, ValueError):
+            return None
+        signature = signature.replace(
+            parameters=[p.replace(annotation=p.empty) for p in signature.parameters.values()],
+            return_annotation=signature.empty,
+        )
+        if shared is None:
+            shared = signature
+        elif signature != shared:
+            return None
+    return shared
+
+
+def _render_parameters(
+    signature: inspect.Signature, self_name: str, namespace: dict[str, Any]
+) -> tuple[list[str], list[str]]:
+    """
+    Render a signature as trampoline parameters and forwarding arguments.
+
+    Default values are placed in `namespace` and referenced by name from the generated source.
+
+    Args:
+        signature (inspect.Signature): The implementation's signature.
+        self_name (str): The name of the VersionedFunction parameter.
+        namespace (dict[str, Any]): The namespace the trampoline is compiled in.
+
+    Returns:
+        tuple[list[str], list[str]]: The parameter list and the argument list.
+    """
+    params = [self_name]
+    args = []
+    slash_seen = False
+    star_seen = False
+
+    for param in signature.parameters.values():
+        default = ''
+        if param.default is not param.empty:
+            namespace[f'_default_{param.name}'] = param.default
+            default = f'=_default_{param.name}'
+
+        if param.kind is not param.POSITIONAL_ONLY and not slash_seen:
+            # The VersionedFunction itself is always passed positionally
+            slash_seen = True
+            params.append('/')
+
+        if param.kind in (param.POSITIONAL_ONLY, param.POSITIONAL_OR_KEYWORD):
+            params.append(f'{param.name}{default}')
+            args.append(param.name)
+        elif param.kind is param.VAR_POSITIONAL:
+            star_seen = True
+            params.append(f'*{param.name}')
+            args.append(f'*{param.name}')
+        elif param.kind is param.KEYWORD_ONLY:
+            if not star_seen:
+                star_seen = True
+                params.append('*')
+            params.append(f'{param.name}{default}')
+            args.append(f'{param.name}={param.name}')
+        else:
+            if not star_seen:
+                star_seen = True
+                params.append('*')
+            params.append('_version=None')
+            params.append(f'**{param.name}')
+            args.append(f'**{param.name}')
+
+    if not slash_seen:
+        params.append('/')
+    if '_version=None' not in params:
+        if not star_seen:
+            params.append('*')
+        params.append('_version=None')
+    return params, args
@@ -23,3 +23,27 @@ class VersionExistsError(Exception):
     """Exception raised when a version already exists."""
 
     pass
+
+
+class RegistryFrozenError(Exception):
+    """Exception raised when modifying versions after the registry has been frozen."""
+
+    pass
+
+
+class ReleaseExistsError(Exception):
+    """Exception raised when an API release has already been declared."""
+
+    pass
+
+
+class ReleaseNotFoundError(Exception):
+    """Exception raised when a specified API release is not found."""
+
+    pass
+
+
+class CircuitOpenError(Exception):
+    """Exception raised when the circuit breakers of all versions a call could fall back to are open."""
+
+    pass
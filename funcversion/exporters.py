@@ -0,0 +1,334 @@
+import os
+import tempfile
+import threading
+from bisect import bisect_left
+from itertools import accumulate
+from typing import TYPE_CHECKING, Iterator, Optional, Sequence
+
+from . import metrics
+from .core import _versioned_functions_registry
+from .metrics import BUCKET_COUNT, bucket_upper_bound
+
+if TYPE_CHECKING:
+    from http.server import ThreadingHTTPServer
+
+# Histogram bucket bounds in seconds, spanning microsecond helpers to multi-second calls
+DEFAULT_BUCKETS = (
+    1e-06,
+    1e-05,
+    0.0001,
+    0.00025,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+OPENMETRICS_CONTENT_TYPE = 'application/openmetrics-text; version=1.0.0; charset=utf-8'
+# The Prometheus text format, which node exporter's textfile collector reads
+TEXT_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# Approximate number of characters sent per write when serving over HTTP
+_WRITE_BATCH_SIZE = 65536
+
+# The exported metric families: name and help text
+_CALLS = ('funcversion_calls', 'Calls of instrumented function versions.')
+_ERRORS = ('funcversion_errors', 'Calls of instrumented function versions that raised an exception.')
+_DEPRECATED_CALLS = ('funcversion_deprecated_calls', 'Calls of deprecated function versions.')
+_DURATION = ('funcversion_call_duration_seconds', 'Latency of instrumented function versions.')
+
+
+class MetricsExporter:
+    """
+    Renders the metrics of all versioned functions in the OpenMetrics or Prometheus text format.
+
+    Exported are the calls, errors and latency histograms of functions with metrics enabled, and the calls of
+    deprecated versions of every registered function. The fine-grained latency histograms are folded into the
+    configured bucket bounds; a latency counts towards a bound only if its whole histogram bucket lies below it,
+    so percentiles are overestimated by at most 6.25%.
+
+    Rendering streams the output in chunks and keeps the rendered samples of every series: series that have not
+    been called since the previous scrape are not folded or formatted again, so scraping thousands of rarely
+    called versions costs little more than copying their text.
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS) -> None:
+        """
+        Initialize the MetricsExporter.
+
+        Args:
+            buckets (Sequence[float]): The upper bounds of the exported histogram buckets in seconds, ascending.
+
+        Raises:
+            ValueError: If the bounds are empty, not positive or not ascending.
+        """
+        buckets = tuple(float(bound) for bound in buckets)
+        if not buckets or buckets[0] <= 0 or any(a >= b for a, b in zip(buckets, buckets[1:])):
+            raise ValueError('Histogram buckets must be positive and strictly ascending.')
+        self.buckets: tuple[float, ...] = buckets
+        self._le_labels = tuple(f'le="{bound!r}"' for bound in buckets) + ('le="+Inf"',)
+        # For each exported bucket, the end of the run of fine-grained buckets folded into it
+        bounds_ns = [bound * 1e9 for bound in buckets]
+        folded = [bisect_left(bounds_ns, bucket_upper_bound(index) - 1) for index in range(BUCKET_COUNT)]
+        self._fold_ends = tuple(bisect_left(folded, bucket + 1) for bucket in range(len(buckets) + 1))
+        # Rendered samples by function key and version; replaced as a whole after every render
+        self._series: dict[tuple[str, str], tuple[list[int], int, int, str, str, str]] = {}
+
+    def render(self, openmetrics: bool = True) -> Iterator[str]:
+        """
+        Render the metrics in chunks.
+
+        Args:
+            openmetrics (bool): Render the OpenMetrics format, or else the Prometheus text format.
+
+        Returns:
+            Iterator[str]: The chunks of the exposition.
+        """
+        series = self._render_series()
+
+        if series:
+            yield self._header(_CALLS, 'counter', openmetrics)
+            yield from (samples[3] for samples in series.values())
+            yield self._header(_ERRORS, 'counter', openmetrics)
+            yield from (samples[4] for samples in series.values())
+
+        deprecated = [
+            f'funcversion_deprecated_calls_total{{{_labels(func.name, version_id)}}} {info.deprecated_calls}\n'
+            for func in list(_versioned_functions_registry.values())
+            for version_id, info in func._snapshot.deprecated.items()
+        ]
+        if deprecated:
+            yield self._header(_DEPRECATED_CALLS, 'counter', openmetrics)
+            yield ''.join(deprecated)
+
+        if series:
+            yield self._header(_DURATION, 'histogram', openmetrics)
+            yield from (samples[5] for samples in series.values())
+        if openmetrics:
+            yield '# EOF\n'
+
+    def serve(self, port: int, addr: str = '') -> 'ThreadingHTTPServer':
+        """
+        Serve the metrics over HTTP from a background thread.
+
+        Scrapers asking for OpenMetrics through their Accept header get it, others get the Prometheus text format.
+
+        Args:
+            port (int): The port to listen on; 0 picks a free one, see `server.server_address`.
+            addr (str): The address to bind to; all interfaces by default.
+
+        Returns:
+            ThreadingHTTPServer: The running server; call `shutdown()` and `server_close()` to stop it.
+        """
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        exporter = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                openmetrics = 'application/openmetrics-text' in self.headers.get('Accept', '')
+                self.send_response(200)
+                self.send_header('Content-Type', OPENMETRICS_CONTENT_TYPE if openmetrics else TEXT_CONTENT_TYPE)
+                # Without a Content-Length the response ends when the connection closes, so it can be streamed
+                self.send_header('Connection', 'close')
+                self.end_headers()
+                # Send in batches rather than one write per series
+                batch: list[str] = []
+                size = 0
+                for chunk in exporter.render(openmetrics):
+                    batch.append(chunk)
+                    size += len(chunk)
+                    if size >= _WRITE_BATCH_SIZE:
+                        self.wfile.write(''.join(batch).encode())
+                        batch.clear()
+                        size = 0
+                self.wfile.write(''.join(batch).encode())
+
+            def log_message(self, format: str, *args: object) -> None:
+                # Scrapes are too frequent to log
+                pass
+
+        server = ThreadingHTTPServer((addr, port), Handler)
+        server.daemon_threads = True
+        thread = threading.Thread(target=server.serve_forever, name='funcversion-metrics', daemon=True)
+        thread.start()
+        return server
+
+    def write_textfile(self, path: str) -> None:
+        """
+        Write the metrics in the Prometheus text format, for node exporter's textfile collector.
+
+        The file is replaced atomically, so the collector never reads a partial file.
+
+        Args:
+            path (str): The file to write, which should end in `.prom`.
+        """
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, temp_path = tempfile.mkstemp(dir=directory, prefix='.funcversion-', suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as file:
+                file.writelines(self.render(openmetrics=False))
+            os.chmod(temp_path, 0o644)
+            os.replace(temp_path, path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+
+    def write_periodically(self, path: str, interval: float = 15.0) -> 'TextfileWriter':
+        """
+        Rewrite a textfile with the metrics from a background thread.
+
+        Args:
+            path (str): The file to write.
+            interval (float): The seconds between writes.
+
+        Returns:
+            TextfileWriter: The running writer; call `stop()` to stop it.
+        """
+        writer = TextfileWriter(self, path, interval)
+        writer.start()
+        return writer
+
+    def _render_series(self) -> dict[tuple[str, str], tuple[list[int], int, int, str, str, str]]:
+        """
+        Render the samples of every instrumented version, reusing those that have not changed.
+
+        Returns:
+            dict: The counts the samples were rendered from, the call count, the error count, and the calls,
+            errors and histogram samples, by function key and version.
+        """
+        with metrics._lock:
+            recorders = [
+                (function, version_id, recorder)
+                for function, versions in metrics._recorders.items()
+                for version_id, recorder in versions.items()
+            ]
+
+        previous = self._series
+        series = {}
+        for function, version_id, recorder in recorders:
+            key = (function, version_id)
+            counts = recorder.counts
+            calls = sum(counts)
+            errors = recorder.errors
+            cached = previous.get(key)
+            # Counts are swapped for a new list on reset, so an identical list and call count means no new calls
+            if cached is not None and cached[0] is counts and cached[1] == calls and cached[2] == errors:
+                series[key] = cached
+                continue
+
+            labels = _labels(function, version_id)
+            start = 0
+            folded = []
+            for end in self._fold_ends:
+                folded.append(sum(counts[start:end]))
+                start = end
+            lines = [
+                f'funcversion_call_duration_seconds_bucket{{{labels},{le}}} {count}\n'
+                for le, count in zip(self._le_labels, accumulate(folded))
+            ]
+            lines.append(f'funcversion_call_duration_seconds_count{{{labels}}} {calls}\n')
+            lines.append(f'funcversion_call_duration_seconds_sum{{{labels}}} {recorder.total_ns / 1e9!r}\n')
+            series[key] = (
+                counts,
+                calls,
+                errors,
+                f'funcversion_calls_total{{{labels}}} {calls}\n',
+                f'funcversion_errors_total{{{labels}}} {errors}\n',
+                ''.join(lines),
+            )
+        self._series = series
+        return series
+
+    @staticmethod
+    def _header(family: tuple[str, str], metric_type: str, openmetrics: bool) -> str:
+        """
+        Return the TYPE and HELP lines of a metric family.
+
+        Counter families are named without the `_total` suffix of their samples in OpenMetrics, and with it in the
+        Prometheus text format.
+        """
+        name, help_text = family
+        if metric_type == 'counter' and not openmetrics:
+            name += '_total'
+        return f'# TYPE {name} {metric_type}\n# HELP {name} {help_text}\n'
+
+
+class TextfileWriter(threading.Thread):
+    """
+    A background thread rewriting a metrics textfile at a fixed interval; see MetricsExporter.write_periodically().
+    """
+
+    def __init__(self, exporter: MetricsExporter, path: str, interval: float) -> None:
+        """
+        Initialize the TextfileWriter.
+
+        Args:
+            exporter (MetricsExporter): The exporter rendering the metrics.
+            path (str): The file to write.
+            interval (float): The seconds between writes.
+        """
+        super().__init__(name='funcversion-textfile', daemon=True)
+        self.exporter = exporter
+        self.path = path
+        self.interval = interval
+        # The exception raised by the most recent write, if it failed
+        self.error: Optional[Exception] = None
+        self._stopped = threading.Event()
+
+    def run(self) -> None:
+        """
+        Write the textfile until stopped.
+        """
+        while True:
+            try:
+                self.exporter.write_textfile(self.path)
+                self.error = None
+            except Exception as e:  # Retried at the next interval
+                self.error = e
+            if self._stopped.wait(self.interval):
+                return
+
+    def stop(self) -> None:
+        """
+        Stop writing and wait for the thread to exit.
+        """
+        self._stopped.set()
+        self.join()
+
+
+def _labels(function: str, version_id: str) -> str:
+    """
+    Format the label set of a series.
+
+    Args:
+        function (str): The key of the versioned function.
+        version_id (str): The version identifier.
+
+    Returns:
+        str: The labels, without braces.
+    """
+    return f'function="{_escape(function)}",version="{_escape(version_id)}"'
+
+
+def _escape(value: str) -> str:
+    """
+    Escape a label value.
+
+    Args:
+        value (str): The label value.
+
+    Returns:
+        str: The escaped label value.
+    """
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
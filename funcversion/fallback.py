@@ -0,0 +1,254 @@
+from time import monotonic
+from typing import Any, Callable, Sequence, Type, Union
+
+from .exceptions import CircuitOpenError
+
+
+class CircuitBreaker:
+    """
+    Tracks the failure rate of one version and stops calling it while it is failing.
+
+    The state is a handful of plain attributes. Checking whether the breaker is closed reads one of them and
+    recording a success updates two, so the breaker adds no locking to the call path. The failure rate is an
+    exponential moving average over roughly the last `window` calls. Once it reaches the threshold the breaker
+    opens, and after `reset_timeout` seconds one call probes the version again: a success closes the breaker, a
+    failure keeps it open for another `reset_timeout`. Calls that were already running when the breaker opened
+    update the failure rate but neither close nor extend it. Updates from concurrent calls may occasionally be lost,
+    which only shifts the failure rate slightly.
+    """
+
+    __slots__ = (
+        'version',
+        'threshold',
+        'min_calls',
+        'reset_timeout',
+        'failure_rate',
+        'calls',
+        'trips',
+        'open_until',
+        '_alpha',
+        '_probe',
+    )
+
+    def __init__(self, version_id: str, threshold: float, min_calls: int, window: int, reset_timeout: float) -> None:
+        """
+        Initialize the CircuitBreaker.
+
+        Args:
+            version_id (str): The version identifier.
+            threshold (float): The failure rate opening the breaker, between 0 and 1.
+            min_calls (int): The number of calls before the breaker may open.
+            window (int): The number of recent calls the failure rate is averaged over.
+            reset_timeout (float): The seconds before an open breaker lets a probe call through.
+        """
+        self.version: str = version_id
+        self.threshold = threshold
+        self.min_calls = min_calls
+        self.reset_timeout = reset_timeout
+        self.failure_rate: float = 0.0
+        self.calls: int = 0
+        self.trips: int = 0
+        # The monotonic time the next probe is allowed at while open, or 0.0 while closed
+        self.open_until: float = 0.0
+        self._alpha = 1 / window
+        # Identifies the latest probe call, so that only its outcome closes or extends the open breaker
+        self._probe: int = 0
+
+    @property
+    def state(self) -> str:
+        """
+        Return the state of the breaker.
+
+        Returns:
+            str: 'closed', 'open', or 'half-open' if the next call will probe the version.
+        """
+        if not self.open_until:
+            return 'closed'
+        return 'open' if monotonic() < self.open_until else 'half-open'
+
+    def allow(self) -> int:
+        """
+        Check whether an open breaker lets a probe call through, and if so, hold back other calls until it returns.
+
+        Returns:
+            int: The token identifying the probe, to pass to success() or failure(), or 0 if the call may not
+            probe the version.
+        """
+        now = monotonic()
+        if now < self.open_until:
+            return 0
+        self.open_until = now + self.reset_timeout
+        self._probe += 1
+        return self._probe
+
+    def success(self, probe: int = 0) -> None:
+        """
+        Record a successful call, closing the breaker if the call was its probe.
+
+        Args:
+            probe (int): The token returned by allow() if the call was a probe.
+        """
+        if self.open_until and probe and probe == self._probe:
+            self.open_until = 0.0
+            self.failure_rate = 0.0
+        self.calls += 1
+        self.failure_rate -= self.failure_rate * self._alpha
+
+    def failure(self, probe: int = 0) -> None:
+        """
+        Record a failed call, opening the breaker if the failure rate reached the threshold.
+
+        Args:
+            probe (int): The token returned by allow() if the call was a probe.
+        """
+        self.calls += 1
+        self.failure_rate += (1 - self.failure_rate) * self._alpha
+        if self.open_until:
+            if probe and probe == self._probe:
+                # A failed probe
+                self.open_until = monotonic() + self.reset_timeout
+        elif self.calls >= self.min_calls and self.failure_rate >= self.threshold:
+            self.open_until = monotonic() + self.reset_timeout
+            self.trips += 1
+
+    def __repr__(self) -> str:
+        """
+        Return a string representation of the CircuitBreaker.
+        """
+        return f'<CircuitBreaker version: {self.version} state: {self.state} failure rate: {self.failure_rate:.2f}>'
+
+
+class Fallback:
+    """
+    Falls back from the serving version to older versions when it raises, with a circuit breaker per version.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        exceptions: Union[Type[BaseException], tuple[Type[BaseException], ...]],
+        depth: int,
+        threshold: float,
+        min_calls: int,
+        window: int,
+        reset_timeout: float,
+    ) -> None:
+        """
+        Initialize the Fallback.
+
+        Args:
+            name (str): The key of the versioned function.
+            exceptions (Union[Type[BaseException], tuple[Type[BaseException], ...]]): The exceptions that count as
+                failures and trigger a fallback; others propagate immediately.
+            depth (int): The number of older versions to fall back to.
+            threshold (float): The failure rate opening a version's breaker, between 0 and 1.
+            min_calls (int): The number of calls before a breaker may open.
+            window (int): The number of recent calls failure rates are averaged over.
+            reset_timeout (float): The seconds before an open breaker lets a probe call through.
+
+        Raises:
+            ValueError: If a setting is out of range.
+        """
+        if depth < 0:
+            raise ValueError(f'depth must not be negative, got {depth}.')
+        if not 0 < threshold <= 1:
+            raise ValueError(f'threshold must be between 0 and 1, got {threshold}.')
+        if min_calls < 1 or window < 1:
+            raise ValueError('min_calls and window must be at least 1.')
+        if reset_timeout <= 0:
+            raise ValueError(f'reset_timeout must be positive, got {reset_timeout}.')
+        self.name: str = name
+        self.exceptions = exceptions
+        self.depth: int = depth
+        # Breakers by version, kept for as long as the fallback is enabled
+        self.breakers: dict[str, CircuitBreaker] = {}
+        self.fallbacks: int = 0
+        self._settings = (threshold, min_calls, window, reset_timeout)
+
+    def breaker(self, version_id: str) -> CircuitBreaker:
+        """
+        Return the breaker of a version, creating it if needed. Must be called with the registry lock held.
+
+        Args:
+            version_id (str): The version identifier.
+
+        Returns:
+            CircuitBreaker: The breaker.
+        """
+        breaker = self.breakers.get(version_id)
+        if breaker is None:
+            breaker = self.breakers[version_id] = CircuitBreaker(version_id, *self._settings)
+        return breaker
+
+    def wrap(self, chain: Sequence[tuple[str, Callable]], asynchronous: bool) -> Callable:
+        """
+        Return a callable trying each version of a chain in turn.
+
+        Args:
+            chain (Sequence[tuple[str, Callable]]): The versions and their callables, the serving version first.
+            asynchronous (bool): Whether the callables return coroutines.
+
+        Returns:
+            Callable: The callable.
+        """
+        exceptions = self.exceptions
+        links = tuple((self.breaker(version_id), target) for version_id, target in chain)
+        primary = links[0][0]
+
+        if asynchronous:
+
+            async def call_async(*args: Any, **kwargs: Any) -> Any:
+                error = None
+                for breaker, target in links:
+                    probe = 0
+                    if breaker.open_until:
+                        probe = breaker.allow()
+                        if not probe:
+                            continue
+                    if breaker is not primary:
+                        self.fallbacks += 1
+                    try:
+                        result = await target(*args, **kwargs)
+                    except exceptions as e:
+                        breaker.failure(probe)
+                        error = e
+                        continue
+                    breaker.success(probe)
+                    return result
+                raise error or self._unavailable()
+
+            return call_async
+
+        def call(*args: Any, **kwargs: Any) -> Any:
+            error = None
+            for breaker, target in links:
+                probe = 0
+                if breaker.open_until:
+                    probe = breaker.allow()
+                    if not probe:
+                        continue
+                if breaker is not primary:
+                    self.fallbacks += 1
+                try:
+                    result = target(*args, **kwargs)
+                except exceptions as e:
+                    breaker.failure(probe)
+                    error = e
+                    continue
+                breaker.success(probe)
+                return result
+            raise error or self._unavailable()
+
+        return call
+
+    def _unavailable(self) -> CircuitOpenError:
+        """
+        Return the error raised when the breakers of all versions in a chain are open.
+        """
+        return CircuitOpenError(f"All versions of function '{self.name}' in the fallback chain are unavailable.")
+
+    def __repr__(self) -> str:
+        """
+        Return a string representation of the Fallback.
+        """
+        return f'<Fallback {self.name} depth: {self.depth} fallbacks: {self.fallbacks} breakers: {self.breakers}>'
@@ -0,0 +1,87 @@
+import asyncio
+from types import MethodType
+from typing import Any, Callable, Optional, Type, Union
+
+
+class Hedge:
+    """
+    An async callable that hedges a primary version with a backup version to cap tail latency.
+
+    Each call starts the primary version. If it hasn't completed after the hedge delay, the backup version is
+    started as well and the first successful result wins; the other call is cancelled. If the first call to finish
+    fails, the other one is awaited, and if both fail the primary's exception is raised. Hedged calls run the backup
+    with the same arguments, so only hedge functions that are safe to run twice.
+    """
+
+    __slots__ = ('name', 'primary', 'backup', 'delay', 'calls', 'hedged', 'backup_wins', '_primary', '_backup')
+
+    def __init__(
+        self, name: str, primary_id: str, backup_id: str, primary: Callable, backup: Callable, delay: float
+    ) -> None:
+        """
+        Initialize the Hedge.
+
+        Args:
+            name (str): The key of the versioned function.
+            primary_id (str): The primary version or version range.
+            backup_id (str): The backup version or version range.
+            primary (Callable): The pinned primary version.
+            backup (Callable): The pinned backup version.
+            delay (float): The seconds to wait for the primary before starting the backup.
+        """
+        self.name: str = name
+        self.primary: str = primary_id
+        self.backup: str = backup_id
+        self.delay: float = delay
+        self.calls: int = 0
+        # Calls that started the backup, and calls the backup answered
+        self.hedged: int = 0
+        self.backup_wins: int = 0
+        self._primary = primary
+        self._backup = backup
+
+    async def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        """
+        Call the primary version, hedged with the backup version.
+        """
+        self.calls += 1
+        primary = asyncio.ensure_future(self._primary(*args, **kwargs))
+        backup: Optional[asyncio.Future] = None
+        try:
+            done, _ = await asyncio.wait((primary,), timeout=self.delay)
+            if done:
+                return primary.result()
+
+            self.hedged += 1
+            backup = asyncio.ensure_future(self._backup(*args, **kwargs))
+            pending = {primary, backup}
+            while True:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for future in (primary, backup):
+                    if future in done and future.exception() is None:
+                        if future is backup:
+                            self.backup_wins += 1
+                        return future.result()
+                if not pending:
+                    # Both failed; also retrieves the backup's exception
+                    backup.exception()
+                    return primary.result()
+        finally:
+            primary.cancel()
+            if backup is not None:
+                backup.cancel()
+
+    def __get__(self, instance: Optional[Any], owner: Optional[Type[Any]] = None) -> Union['Hedge', MethodType]:
+        """
+        Bind like a plain function, so hedged methods can be stored on classes.
+        """
+        return self if instance is None else MethodType(self, instance)
+
+    def __repr__(self) -> str:
+        """
+        Return a string representation of the Hedge.
+        """
+        return (
+            f'<Hedge {self.name} primary: {self.primary} backup: {self.backup} delay: {self.delay}s '
+            f'calls: {self.calls} hedged: {self.hedged} backup wins: {self.backup_wins}>'
+        )
@@ -0,0 +1,314 @@
+import threading
+from time import perf_counter_ns
+from typing import Any, Callable, Iterator, Optional
+
+# Latency histograms have logarithmic buckets in the style of HdrHistogram: every power of two is split into
+# 2 ** _SUB_BITS linear sub-buckets, so a recorded latency is off by at most 1/16 of its value, from a nanosecond up
+# to about 18 minutes, in a fixed 592 counters per version
+_SUB_BITS = 4
+_SUB_BUCKETS = 1 << _SUB_BITS
+# Latencies from 2 ** _MAX_BITS nanoseconds on share the last bucket
+_MAX_BITS = 40
+BUCKET_COUNT = (_MAX_BITS - _SUB_BITS + 1) * _SUB_BUCKETS
+_LAST_BUCKET = BUCKET_COUNT - 1
+
+# CO_COROUTINE
+_COROUTINE_CODE_FLAG = 0x80
+
+# Live recorders by function key and version; guarded by _lock, which callers never take
+_recorders: dict[str, dict[str, '_Recorder']] = {}
+_lock = threading.Lock()
+
+
+def bucket_index(value: int) -> int:
+    """
+    Return the histogram bucket a latency falls into.
+
+    Args:
+        value (int): The latency in nanoseconds.
+
+    Returns:
+        int: The bucket index.
+    """
+    shift = value.bit_length() - _SUB_BITS - 1
+    if shift <= 0:
+        return max(value, 0)
+    return min((shift + 1) * _SUB_BUCKETS + (value >> shift) - _SUB_BUCKETS, _LAST_BUCKET)
+
+
+def bucket_upper_bound(index: int) -> int:
+    """
+    Return the exclusive upper bound of a histogram bucket.
+
+    Args:
+        index (int): The bucket index.
+
+    Returns:
+        int: The upper bound in nanoseconds.
+    """
+    if index < _SUB_BUCKETS:
+        return index + 1
+    shift = index // _SUB_BUCKETS - 1
+    return (index % _SUB_BUCKETS + _SUB_BUCKETS + 1) << shift
+
+
+class Histogram:
+    """
+    A read-only copy of a version's latency histogram.
+    """
+
+    __slots__ = ('counts', 'total_ns', 'max_ns')
+
+    def __init__(self, counts: list[int], total_ns: int, max_ns: int) -> None:
+        """
+        Initialize the Histogram.
+
+        Args:
+            counts (list[int]): The number of calls in each bucket, see bucket_index().
+            total_ns (int): The sum of all latencies in nanoseconds.
+            max_ns (int): The highest latency in nanoseconds.
+        """
+        self.counts = counts
+        self.total_ns = total_ns
+        self.max_ns = max_ns
+
+    @property
+    def count(self) -> int:
+        """
+        Return the number of recorded calls.
+
+        Returns:
+            int: The call count.
+        """
+        return sum(self.counts)
+
+    @property
+    def mean(self) -> float:
+        """
+        Return the mean latency in seconds.
+
+        Returns:
+            float: The mean latency, or 0.0 if nothing was recorded.
+        """
+        count = self.count
+        return self.total_ns / count / 1e9 if count else 0.0
+
+    def percentile(self, percentile: float) -> float:
+        """
+        Return an upper bound of the latency below which the given percentage of calls fall.
+
+        Args:
+            percentile (float): The percentile, between 0 and 100.
+
+        Returns:
+            float: The latency in seconds, or 0.0 if nothing was recorded.
+
+        Raises:
+            ValueError: If the percentile is not between 0 and 100.
+        """
+        if not 0 <= percentile <= 100:
+            raise ValueError(f'percentile must be between 0 and 100, got {percentile}.')
+        count = self.count
+        if not count:
+            return 0.0
+        rank = max(count * percentile / 100, 1)
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= rank:
+                return min(bucket_upper_bound(index), self.max_ns) / 1e9
+        return self.max_ns / 1e9
+
+    def buckets(self) -> Iterator[tuple[float, int]]:
+        """
+        Iterate over the non-empty buckets.
+
+        Returns:
+            Iterator[tuple[float, int]]: The exclusive upper bound of each bucket in seconds and its call count.
+        """
+        for index, bucket_count in enumerate(self.counts):
+            if bucket_count:
+                yield bucket_upper_bound(index) / 1e9, bucket_count
+
+    def __repr__(self) -> str:
+        """
+        Return a string representation of the Histogram.
+        """
+        return f'<Histogram count: {self.count} mean: {self.mean:.3g}s max: {self.max_ns / 1e9:.3g}s>'
+
+
+class VersionMetrics:
+    """
+    The metrics recorded for one version of a function, as returned by snapshot().
+    """
+
+    __slots__ = ('function', 'version', 'errors', 'histogram')
+
+    def __init__(self, function: str, version_id: str, errors: int, histogram: Histogram) -> None:
+        """
+        Initialize the VersionMetrics.
+
+        Args:
+            function (str): The key of the versioned function.
+            version_id (str): The version identifier.
+            errors (int): The number of calls that raised an exception.
+            histogram (Histogram): The latencies of all calls, including failed ones.
+        """
+        self.function = function
+        self.version = version_id
+        self.errors = errors
+        self.histogram = histogram
+
+    @property
+    def calls(self) -> int:
+        """
+        Return the number of calls.
+
+        Returns:
+            int: The call count.
+        """
+        return self.histogram.count
+
+    def __repr__(self) -> str:
+        """
+        Return a string representation of the VersionMetrics.
+        """
+        return f'<VersionMetrics {self.function} version: {self.version} calls: {self.calls} errors: {self.errors}>'
+
+
+class _Recorder:
+    """
+    The live counters of one version, updated by its instrumented callable.
+
+    Recording never locks or allocates, so on free-threaded Python a call racing with another thread may
+    occasionally go uncounted; the counters are statistics, not an audit log.
+    """
+
+    __slots__ = ('errors', 'counts', 'total_ns', 'max_ns')
+
+    def __init__(self) -> None:
+        """
+        Initialize the _Recorder with empty counters.
+        """
+        self.errors = 0
+        self.counts = [0] * BUCKET_COUNT
+        self.total_ns = 0
+        self.max_ns = 0
+
+    def record(self, elapsed_ns: int) -> None:
+        """
+        Record the latency of a call.
+
+        Args:
+            elapsed_ns (int): The latency in nanoseconds.
+        """
+        self.counts[bucket_index(elapsed_ns)] += 1
+        self.total_ns += elapsed_ns
+        if elapsed_ns > self.max_ns:
+            self.max_ns = elapsed_ns
+
+    def read(self, function: str, version_id: str, reset: bool) -> VersionMetrics:
+        """
+        Copy the counters, optionally starting over.
+
+        Args:
+            function (str): The key of the versioned function.
+            version_id (str): The version identifier.
+            reset (bool): Whether to clear the counters.
+
+        Returns:
+            VersionMetrics: The copied metrics.
+        """
+        if reset:
+            # Swap in fresh counters rather than zeroing them, so concurrent calls land in one or the other
+            counts, self.counts = self.counts, [0] * BUCKET_COUNT
+            errors, self.errors = self.errors, 0
+            total_ns, self.total_ns = self.total_ns, 0
+            max_ns, self.max_ns = self.max_ns, 0
+        else:
+            counts, errors, total_ns, max_ns = list(self.counts), self.errors, self.total_ns, self.max_ns
+        return VersionMetrics(function, version_id, errors, Histogram(counts, total_ns, max_ns))
+
+
+def instrument(function: str, version_id: str, func: Callable) -> Callable:
+    """
+    Wrap a version's implementation so that every call is counted and timed.
+
+    Coroutine functions are timed until their coroutine completes. Any other callable, including generator
+    functions, is timed until it returns.
+
+    Args:
+        function (str): The key of the versioned function.
+        version_id (str): The version identifier.
+        func (Callable): The implementation.
+
+    Returns:
+        Callable: The instrumented callable.
+    """
+    with _lock:
+        recorder = _recorders.setdefault(function, {}).get(version_id)
+        if recorder is None:
+            recorder = _recorders[function][version_id] = _Recorder()
+    record = recorder.record
+
+    if getattr(getattr(func, '__code__', None), 'co_flags', 0) & _COROUTINE_CODE_FLAG:
+
+        async def call_async(*args: Any, **kwargs: Any) -> Any:
+            start = perf_counter_ns()
+            try:
+                return await func(*args, **kwargs)
+            except Exception:
+                recorder.errors += 1
+                raise
+            finally:
+                record(perf_counter_ns() - start)
+
+        return call_async
+
+    def call(*args: Any, **kwargs: Any) -> Any:
+        start = perf_counter_ns()
+        try:
+            result = func(*args, **kwargs)
+        except Exception:
+            recorder.errors += 1
+            record(perf_counter_ns() - start)
+            raise
+        # Inlined _Recorder.record(), as this runs on every call
+        elapsed = perf_counter_ns() - start
+        shift = elapsed.bit_length() - _SUB_BITS - 1
+        if shift <= 0:
+            index = elapsed
+        else:
+            index = (shift + 1) * _SUB_BUCKETS + (elapsed >> shift) - _SUB_BUCKETS
+            if index > _LAST_BUCKET:
+                index = _LAST_BUCKET
+        recorder.counts[index] += 1
+        recorder.total_ns += elapsed
+        if elapsed > recorder.max_ns:
+            recorder.max_ns = elapsed
+        return result
+
+    return call
+
+
+def snapshot(reset: bool = False, function: Optional[str] = None) -> dict[str, dict[str, VersionMetrics]]:
+    """
+    Read the metrics of all instrumented functions.
+
+    Args:
+        reset (bool): Whether to clear the counters after reading them, e.g. to report deltas per interval.
+        function (str, optional): Only read the metrics of the function with this key.
+
+    Returns:
+        dict[str, dict[str, VersionMetrics]]: The metrics by function key and version, including versions that
+        have not been called yet.
+    """
+    with _lock:
+        if function is None:
+            recorders = {key: dict(versions) for key, versions in _recorders.items()}
+        else:
+            recorders = {function: dict(_recorders.get(function, {}))}
+    return {
+        key: {version_id: recorder.read(key, version_id, reset) for version_id, recorder in versions.items()}
+        for key, versions in recorders.items()
+    }
@@ -0,0 +1,103 @@
+from types import MappingProxyType
+from typing import Mapping, Optional, Union
+
+from .context import use_versions
+from .core import VersionedFunction, _registry_lock, _versioned_functions_registry
+from .exceptions import ReleaseExistsError, ReleaseNotFoundError, VersionNotFoundError
+
+# Declared API releases in declaration order, each mapping every function key to the exact version it serves
+_release_table: dict[str, Mapping[str, str]] = {}
+
+
+def declare_release(
+    release_id: str, versions: Optional[Mapping[Union[str, VersionedFunction], str]] = None
+) -> Mapping[str, str]:
+    """
+    Declare a named API release, e.g. '2026-09-01', as a snapshot of every registered function.
+
+    Each function serves the version given in `versions`, or else the version it served in the previously
+    declared release, or else its latest version at the time of declaration. Versions and ranges are resolved to
+    exact versions once, here, so dispatching at a release is a constant-time lookup per function. Releases should
+    be declared oldest first, after all functions have been registered.
+
+    Args:
+        release_id (str): The name of the API release.
+        versions (Mapping[Union[str, VersionedFunction], str], optional): Versions or version ranges that change
+            in this release, keyed by function key or by the versioned function.
+
+    Returns:
+        Mapping[str, str]: The exact version of each function in the release, keyed by function key.
+
+    Raises:
+        ReleaseExistsError: If the release has already been declared.
+        VersionNotFoundError: If a function or version in `versions` does not exist.
+    """
+    with _registry_lock:
+        if release_id in _release_table:
+            raise ReleaseExistsError(f"API release '{release_id}' has already been declared.")
+
+        previous = next(reversed(_release_table.values()), {})
+        row: dict[str, str] = {}
+        for func_key, func in _versioned_functions_registry.items():
+            version_id = previous.get(func_key, func._snapshot.serving_version)
+            if version_id is not None:
+                row[func_key] = version_id
+
+        for func, version_spec in (versions or {}).items():
+            func_key = func if isinstance(func, str) else func.name
+            versioned_function = _versioned_functions_registry.get(func_key)
+            if versioned_function is None:
+                raise VersionNotFoundError(f"Function '{func_key}' is not registered.")
+            row[func_key] = versioned_function.resolve_version(version_spec)
+
+        table = _release_table[release_id] = MappingProxyType(row)
+    return table
+
+
+def use_release(release_id: str) -> use_versions:
+    """
+    Dispatch every versioned function at a declared API release within a ``with`` or ``async with`` block.
+
+    Example:
+        >>> with use_release(request.headers['Api-Version']):
+        ...     handle(request)
+
+    Args:
+        release_id (str): The name of the API release.
+
+    Returns:
+        use_versions: The scope pinning each function to its version in the release.
+
+    Raises:
+        ReleaseNotFoundError: If the release has not been declared.
+    """
+    return use_versions._from_resolved(get_release(release_id))
+
+
+def get_release(release_id: str) -> Mapping[str, str]:
+    """
+    Return the exact version of each function in a declared API release.
+
+    Args:
+        release_id (str): The name of the API release.
+
+    Returns:
+        Mapping[str, str]: The version of each function, keyed by function key.
+
+    Raises:
+        ReleaseNotFoundError: If the release has not been declared.
+    """
+    try:
+        return _release_table[release_id]
+    except KeyError:
+        raise ReleaseNotFoundError(f"API release '{release_id}' has not been declared.") from None
+
+
+def available_releases() -> list[str]:
+    """
+    Return the declared API releases, oldest first.
+
+    Returns:
+        list[str]: The release names in declaration order.
+    """
+    return list(_release_table)
@@ -0,0 +1,340 @@
+from bisect import bisect_right
+from itertools import accumulate
+from random import random
+from time import perf_counter_ns
+from typing import Any, Callable, Hashable, Iterable, Mapping, Optional
+from zlib import crc32
+
+# crc32() returns values in [0, 2**32)
+_HASH_RANGE = 2**32
+
+# The bucket of calls whose key arrives after an AdaptiveRouter already tracks `max_buckets` buckets
+_OVERFLOW = object()
+
+
+class Router:
+    """
+    Splits unpinned calls across versions by weight, e.g. 95% to '2.0.0' and 5% to '3.0.0'.
+
+    Each decision draws a point on the cumulative weights, either at random or, for sticky routing, from a stable
+    hash of a caller-provided key, and finds its version by binary search. Routers are immutable; changing the
+    weights publishes a new router, so the call path never locks.
+    """
+
+    __slots__ = ('name', 'weights', 'key')
+
+    def __init__(self, name: str, weights: Mapping[str, float], key: Optional[Callable[..., Hashable]] = None) -> None:
+        """
+        Initialize the Router.
+
+        Args:
+            name (str): The key of the versioned function, which also salts the sticky hash.
+            weights (Mapping[str, float]): The relative weight of each version.
+            key (Callable[..., Hashable], optional): Derives the sticky routing key from a call's arguments, so
+                calls with equal keys always reach the same version. Calls are routed at random if omitted.
+
+        Raises:
+            ValueError: If a weight is negative or all weights are zero.
+        """
+        if any(weight < 0 for weight in weights.values()):
+            raise ValueError(f"Routing weights for function '{name}' must not be negative.")
+        if not sum(weights.values()) > 0:
+            raise ValueError(f"Routing weights for function '{name}' must not all be zero.")
+        self.name: str = name
+        self.weights: dict[str, float] = dict(weights)
+        self.key = key
+
+    def compile(self, targets: Mapping[str, Callable]) -> Optional[Callable]:
+        """
+        Build the callable routing each call to one of the targets.
+
+        Versions without a target, e.g. because they have been removed, are left out and the remaining weights
+        are renormalized.
+
+        Args:
+            targets (Mapping[str, Callable]): The callable serving each available version.
+
+        Returns:
+            Optional[Callable]: The routing callable, or None if no weighted version is available.
+        """
+        weights = {version_id: w for version_id, w in self.weights.items() if version_id in targets and w > 0}
+        if not weights:
+            return None
+        funcs = tuple(targets[version_id] for version_id in weights)
+        cumulative = tuple(accumulate(weights.values()))
+        total = cumulative[-1]
+
+        if len(funcs) == 1:
+            return funcs[0]
+
+        key = self.key
+        if key is None:
+
+            def route(*args: Any, **kwargs: Any) -> Any:
+                return funcs[bisect_right(cumulative, random() * total)](*args, **kwargs)
+
+        else:
+            salt = crc32(self.name.encode())
+            scale = total / _HASH_RANGE
+
+            def route(*args: Any, **kwargs: Any) -> Any:
+                point = crc32(str(key(*args, **kwargs)).encode(), salt) * scale
+                return funcs[bisect_right(cumulative, point)](*args, **kwargs)
+
+        return route
+
+    def __repr__(self) -> str:
+        """
+        Return a string representation of the Router.
+        """
+        return f'<Router {self.name} weights: {self.weights}>'
+
+
+class _Arm:
+    """
+    The measured latency of one version within a bucket.
+    """
+
+    __slots__ = ('mean', 'samples')
+
+    def __init__(self) -> None:
+        """
+        Initialize the _Arm.
+        """
+        # Exponential moving average of the latency in nanoseconds
+        self.mean: float = 0.0
+        self.samples: int = 0
+
+
+class _Bucket:
+    """
+    The latency measurements of all versions for calls with the same bucket key.
+    """
+
+    __slots__ = ('arms', 'calls', 'best', 'turn')
+
+    def __init__(self) -> None:
+        """
+        Initialize the _Bucket.
+        """
+        self.arms: dict[str, _Arm] = {}
+        self.calls: int = 0
+        # The fastest version, or None until every version has been measured often enough
+        self.best: Optional[str] = None
+        # Rotates through the other versions when re-exploring
+        self.turn: int = 0
+
+
+class AdaptiveRouter(Router):
+    """
+    Routes unpinned calls to whichever of several equivalent versions is fastest, as measured on live calls.
+
+    This is a greedy bandit: each version is first called `min_samples` times, after which calls go to the version
+    with the lowest moving average latency, except that every `explore_every`-th call measures one of the other
+    versions in turn, so a version that became faster is noticed. Failed calls are not measured. If a `key` is given,
+    calls are grouped into buckets by its result, e.g. the order of magnitude of the input size, and the fastest
+    version is found for each bucket separately.
+
+    The measurements are plain attributes updated without locking, so the call path costs two clock reads and a few
+    attribute updates; concurrent calls may occasionally lose a measurement. They are kept when the router is
+    recompiled, e.g. after a version is added, and dropped when it is replaced.
+    """
+
+    __slots__ = ('window', 'min_samples', 'explore_every', 'max_buckets', 'asynchronous', '_buckets', '_available')
+
+    def __init__(
+        self,
+        name: str,
+        versions: Iterable[str],
+        key: Optional[Callable[..., Hashable]] = None,
+        window: int = 20,
+        min_samples: int = 5,
+        explore_every: int = 100,
+        max_buckets: int = 64,
+        asynchronous: bool = False,
+    ) -> None:
+        """
+        Initialize the AdaptiveRouter.
+
+        Args:
+            name (str): The key of the versioned function.
+            versions (Iterable[str]): The equivalent versions to choose from.
+            key (Callable[..., Hashable], optional): Derives the bucket from a call's arguments. All calls share one
+                bucket if omitted.
+            window (int): The number of recent calls latencies are averaged over.
+            min_samples (int): The number of calls measuring each version before the fastest one is picked.
+            explore_every (int): Every how many calls of a bucket one of the slower versions is measured again.
+            max_buckets (int): The maximum number of buckets; calls with further keys share one bucket.
+            asynchronous (bool): Whether the versions are coroutine functions.
+
+        Raises:
+            ValueError: If no version is given, explore_every is less than 2 or another setting is less than 1.
+        """
+        versions = dict.fromkeys(versions)
+        if not versions:
+            raise ValueError(f"Adaptive routing for function '{name}' needs at least one version.")
+        if min(window, min_samples, max_buckets) < 1:
+            raise ValueError('window, min_samples and max_buckets must be at least 1.')
+        if explore_every < 2:
+            # Exploring on every call would never serve the fastest version
+            raise ValueError(f'explore_every must be at least 2, got {explore_every}.')
+        super().__init__(name, dict.fromkeys(versions, 1.0), key)
+        self.window = window
+        self.min_samples = min_samples
+        self.explore_every = explore_every
+        self.max_buckets = max_buckets
+        self.asynchronous = asynchronous
+        self._buckets: dict[Hashable, _Bucket] = {}
+        # The versions available when last compiled; earlier ones win ties
+        self._available: tuple[str, ...] = ()
+
+    def compile(self, targets: Mapping[str, Callable]) -> Optional[Callable]:
+        """
+        Build the callable routing each call to the fastest available target, measuring its latency.
+
+        Args:
+            targets (Mapping[str, Callable]): The callable serving each available version.
+
+        Returns:
+            Optional[Callable]: The routing callable, or None if none of the versions is available.
+        """
+        funcs = {version_id: targets[version_id] for version_id in self.weights if version_id in targets}
+        if not funcs:
+            return None
+        if len(funcs) == 1:
+            return next(iter(funcs.values()))
+        available = tuple(funcs)
+        if available != self._available:
+            # The fastest version is picked again among the available ones; recompiling for other reasons, e.g.
+            # enabling metrics, keeps what has been learned
+            self._available = available
+            for bucket in list(self._buckets.values()):
+                bucket.best = None
+
+        key = self.key
+        buckets = self._buckets
+        new_bucket = self._bucket
+        explore = self._explore
+        record = self._record
+        explore_every = self.explore_every
+
+        if self.asynchronous:
+
+            async def route_async(*args: Any, **kwargs: Any) -> Any:
+                bucket_key = None if key is None else key(*args, **kwargs)
+                bucket = buckets.get(bucket_key) or new_bucket(bucket_key)
+                bucket.calls += 1
+                version_id = bucket.best
+                if version_id is None or not bucket.calls % explore_every:
+                    version_id = explore(bucket)
+                start = perf_counter_ns()
+                result = await funcs[version_id](*args, **kwargs)
+                record(bucket, version_id, perf_counter_ns() - start)
+                return result
+
+            return route_async
+
+        def route(*args: Any, **kwargs: Any) -> Any:
+            bucket_key = None if key is None else key(*args, **kwargs)
+            bucket = buckets.get(bucket_key) or new_bucket(bucket_key)
+            bucket.calls += 1
+            version_id = bucket.best
+            if version_id is None or not bucket.calls % explore_every:
+                version_id = explore(bucket)
+            start = perf_counter_ns()
+            result = funcs[version_id](*args, **kwargs)
+            record(bucket, version_id, perf_counter_ns() - start)
+            return result
+
+        return route
+
+    def fastest(self, bucket_key: Hashable = None) -> Optional[str]:
+        """
+        Return the version currently considered fastest for a bucket.
+
+        Args:
+            bucket_key (Hashable): The bucket, as returned by the key function; None without one.
+
+        Returns:
+            Optional[str]: The version, or None while the versions of the bucket are still being measured.
+        """
+        bucket = self._buckets.get(bucket_key)
+        return None if bucket is None else bucket.best
+
+    def latencies(self) -> dict[Hashable, dict[str, tuple[float, int]]]:
+        """
+        Return the measured latencies.
+
+        Returns:
+            dict[Hashable, dict[str, tuple[float, int]]]: The moving average latency in seconds and the number of
+            measured calls of each version, by bucket.
+        """
+        return {
+            bucket_key: {version_id: (arm.mean / 1e9, arm.samples) for version_id, arm in list(bucket.arms.items())}
+            for bucket_key, bucket in list(self._buckets.items())
+        }
+
+    def _bucket(self, bucket_key: Hashable) -> _Bucket:
+        """
+        Return the bucket of a key, creating it if needed.
+
+        Args:
+            bucket_key (Hashable): The bucket key.
+
+        Returns:
+            _Bucket: The bucket.
+        """
+        buckets = self._buckets
+        if len(buckets) >= self.max_buckets and bucket_key not in buckets:
+            bucket_key = _OVERFLOW
+        return buckets.setdefault(bucket_key, _Bucket())
+
+    def _explore(self, bucket: _Bucket) -> str:
+        """
+        Pick the version to measure: one with too few samples, or else the next of the slower versions.
+
+        Args:
+            bucket (_Bucket): The bucket of the call.
+
+        Returns:
+            str: The version.
+        """
+        arms = bucket.arms
+        available = self._available
+        for version_id in available:
+            if version_id not in arms:
+                arms[version_id] = _Arm()
+        coldest = min(available, key=lambda version_id: arms[version_id].samples)
+        if arms[coldest].samples < self.min_samples:
+            return coldest
+        best = bucket.best = min(available, key=lambda version_id: arms[version_id].mean)
+        others = [version_id for version_id in available if version_id != best]
+        bucket.turn += 1
+        return others[bucket.turn % len(others)]
+
+    def _record(self, bucket: _Bucket, version_id: str, elapsed: int) -> None:
+        """
+        Record the latency of a call, and make its version the fastest of its bucket if it overtook it.
+
+        Args:
+            bucket (_Bucket): The bucket of the call.
+            version_id (str): The version that served the call.
+            elapsed (int): The latency in nanoseconds.
+        """
+        arms = bucket.arms
+        arm = arms[version_id]
+        if arm.samples:
+            arm.mean += (elapsed - arm.mean) / min(arm.samples + 1, self.window)
+        else:
+            arm.mean = elapsed
+        arm.samples += 1
+        # A slower fastest version is noticed when the bucket explores next
+        best = bucket.best
+        if best is not None and best != version_id and arm.mean < arms[best].mean:
+            bucket.best = version_id
+
+    def __repr__(self) -> str:
+        """
+        Return a string representation of the AdaptiveRouter.
+        """
+        return f'<AdaptiveRouter {self.name} versions: {list(self.weights)} buckets: {len(self._buckets)}>'
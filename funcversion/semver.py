@@ -0,0 +1,292 @@
+import operator
+import re
+from functools import lru_cache
+from typing import Any, Callable, Optional, Sequence
+
+from .exceptions import InvalidVersionError
+
+# Comparison key of a parsed version: (epoch, release, (pre_rank, pre, post_rank, post, dev_rank, dev), local).
+# Keys order exactly like packaging.version.Version, so keys from the fast path and from packaging can be mixed.
+VersionKey = tuple[int, tuple[int, ...], tuple[int, int, int, int, int, int], tuple[tuple[int, str], ...]]
+
+# The common MAJOR[.MINOR[.PATCH]][-pre] shape, e.g. '1.0', '2.1.3' or '1.0.0-rc1'
+_FAST_PATTERN = re.compile(r'(\d+)(?:\.(\d+))?(?:\.(\d+))?(?:[-_.]?(a|b|rc|alpha|beta)[-_.]?(\d*))?')
+
+# Pre-release ranks; dev-only releases sort before alpha, final releases after rc
+_PRE_RANKS = {'a': 0, 'alpha': 0, 'b': 1, 'beta': 1, 'c': 2, 'rc': 2, 'pre': 2, 'preview': 2}
+_PRE_RANK_DEV_ONLY = -1
+_PRE_RANK_FINAL = 3
+_FINAL_SUFFIX = (_PRE_RANK_FINAL, 0, 0, 0, 1, 0)
+
+
+@lru_cache(maxsize=4096)
+def parse_version(version_id: str) -> VersionKey:
+    """
+    Parse a version identifier into a comparison key.
+
+    Identifiers of the common ``MAJOR.MINOR.PATCH[-pre]`` shape are parsed directly. Anything else is handed to
+    `packaging`, which is only imported the first time it is needed. Results are cached, so the many functions
+    sharing a version identifier parse it once.
+
+    Args:
+        version_id (str): The version identifier to parse.
+
+    Returns:
+        VersionKey: The comparison key.
+
+    Raises:
+        InvalidVersionError: If the version_id is not a valid PEP 440 version.
+    """
+    match = _FAST_PATTERN.fullmatch(version_id)
+    if match is None:
+        return _parse_with_packaging(version_id)
+
+    major, minor, patch, pre, pre_number = match.groups()
+    release = _trim_release((int(major), int(minor or 0), int(patch or 0)))
+    if pre is None:
+        return 0, release, _FINAL_SUFFIX, ()
+    return 0, release, (_PRE_RANKS[pre], int(pre_number or 0), 0, 0, 1, 0), ()
+
+
+def _parse_with_packaging(version_id: str) -> VersionKey:
+    """
+    Parse an arbitrary PEP 440 version identifier with `packaging`.
+
+    Args:
+        version_id (str): The version identifier to parse.
+
+    Returns:
+        VersionKey: The comparison key.
+
+    Raises:
+        InvalidVersionError: If the version_id is not a valid PEP 440 version.
+    """
+    from packaging.version import InvalidVersion, Version
+
+    try:
+        parsed = Version(version_id)
+    except InvalidVersion as e:
+        raise InvalidVersionError(f"Version '{version_id}' is not a valid semantic version.") from e
+
+    if parsed.pre is None and parsed.post is None and parsed.dev is not None:
+        pre_rank, pre_number = _PRE_RANK_DEV_ONLY, 0
+    elif parsed.pre is None:
+        pre_rank, pre_number = _PRE_RANK_FINAL, 0
+    else:
+        pre_rank, pre_number = _PRE_RANKS[parsed.pre[0]], parsed.pre[1]
+    suffix = (
+        pre_rank,
+        pre_number,
+        0 if parsed.post is None else 1,
+        parsed.post or 0,
+        1 if parsed.dev is None else 0,
+        parsed.dev or 0,
+    )
+
+    local: tuple[tuple[int, str], ...] = ()
+    if parsed.local is not None:
+        local = tuple((int(part), '') if part.isdigit() else (-1, part) for part in parsed.local.split('.'))
+    return parsed.epoch, _trim_release(parsed.release), suffix, local
+
+
+def _trim_release(release: tuple[int, ...]) -> tuple[int, ...]:
+    """
+    Strip trailing zeros from a release, so that '1.0.0' compares equal to '1'.
+
+    Args:
+        release (tuple[int, ...]): The release segment.
+
+    Returns:
+        tuple[int, ...]: The trimmed release segment.
+    """
+    end = len(release)
+    while end and release[end - 1] == 0:
+        end -= 1
+    return release[:end]
+
+
+# Smallest possible key of a release, below all of its pre- and dev-releases
+_FLOOR_SUFFIX = (_PRE_RANK_DEV_ONLY, 0, 0, 0, 0, 0)
+
+# Compiled by `re` when the first range is parsed, rather than on import
+_CLAUSE_PATTERN = r'(\^|~=|~|>=|<=|>|<|==|!=|=)?(.+)'
+_OPERAND_PATTERN = r'(\d+(?:\.\d+)*)((?:\.[xX*])*)(.*)'
+_WILDCARDS = ('*', 'x', 'X')
+
+
+class VersionRange:
+    """
+    A compiled version range such as '^1.2', '~2.0', '1.x' or '>=1.0,<2'.
+
+    Clauses separated by commas or whitespace must all match. Supported clauses are caret (`^`), tilde (`~`),
+    PEP 440 compatible release (`~=`), wildcards (`1.x`, `1.2.*`, `*`), comparisons (`>=`, `<=`, `>`, `<`,
+    `==`, `!=`) and bare versions, which must match exactly.
+    """
+
+    __slots__ = ('spec', '_constraints')
+
+    def __init__(self, spec: str, constraints: tuple[tuple[Callable[[Any, Any], bool], VersionKey], ...]) -> None:
+        """
+        Initialize the VersionRange.
+
+        Args:
+            spec (str): The range specification.
+            constraints (tuple): The (comparison, bound) pairs a version key must satisfy.
+        """
+        self.spec: str = spec
+        self._constraints = constraints
+
+    def __contains__(self, key: VersionKey) -> bool:
+        """
+        Check whether a version key lies within the range.
+        """
+        return all(compare(key, bound) for compare, bound in self._constraints)
+
+    def best_match(self, version_ids: Sequence[str], keys: Sequence[VersionKey]) -> Optional[str]:
+        """
+        Return the highest matching version, preferring final releases over pre-releases.
+
+        Args:
+            version_ids (Sequence[str]): Version identifiers in ascending order.
+            keys (Sequence[VersionKey]): The matching comparison keys.
+
+        Returns:
+            Optional[str]: The highest matching version identifier, or None if nothing matches.
+        """
+        prerelease = None
+        for pos in range(len(keys) - 1, -1, -1):
+            key = keys[pos]
+            if key in self:
+                if not _is_prerelease(key):
+                    return version_ids[pos]
+                if prerelease is None:
+                    prerelease = version_ids[pos]
+        return prerelease
+
+    def __repr__(self) -> str:
+        """
+        Return a string representation of the VersionRange.
+        """
+        return f'<VersionRange {self.spec!r}>'
+
+
+@lru_cache(maxsize=1024)
+def parse_range(spec: str) -> VersionRange:
+    """
+    Compile a version range specification. Results are cached.
+
+    Args:
+        spec (str): The range specification, e.g. '^1.2' or '>=1.0,<2'.
+
+    Returns:
+        VersionRange: The compiled range.
+
+    Raises:
+        InvalidVersionError: If the specification is not a valid range.
+    """
+    clauses = [clause for clause in re.split(r'[,\s]+', spec) if clause]
+    if not clauses:
+        raise InvalidVersionError(f"Version range '{spec}' is empty.")
+
+    constraints: list[tuple[Callable[[Any, Any], bool], VersionKey]] = []
+    for clause in clauses:
+        constraints.extend(_parse_clause(clause, spec))
+    return VersionRange(spec, tuple(constraints))
+
+
+def _parse_clause(clause: str, spec: str) -> list[tuple[Callable[[Any, Any], bool], VersionKey]]:
+    """
+    Compile a single clause of a version range into constraints.
+
+    Args:
+        clause (str): The clause, e.g. '^1.2'.
+        spec (str): The complete range specification, for error messages.
+
+    Returns:
+        list[tuple[Callable, VersionKey]]: The (comparison, bound) pairs.
+
+    Raises:
+        InvalidVersionError: If the clause is not valid.
+    """
+    op, operand = re.fullmatch(_CLAUSE_PATTERN, clause).groups()
+    if operand in _WILDCARDS and op in (None, '=', '=='):
+        return []
+
+    match = re.fullmatch(_OPERAND_PATTERN, operand)
+    if match is None:
+        raise InvalidVersionError(f"Version range '{spec}' is not valid.")
+    numbers = tuple(int(part) for part in match.group(1).split('.'))
+    wildcard, rest = match.group(2), match.group(3)
+
+    if wildcard:
+        if rest or op not in (None, '=', '=='):
+            raise InvalidVersionError(f"Version range '{spec}' is not valid.")
+        return [(operator.ge, _floor(numbers)), (operator.lt, _floor(_bump(numbers, len(numbers) - 1)))]
+
+    key = parse_version(operand)
+    if op == '^':
+        nonzero = [pos for pos, number in enumerate(numbers) if number]
+        return [(operator.ge, key), (operator.lt, _floor(_bump(numbers, nonzero[0] if nonzero else len(numbers) - 1)))]
+    if op == '~':
+        return [(operator.ge, key), (operator.lt, _floor(_bump(numbers, min(1, len(numbers) - 1))))]
+    if op == '~=':
+        if len(numbers) < 2:
+            raise InvalidVersionError(f"Version range '{spec}' is not valid.")
+        return [(operator.ge, key), (operator.lt, _floor(_bump(numbers, len(numbers) - 2)))]
+    if op == '<' and not _is_prerelease(key):
+        # '<2.0' excludes the pre-releases of 2.0
+        return [(operator.lt, (key[0], key[1], _FLOOR_SUFFIX, ()))]
+    return [(_OPERATORS[op], key)]
+
+
+_OPERATORS: dict[Optional[str], Callable[[Any, Any], bool]] = {
+    None: operator.eq,
+    '=': operator.eq,
+    '==': operator.eq,
+    '!=': operator.ne,
+    '>=': operator.ge,
+    '<=': operator.le,
+    '>': operator.gt,
+    '<': operator.lt,
+}
+
+
+def _bump(numbers: tuple[int, ...], pos: int) -> tuple[int, ...]:
+    """
+    Increment a release component and drop the components after it, e.g. (1, 2, 3) at 1 becomes (1, 3).
+
+    Args:
+        numbers (tuple[int, ...]): The release components.
+        pos (int): The position of the component to increment.
+
+    Returns:
+        tuple[int, ...]: The bumped release.
+    """
+    return numbers[:pos] + (numbers[pos] + 1,)
+
+
+def _floor(numbers: tuple[int, ...]) -> VersionKey:
+    """
+    Return the smallest key of a release, below all of its pre- and dev-releases.
+
+    Args:
+        numbers (tuple[int, ...]): The release components.
+
+    Returns:
+        VersionKey: The comparison key.
+    """
+    return 0, _trim_release(numbers), _FLOOR_SUFFIX, ()
+
+
+def _is_prerelease(key: VersionKey) -> bool:
+    """
+    Check whether a version key belongs to a pre- or dev-release.
+
+    Args:
+        key (VersionKey): The comparison key.
+
+    Returns:
+        bool: True if it is a pre- or dev-release, False otherwise.
+    """
+    suffix = key[2]
+    return suffix[0] != _PRE_RANK_FINAL or suffix[4] == 0
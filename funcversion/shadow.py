@@ -0,0 +1,270 @@
+import asyncio
+import threading
+import time
+from collections import deque
+from random import random
+from typing import TYPE_CHECKING, Any, Callable, Optional
+
+if TYPE_CHECKING:
+    from concurrent.futures import ThreadPoolExecutor
+
+
+class ShadowMismatch:
+    """
+    A sampled call where the candidate version disagreed with the serving version.
+    """
+
+    __slots__ = ('args', 'kwargs', 'expected', 'actual')
+
+    def __init__(self, args: tuple[Any, ...], kwargs: dict[str, Any], expected: Any, actual: Any) -> None:
+        """
+        Initialize the ShadowMismatch.
+
+        Args:
+            args (tuple): The positional arguments of the call.
+            kwargs (dict): The keyword arguments of the call.
+            expected (Any): The serving version's result.
+            actual (Any): The candidate's result, or the exception it raised.
+        """
+        self.args = args
+        self.kwargs = kwargs
+        self.expected = expected
+        self.actual = actual
+
+    def __repr__(self) -> str:
+        """
+        Return a string representation of the ShadowMismatch.
+        """
+        return f'<ShadowMismatch expected: {self.expected!r} actual: {self.actual!r}>'
+
+
+class Shadow:
+    """
+    Runs a candidate version alongside the serving version on a sampled fraction of unpinned calls.
+
+    The serving call returns as soon as the serving version does. The candidate runs afterwards in a bounded
+    background thread pool, or as a background task for async functions, and its result is compared with the
+    serving result. When `max_pending` shadow runs are already queued, further samples are dropped and counted.
+    Statistics are updated from the background threads and may be read at any time.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        version_id: str,
+        sample_rate: float,
+        compare: Callable[[Any, Any], bool],
+        max_workers: int,
+        max_pending: int,
+        asynchronous: bool,
+    ) -> None:
+        """
+        Initialize the Shadow.
+
+        Args:
+            name (str): The key of the versioned function.
+            version_id (str): The candidate version.
+            sample_rate (float): The fraction of calls to shadow, between 0 and 1.
+            compare (Callable[[Any, Any], bool]): Returns whether the serving and candidate results match.
+            max_workers (int): The number of background threads.
+            max_pending (int): The maximum number of queued or running shadow runs.
+            asynchronous (bool): Whether the versions are coroutine functions.
+        """
+        if not 0 <= sample_rate <= 1:
+            raise ValueError(f'sample_rate must be between 0 and 1, got {sample_rate}.')
+        self.name: str = name
+        self.version: str = version_id
+        self.sample_rate: float = sample_rate
+        self.compare = compare
+        self.sampled: int = 0
+        self.matches: int = 0
+        self.mismatches: int = 0
+        self.errors: int = 0
+        self.dropped: int = 0
+        # Sum of candidate minus serving latency in seconds, over all completed shadow runs
+        self.latency_delta: float = 0.0
+        # The most recent mismatches, for inspection
+        self.recent_mismatches: deque[ShadowMismatch] = deque(maxlen=100)
+        self._max_workers = max_workers
+        self._asynchronous = asynchronous
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._lock = threading.Lock()
+        self._executor: Optional['ThreadPoolExecutor'] = None
+        self._tasks: set['asyncio.Task'] = set()
+
+    @property
+    def completed(self) -> int:
+        """
+        Return the number of shadow runs that have finished.
+
+        Returns:
+            int: Matches, mismatches and errors combined.
+        """
+        return self.matches + self.mismatches + self.errors
+
+    @property
+    def mean_latency_delta(self) -> float:
+        """
+        Return how much slower the candidate was than the serving version on average, in seconds.
+
+        Returns:
+            float: The mean latency delta; negative if the candidate is faster.
+        """
+        completed = self.completed
+        return self.latency_delta / completed if completed else 0.0
+
+    def wrap(self, serving: Callable, candidate: Callable) -> Callable:
+        """
+        Return a callable serving unpinned calls that shadows a sample of them.
+
+        Args:
+            serving (Callable): The serving callable.
+            candidate (Callable): The candidate version's implementation.
+
+        Returns:
+            Callable: The shadowing callable.
+        """
+        sample_rate = self.sample_rate
+
+        if self._asynchronous:
+
+            def call(*args: Any, **kwargs: Any) -> Any:
+                if random() >= sample_rate:
+                    return serving(*args, **kwargs)
+                return self._serve_async(serving, candidate, args, kwargs)
+
+        else:
+
+            def call(*args: Any, **kwargs: Any) -> Any:
+                if random() >= sample_rate:
+                    return serving(*args, **kwargs)
+                start = time.perf_counter()
+                result = serving(*args, **kwargs)
+                elapsed = time.perf_counter() - start
+                self._submit(candidate, args, kwargs, result, elapsed)
+                return result
+
+        return call
+
+    def stop(self) -> None:
+        """
+        Shut down the background threads, without waiting for queued shadow runs.
+        """
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _submit(self, candidate: Callable, args: tuple, kwargs: dict, expected: Any, elapsed: float) -> None:
+        """
+        Queue a shadow run on the background thread pool, or drop it if too many are pending.
+        """
+        if not self._reserve():
+            return
+        executor = self._executor
+        if executor is None:
+            # Only shadows of sync functions need a thread pool
+            from concurrent.futures import ThreadPoolExecutor
+
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(self._max_workers, thread_name_prefix=f'shadow-{self.name}')
+                executor = self._executor
+        try:
+            executor.submit(self._run, candidate, args, kwargs, expected, elapsed)
+        except RuntimeError:
+            # The shadow was stopped concurrently
+            self._slots.release()
+
+    def _run(self, candidate: Callable, args: tuple, kwargs: dict, expected: Any, elapsed: float) -> None:
+        """
+        Run the candidate on a background thread and record the outcome.
+        """
+        try:
+            start = time.perf_counter()
+            try:
+                actual = candidate(*args, **kwargs)
+            except Exception as e:
+                self._record(args, kwargs, expected, e, None)
+            else:
+                self._record(args, kwargs, expected, actual, time.perf_counter() - start - elapsed)
+        finally:
+            self._slots.release()
+
+    async def _serve_async(self, serving: Callable, candidate: Callable, args: tuple, kwargs: dict) -> Any:
+        """
+        Await the serving coroutine, then start the candidate as a background task.
+        """
+        start = time.perf_counter()
+        result = await serving(*args, **kwargs)
+        elapsed = time.perf_counter() - start
+        if self._reserve():
+            task = asyncio.get_running_loop().create_task(self._run_async(candidate, args, kwargs, result, elapsed))
+            # Keep a reference until the task is done, as the event loop only keeps weak ones
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+        return result
+
+    async def _run_async(self, candidate: Callable, args: tuple, kwargs: dict, expected: Any, elapsed: float) -> None:
+        """
+        Await the candidate in a background task and record the outcome.
+        """
+        try:
+            start = time.perf_counter()
+            try:
+                actual = await candidate(*args, **kwargs)
+            except Exception as e:
+                self._record(args, kwargs, expected, e, None)
+            else:
+                self._record(args, kwargs, expected, actual, time.perf_counter() - start - elapsed)
+        finally:
+            self._slots.release()
+
+    def _reserve(self) -> bool:
+        """
+        Reserve a slot for a shadow run, counting it as sampled or dropped.
+
+        Returns:
+            bool: True if the run may proceed, False if it was dropped.
+        """
+        reserved = self._slots.acquire(blocking=False)
+        with self._lock:
+            if reserved:
+                self.sampled += 1
+            else:
+                self.dropped += 1
+        return reserved
+
+    def _record(self, args: tuple, kwargs: dict, expected: Any, actual: Any, latency_delta: Optional[float]) -> None:
+        """
+        Record the outcome of a shadow run.
+
+        Args:
+            args (tuple): The positional arguments of the call.
+            kwargs (dict): The keyword arguments of the call.
+            expected (Any): The serving version's result.
+            actual (Any): The candidate's result, or the exception it raised.
+            latency_delta (float, optional): Candidate minus serving latency, or None if the candidate raised.
+        """
+        try:
+            match = latency_delta is not None and bool(self.compare(expected, actual))
+        except Exception:
+            match = False
+        with self._lock:
+            if latency_delta is None:
+                self.errors += 1
+            else:
+                self.latency_delta += latency_delta
+                if match:
+                    self.matches += 1
+                else:
+                    self.mismatches += 1
+            if not match:
+                self.recent_mismatches.append(ShadowMismatch(args, kwargs, expected, actual))
+
+    def __repr__(self) -> str:
+        """
+        Return a string representation of the Shadow.
+        """
+        return (
+            f'<Shadow {self.name} version: {self.version} sampled: {self.sampled} matches: {self.matches} '
+            f'mismatches: {self.mismatches} errors: {self.errors} dropped: {self.dropped}>'
+        )
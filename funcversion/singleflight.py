@@ -0,0 +1,129 @@
+from asyncio import get_running_loop, shield
+from functools import partial
+from time import monotonic
+from typing import TYPE_CHECKING, Any, Callable, Hashable, Optional
+
+if TYPE_CHECKING:
+    import asyncio
+
+# CO_ASYNC_GENERATOR, whose results can't be shared
+_ASYNC_GENERATOR_CODE_FLAG = 0x200
+
+# Separates positional from keyword arguments in call keys
+_KWARGS_MARK = object()
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent identical calls of one async version into a single execution.
+
+    The first call with some arguments starts the implementation as a task and every identical call arriving
+    while it runs awaits the same task. Callers are shielded from each other: cancelling one caller doesn't cancel
+    the shared task. With a `ttl`, successful results are also kept briefly, so a burst of identical calls right
+    after completion doesn't run it again, and when a result expires only one call recomputes it while the others
+    wait, which protects downstream services from cache stampedes. Exceptions are shared by the waiting callers but
+    never kept.
+    """
+
+    def __init__(self, name: str, version_id: str, func: Callable, ttl: Optional[float], maxsize: int) -> None:
+        """
+        Initialize the SingleFlight.
+
+        Args:
+            name (str): The key of the versioned function.
+            version_id (str): The version identifier.
+            func (Callable): The implementation whose calls are coalesced.
+            ttl (float, optional): The seconds successful results are kept, or None to only share in-flight calls.
+            maxsize (int): The maximum number of kept results.
+        """
+        self.name: str = name
+        self.version: str = version_id
+        self.func = func
+        self.ttl = ttl
+        self.maxsize = maxsize
+        # Calls that ran the implementation, joined a running call, or were served a kept result
+        self.executions: int = 0
+        self.coalesced: int = 0
+        self.reused: int = 0
+        # Running tasks by event loop and call key, as tasks belong to one loop
+        self._inflight: dict[tuple['asyncio.AbstractEventLoop', Hashable], 'asyncio.Task'] = {}
+        # Kept results by call key, oldest first, with the monotonic time they expire at
+        self._results: dict[Hashable, tuple[float, Any]] = {}
+
+    def wrap(self, target: Callable) -> Callable:
+        """
+        Return a coroutine function coalescing calls of the implementation.
+
+        Async generator functions are not coalesced, and calls with unhashable arguments run on their own.
+
+        Args:
+            target (Callable): The callable invoking the implementation.
+
+        Returns:
+            Callable: The coalescing coroutine function, or `target` itself if the implementation can't be shared.
+        """
+        if getattr(getattr(self.func, '__code__', None), 'co_flags', 0) & _ASYNC_GENERATOR_CODE_FLAG:
+            return target
+        inflight = self._inflight
+        results = self._results
+        ttl = self.ttl
+
+        async def call(*args: Any, **kwargs: Any) -> Any:
+            key = (*args, _KWARGS_MARK, *kwargs.items()) if kwargs else args
+            try:
+                hash(key)
+            except TypeError:
+                # Unhashable arguments
+                return await target(*args, **kwargs)
+            if ttl is not None:
+                kept = results.get(key)
+                if kept is not None and kept[0] > monotonic():
+                    self.reused += 1
+                    return kept[1]
+
+            loop = get_running_loop()
+            flight_key = (loop, key)
+            task = inflight.get(flight_key)
+            if task is None:
+                task = loop.create_task(target(*args, **kwargs))
+                inflight[flight_key] = task
+                task.add_done_callback(partial(self._land, flight_key))
+                self.executions += 1
+            else:
+                self.coalesced += 1
+            return await shield(task)
+
+        return call
+
+    def _land(self, flight_key: tuple['asyncio.AbstractEventLoop', Hashable], task: 'asyncio.Task') -> None:
+        """
+        Forget a finished task and keep its result, if successful and a ttl is set.
+
+        Args:
+            flight_key (tuple): The event loop and the call key.
+            task (asyncio.Task): The finished task.
+        """
+        if self._inflight.get(flight_key) is task:
+            del self._inflight[flight_key]
+        # Retrieve the exception even if every caller was cancelled, so it isn't reported as unhandled
+        if task.cancelled() or task.exception() is not None or self.ttl is None:
+            return
+        key = flight_key[1]
+        results = self._results
+        results.pop(key, None)
+        if len(results) >= self.maxsize:
+            now = monotonic()
+            for expired in [k for k, (expires, _) in results.items() if expires <= now]:
+                del results[expired]
+            if len(results) >= self.maxsize:
+                del results[next(iter(results))]
+        results[key] = (monotonic() + self.ttl, task.result())
+
+    def __repr__(self) -> str:
+        """
+        Return a string representation of the SingleFlight.
+        """
+        return (
+            f'<SingleFlight {self.name} version: {self.version} executions: {self.executions} '
+            f'coalesced: {self.coalesced} reused: {self.reused}>'
+        )
@@ -1,19 +1,29 @@
-from typing import Callable
-
-from packaging.version import InvalidVersion
-from packaging.version import Version as PkgVersion
+from typing import TYPE_CHECKING, Callable, Union
 
 from funcversion import VersionedFunction
-from funcversion.core import _version_registry, _versioned_functions_registry
-from funcversion.exceptions import InvalidVersionError, VersionExistsError
-
-
-def version(version_id: str) -> Callable[[Callable], VersionedFunction]:
+from funcversion.core import (
+    AsyncVersionedFunction,
+    _registry_lock,
+    _version_registry,
+    _versioned_functions_registry,
+    is_async_function,
+    is_frozen,
+)
+from funcversion.exceptions import InvalidVersionError, RegistryFrozenError, VersionExistsError
+from funcversion.semver import parse_version
+
+if TYPE_CHECKING:
+    from funcversion.cache import CachePolicy
+
+
+def version(version_id: str, cache: Union[bool, 'CachePolicy'] = False) -> Callable[[Callable], VersionedFunction]:
     """
     Decorator to register a function version.
 
     Args:
         version_id (str): The version identifier (e.g., "1.0.0").
+        cache (Union[bool, CachePolicy]): Memoize the version's results by the call arguments, with the default
+            CachePolicy if True. Only suitable for pure functions.
 
     Returns:
         Callable[[Callable], Callable]: The decorator function.
@@ -26,9 +36,14 @@ def version(version_id: str) -> Callable[[Callable], VersionedFunction]:
 
         _validate_version_id(version_id)
 
-        _register_version(func_key, version_id, original_func)
+        with _registry_lock:
+            _register_version(func_key, version_id, original_func)
+            wrapper = _get_or_create_wrapper(func_key, original_func)
+            wrapper._classmethod = is_classmethod
+            if cache:
+                from funcversion.cache import CachePolicy
 
-        wrapper = _get_or_create_wrapper(func_key)
+                wrapper._set_cache_policy(version_id, CachePolicy() if cache is True else cache)
 
         return _reapply_method_type(wrapper, func, is_classmethod, is_staticmethod)
 
@@ -85,15 +100,12 @@ def _validate_version_id(version_id: str) -> None:
     if not isinstance(version_id, str):
         raise InvalidVersionError(f'Version identifier must be a string, got {type(version_id).__name__}.')
 
-    try:
-        PkgVersion(version_id)
-    except (InvalidVersion, TypeError) as e:
-        raise InvalidVersionError(f"Version '{version_id}' is not a valid semantic version.") from e
+    parse_version(version_id)
 
 
 def _register_version(func_key: str, version_id: str, func: Callable) -> None:
     """
-    Register a new version for the function.
+    Register a new version for the function. Must be called with the registry lock held.
 
     Args:
         func_key (str): The unique function key.
@@ -102,24 +114,38 @@ def _register_version(func_key: str, version_id: str, func: Callable) -> None:
 
     Raises:
         ValueError: If the version is already registered.
+        RegistryFrozenError: If the registry has been frozen.
     """
-    if version_id in _version_registry[func_key]:
+    if is_frozen():
+        raise RegistryFrozenError(f"Cannot register function '{func_key}': the version registry is frozen.")
+    versions = _version_registry.get(func_key, {})
+    if version_id in versions:
         raise VersionExistsError(f"Version '{version_id}' is already registered for function '{func_key}'.")
-    _version_registry[func_key][version_id] = func
+
+    wrapper = _versioned_functions_registry.get(func_key)
+    if wrapper is not None:
+        # Publishes the new versions to both the wrapper and the registry
+        wrapper.add_version(version_id, func)
+    else:
+        _version_registry[func_key] = {**versions, version_id: func}
 
 
-def _get_or_create_wrapper(func_key: str) -> VersionedFunction:
+def _get_or_create_wrapper(func_key: str, func: Callable) -> VersionedFunction:
     """
-    Retrieve an existing VersionedFunction wrapper or create a new one.
+    Retrieve an existing VersionedFunction wrapper or create a new one. Must be called with the registry lock held.
+
+    The wrapper is an AsyncVersionedFunction if the first registered version is a coroutine function or an async
+    generator function.
 
     Args:
         func_key (str): The unique function key.
+        func (Callable): The function implementation being registered.
 
     Returns:
         VersionedFunction: The wrapper instance.
     """
     if func_key not in _versioned_functions_registry:
-        wrapper = VersionedFunction(func_key)
+        wrapper = AsyncVersionedFunction(func_key) if is_async_function(func) else VersionedFunction(func_key)
         _versioned_functions_registry[func_key] = wrapper
     else:
         wrapper = _versioned_functions_registry[func_key]
@@ -145,7 +171,8 @@ def _reapply_method_type(
         Callable: The appropriately wrapped function.
     """
     if is_classmethod:
-        return classmethod(wrapper)
+        # The wrapper binds itself to the owner class, see VersionedFunction.__get__()
+        return wrapper
     elif is_staticmethod:
         return staticmethod(wrapper)
     else:
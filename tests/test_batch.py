@@ -0,0 +1,87 @@
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from funcversion import use_versions, version
+from funcversion.exceptions import VersionNotFoundError
+
+
+@version('1.0.0')
+def transform(record):
+    return record + 1
+
+
+@version('2.0.0')
+def transform(record):
+    return record * 2
+
+
+@pytest.mark.parametrize('executor', ['serial', 'thread', 'process'])
+def test_map_in_order(executor):
+    records = range(100)
+    assert list(transform.map(records, executor=executor, chunksize=7)) == [r * 2 for r in records]
+    assert list(transform.map(records, _version='1.0.0', executor=executor)) == [r + 1 for r in records]
+
+
+@pytest.mark.parametrize('executor', ['thread', 'process'])
+def test_map_unordered(executor):
+    results = transform.map(range(100), executor=executor, chunksize=3, ordered=False, max_workers=4)
+    assert sorted(results) == [r * 2 for r in range(100)]
+
+
+def test_map_streams_lazily():
+    consumed = []
+
+    def records():
+        for r in range(1_000_000):
+            consumed.append(r)
+            yield r
+
+    results = transform.map(records(), executor='thread', chunksize=10, max_workers=2)
+    assert next(results) == 0
+    results.close()
+    # Only a bounded number of chunks is read ahead
+    assert len(consumed) <= 50
+
+
+def test_map_with_executor_and_scope():
+    with ThreadPoolExecutor(2) as pool:
+        with use_versions({transform: '^1.0'}):
+            assert list(transform.map([1, 2], executor=pool)) == [2, 3]
+        assert list(transform.map([1, 2], executor=pool)) == [2, 4]
+
+
+def test_map_deprecated_version():
+    @version('1.0.0')
+    def func(x):
+        return x
+
+    @version('2.0.0')
+    def func(x):
+        return -x
+
+    func.deprecate_version('1.0.0')
+    with warnings.catch_warnings(record=True) as w:
+        warnings.simplefilter('always')
+        assert list(func.map([1, 2, 3], _version='1.0.0')) == [1, 2, 3]
+    assert issubclass(w[0].category, DeprecationWarning)
+    assert func.version_info('1.0.0').deprecated_calls == 3
+
+
+def test_map_errors():
+    with pytest.raises(VersionNotFoundError):
+        transform.map([1], _version='3.0.0')
+    with pytest.raises(ValueError):
+        transform.map([1], executor='gpu')
+    with pytest.raises(ValueError):
+        transform.map([1], chunksize=0)
+
+
+def test_map_propagates_exceptions():
+    @version('1.0.0')
+    def invert(x):
+        return 1 / x
+
+    with pytest.raises(ZeroDivisionError):
+        list(invert.map([1, 0], executor='thread'))
@@ -0,0 +1,150 @@
+import asyncio
+import time
+
+import pytest
+
+from funcversion import cache, metrics, version
+from funcversion.cache import CachePolicy
+
+
+def test_version_cache_memoizes_one_version():
+    calls = []
+
+    @version('1.0.0', cache=True)
+    def price(item, quantity=1):
+        calls.append((item, quantity))
+        return len(item) * quantity
+
+    @version('2.0.0')
+    def price(item, quantity=1):
+        calls.append((item, quantity))
+        return len(item) * quantity * 2
+
+    assert [price('abc', _version='1.0.0') for _ in range(3)] == [3, 3, 3]
+    assert price('abc', quantity=2, _version='1.0.0') == 6
+    assert price('abc', 2, _version='1.0.0') == 6
+    assert [price('abc') for _ in range(2)] == [6, 6]
+    assert calls == [('abc', 1), ('abc', 2), ('abc', 2), ('abc', 1), ('abc', 1)]
+
+    info = price.cache_info('1.0.0')
+    assert (info.hits, info.misses, len(info)) == (2, 3, 3)
+    assert price.cache_info('2.0.0') is None
+
+    # Unhashable arguments bypass the cache
+    assert price(['a'], _version='1.0.0') == 1
+    assert len(info) == 3
+
+
+def test_enable_cache_invalidates_per_version():
+    calls = []
+
+    @version('1.0.0')
+    def rate(x):
+        calls.append(1)
+        return x
+
+    @version('2.0.0')
+    def rate(x):
+        calls.append(2)
+        return x * 2
+
+    rate.enable_cache()
+    rate.compile()
+    for _ in range(2):
+        assert (rate(1, _version='1.0.0'), rate(1)) == (1, 2)
+    assert calls == [1, 2]
+    cached = rate.cache_info('1.0.0')
+
+    rate.remove_version('2.0.0')
+    assert rate.cache_info('1.0.0') is cached and len(cached) == 1
+
+    rate.add_version('2.0.0', lambda x: x * 3)
+    assert rate(1) == 3
+    assert rate(1, _version='1.0.0') == 1
+    assert calls == [1, 2]
+
+    rate.disable_cache()
+    assert len(cached) == 0
+    rate(1, _version='1.0.0')
+    assert calls == [1, 2, 1]
+
+
+def test_cache_maxsize_and_ttl():
+    @version('1.0.0', cache=CachePolicy(maxsize=2, ttl=0.05))
+    def square(x):
+        return x * x
+
+    for x in (1, 2, 1, 3):
+        square(x)
+    info = square.cache_info('1.0.0')
+    # 2 was the least recently used
+    assert sorted(entry.key for entry in info._data.values()) == [(1,), (3,)]
+    time.sleep(0.06)
+    square(1)
+    assert info.hits == 1 and info.misses == 4
+
+    with pytest.raises(ValueError):
+        CachePolicy(maxsize=0)
+
+
+def test_memory_budget_is_shared():
+    @version('1.0.0', cache=CachePolicy(maxsize=None))
+    def first(x):
+        return 'x' * 1000
+
+    @version('1.0.0', cache=CachePolicy(maxsize=None))
+    def second(x):
+        return 'y' * 1000
+
+    usage, budget = cache.memory_usage()
+    try:
+        cache.set_memory_budget(usage + 5000)
+        for x in range(4):
+            first(x)
+        for x in range(4):
+            second(x)
+        assert cache.memory_usage()[0] <= usage + 5000
+        # The oldest entries of the other function were evicted first
+        assert len(first.cache_info('1.0.0')) < 4
+        assert len(second.cache_info('1.0.0')) == 4
+    finally:
+        cache.set_memory_budget(budget)
+
+
+def test_async_cache_and_metrics():
+    calls = []
+
+    @version('1.0.0', cache=True)
+    async def lookup(key):
+        calls.append(key)
+        await asyncio.sleep(0)
+        return key.upper()
+
+    lookup.enable_metrics()
+
+    async def main():
+        return [await lookup('a'), await lookup('a')]
+
+    assert asyncio.run(main()) == ['A', 'A']
+    assert calls == ['a']
+    assert metrics.snapshot(function=lookup.name)[lookup.name]['1.0.0'].calls == 2
+
+
+class Quote:
+    @version('1.0.0', cache=True)
+    def total(self, amount):
+        return amount
+
+
+class DiscountQuote(Quote):
+    @version('2.0.0')
+    def total(self, amount):
+        return amount / 2
+
+
+def test_cache_through_inherited_versions():
+    quote = DiscountQuote()
+    assert quote.total(10, _version='1.0.0') == 10
+    assert quote.total(10, _version='1.0.0') == 10
+    assert DiscountQuote.total.cache_info('1.0.0') is Quote.total.cache_info('1.0.0')
+    assert Quote.total.cache_info('1.0.0').hits == 1
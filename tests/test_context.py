@@ -0,0 +1,124 @@
+import asyncio
+import threading
+
+import pytest
+
+from funcversion import use_versions, version
+from funcversion.context import active_versions
+from funcversion.exceptions import InvalidVersionError
+
+
+@version('1.0.0')
+def render():
+    return 'Version 1.0.0'
+
+
+@version('1.1.0')
+def render():
+    return 'Version 1.1.0'
+
+
+@version('2.0.0')
+def render():
+    return 'Version 2.0.0'
+
+
+def test_scope_pins_version():
+    with use_versions({render.name: '1.x'}):
+        assert render() == 'Version 1.1.0'
+        # An explicit version still wins
+        assert render(_version='2.0.0') == 'Version 2.0.0'
+    assert render() == 'Version 2.0.0'
+
+    with use_versions({render: '1.0.0'}):
+        assert render() == 'Version 1.0.0'
+
+
+def test_nested_scopes():
+    @version('1.0.0')
+    def other():
+        return 'Other 1.0.0'
+
+    @version('2.0.0')
+    def other():
+        return 'Other 2.0.0'
+
+    with use_versions({render: '1.x'}):
+        with use_versions({other: '1.0.0'}):
+            assert render() == 'Version 1.1.0'
+            assert other() == 'Other 1.0.0'
+            with use_versions({render: '2.0.0'}):
+                assert render() == 'Version 2.0.0'
+            assert render() == 'Version 1.1.0'
+        assert other() == 'Other 2.0.0'
+        assert dict(active_versions()) == {render.name: '1.x'}
+    assert active_versions() == {}
+
+
+def test_scope_compiled():
+    @version('1.0.0')
+    def func(x):
+        return f'Version 1.0.0: {x}'
+
+    @version('2.0.0')
+    def func(x):
+        return f'Version 2.0.0: {x}'
+
+    func.compile()
+    with use_versions({func: '^1.0'}):
+        assert func(1) == 'Version 1.0.0: 1'
+    assert func(2) == 'Version 2.0.0: 2'
+
+
+def test_scope_is_task_local():
+    async def handle(spec):
+        async with use_versions({render: spec}):
+            await asyncio.sleep(0.01)
+            return render()
+
+    async def main():
+        return await asyncio.gather(handle('1.0.0'), handle('1.x'), handle('2.0.0'))
+
+    assert asyncio.run(main()) == ['Version 1.0.0', 'Version 1.1.0', 'Version 2.0.0']
+
+
+def test_scope_shared_by_overlapping_tasks():
+    scope = use_versions({render: '1.0.0'})
+    entered = asyncio.Event()
+    exited = asyncio.Event()
+
+    async def first():
+        async with scope:
+            entered.set()
+            await asyncio.sleep(0)
+            result = render()
+        # Exits while the other task is still inside the scope
+        exited.set()
+        return result, render()
+
+    async def second():
+        await entered.wait()
+        async with scope:
+            await exited.wait()
+            return render()
+
+    async def main():
+        return await asyncio.gather(first(), second())
+
+    assert asyncio.run(main()) == [('Version 1.0.0', 'Version 2.0.0'), 'Version 1.0.0']
+
+
+def test_scope_is_thread_local():
+    results = []
+
+    with use_versions({render: '1.0.0'}):
+        thread = threading.Thread(target=lambda: results.append(render()))
+        thread.start()
+        thread.join()
+        assert render() == 'Version 1.0.0'
+    assert results == ['Version 2.0.0']
+
+
+def test_invalid_range():
+    with pytest.raises(InvalidVersionError):
+        use_versions({'module.func': 'not a range'})
@@ -1,12 +1,17 @@
 import asyncio
+import subprocess
+import sys
 import warnings
 
 import pytest
 from pytest_assert_utils import util
 
-from funcversion import VersionedFunction, VersionNotFoundError, version
+from funcversion import (AsyncVersionedFunction, VersionedFunction,
+                         VersionNotFoundError, freeze, is_frozen, unfreeze,
+                         version)
+from funcversion.core import _version_registry
 from funcversion.exceptions import (InvalidVersionError, NoVersionsFoundError,
-                                    VersionExistsError)
+                                    RegistryFrozenError, VersionExistsError)
 
 
 def test_global_function_versions():
@@ -622,3 +627,618 @@ def test_async_static_method():
         assert await MyClass.async_method(_version='1.0.0') == 'Async static method version 1.0.0'
 
     asyncio.run(main())
+
+
+def test_latest_version_tracks_registration_order():
+    @version('2.0.0')
+    def func():
+        return 'Version 2.0.0'
+
+    @version('1.5.0')
+    def func():
+        return 'Version 1.5.0'
+
+    assert func.current_version == '2.0.0'
+
+    func.add_version('1.9.0', lambda: 'Version 1.9.0')
+    assert func() == 'Version 2.0.0'
+
+    func.remove_version('2.0.0')
+    assert func.current_version == '1.9.0'
+    assert func() == 'Version 1.9.0'
+
+
+def test_previous_and_next_version():
+    @version('1.0.0')
+    def func():
+        return 'Version 1.0.0'
+
+    @version('2.0.0')
+    def func():
+        return 'Version 2.0.0'
+
+    func.add_version('1.5.0', lambda: 'Version 1.5.0')
+
+    assert func.available_versions == ['1.0.0', '1.5.0', '2.0.0']
+    assert func.previous_version('1.5.0') == '1.0.0'
+    assert func.next_version('1.5.0') == '2.0.0'
+    assert func.previous_version('1.0.0') is None
+    assert func.next_version('2.0.0') is None
+
+    with pytest.raises(VersionNotFoundError):
+        func.next_version('3.0.0')
+
+
+def test_equal_versions_with_different_spelling():
+    func = VersionedFunction('equal_spelling')
+    func.add_version('1.0', lambda: 'Version 1.0')
+    func.add_version('1.0.0', lambda: 'Version 1.0.0')
+    func.add_version('0.9', lambda: 'Version 0.9')
+
+    assert func.available_versions == ['0.9', '1.0', '1.0.0']
+    assert func.previous_version('1.0.0') == '1.0'
+
+    func.remove_version('1.0')
+    assert func.available_versions == ['0.9', '1.0.0']
+
+
+def test_sibling_subclasses_do_not_share_merged_versions():
+    class BaseClass:
+        @version('1.0.0')
+        def method(self):
+            return 'BaseClass version 1.0.0'
+
+    class SubA(BaseClass):
+        @version('2.0.0')
+        def method(self):
+            return 'SubA version 2.0.0'
+
+    class SubB(BaseClass):
+        @version('3.0.0')
+        def method(self):
+            return 'SubB version 3.0.0'
+
+    a, b = SubA(), SubB()
+    assert a.method() == 'SubA version 2.0.0'
+    assert b.method() == 'SubB version 3.0.0'
+    assert a.method() == 'SubA version 2.0.0'
+    assert SubA.method.available_versions == ['1.0.0', '2.0.0']
+    assert SubB.method.available_versions == ['1.0.0', '3.0.0']
+    assert BaseClass.method.available_versions == ['1.0.0']
+    assert SubA.method is SubA.method
+
+
+def test_merged_versions_follow_base_class_changes():
+    class BaseClass:
+        @version('1.0.0')
+        def method(self):
+            return 'BaseClass version 1.0.0'
+
+    class SubClass(BaseClass):
+        @version('2.0.0')
+        def method(self):
+            return 'SubClass version 2.0.0'
+
+    sub = SubClass()
+    assert sub.method() == 'SubClass version 2.0.0'
+
+    BaseClass.method.add_version('3.0.0', lambda self: 'BaseClass version 3.0.0')
+    assert sub.method() == 'BaseClass version 3.0.0'
+
+    sub.method.remove_version('3.0.0')
+    assert sub.method() == 'SubClass version 2.0.0'
+    assert BaseClass.method.available_versions == ['1.0.0']
+
+
+def test_pinned_version():
+    @version('1.0.0')
+    def greet(name):
+        return f'Hello, {name}!'
+
+    @version('2.0.0')
+    def greet(name):
+        return f'Hi, {name}!'
+
+    pinned = greet['1.0.0']
+    assert pinned('Alice') == 'Hello, Alice!'
+    assert greet.bind('1.0.0') is pinned
+
+    with pytest.raises(VersionNotFoundError):
+        greet['3.0.0']
+
+
+def test_pinned_version_follows_deprecation_and_removal():
+    @version('1.0.0')
+    def func():
+        return 'Version 1.0.0'
+
+    @version('2.0.0')
+    def func():
+        return 'Version 2.0.0'
+
+    pinned = func.bind('1.0.0')
+    func.deprecate_version('1.0.0')
+
+    with warnings.catch_warnings(record=True) as w:
+        warnings.simplefilter('always')
+        assert pinned() == 'Version 1.0.0'
+        assert len(w) == 1
+        assert issubclass(w[0].category, DeprecationWarning)
+
+    func.remove_version('1.0.0')
+    with pytest.raises(VersionNotFoundError):
+        pinned()
+
+    func.add_version('1.0.0', lambda: 'Version 1.0.0 again')
+    assert pinned() == 'Version 1.0.0 again'
+
+
+def test_pinned_method_versions():
+    class Greeter:
+        @version('1.0.0')
+        def greet(self):
+            return 'Hello from instance, version 1.0.0!'
+
+        @version('2.0.0')
+        def greet(self):
+            return 'Hello from instance, version 2.0.0!'
+
+        @version('1.0.0')
+        @staticmethod
+        def shout():
+            return 'HELLO, VERSION 1.0.0!'
+
+        @version('2.0.0')
+        @staticmethod
+        def shout():
+            return 'HELLO, VERSION 2.0.0!'
+
+    greeter = Greeter()
+    pinned = Greeter.greet.bind('1.0.0')
+    assert pinned(greeter) == 'Hello from instance, version 1.0.0!'
+    assert pinned.__get__(greeter, Greeter)() == 'Hello from instance, version 1.0.0!'
+    assert Greeter.shout.bind('1.0.0')() == 'HELLO, VERSION 1.0.0!'
+
+
+def test_pinned_versions_bind_like_the_attribute():
+    class Greeter:
+        def __init__(self, name):
+            self.name = name
+
+        @version('1.0.0')
+        def greet(self):
+            return f'Hello from {self.name}, version 1.0.0!'
+
+        @version('2.0.0')
+        def greet(self):
+            return f'Hello from {self.name}, version 2.0.0!'
+
+    greeter = Greeter('Ann')
+    pinned = greeter.greet.bind('1.0.0')
+    assert pinned() == 'Hello from Ann, version 1.0.0!'
+    assert greeter.greet['1.0.0']() == 'Hello from Ann, version 1.0.0!'
+    assert pinned.__func__ is Greeter.greet.bind('1.0.0')
+    assert greeter.greet == greeter.greet
+    assert greeter.greet.available_versions == ['1.0.0', '2.0.0']
+
+
+def test_pinned_classmethod_versions():
+    class Factory:
+        @version('1.0.0')
+        @classmethod
+        def create(cls):
+            return (cls, 1)
+
+        @version('2.0.0')
+        @classmethod
+        def create(cls):
+            return (cls, 2)
+
+    class SubFactory(Factory):
+        pass
+
+    assert Factory.create.bind('1.0.0')() == (Factory, 1)
+    assert Factory.create['2.0.0']() == (Factory, 2)
+    assert Factory().create.bind('1.0.0')() == (Factory, 1)
+    assert SubFactory.create.bind('1.0.0')() == (SubFactory, 1)
+    assert SubFactory.create() == (SubFactory, 2)
+
+
+def test_pinned_version_calls_the_implementation_directly():
+    @version('1.0.0')
+    def func(x):
+        return x
+
+    @version('2.0.0')
+    def func(x):
+        return -x
+
+    pinned = func['1.0.0']
+    assert pinned.func is func.versions['1.0.0']
+    func.enable_metrics()
+    assert pinned.func is not func.versions['1.0.0']
+    assert pinned(3) == 3
+    func.disable_metrics()
+    assert pinned.func is func.versions['1.0.0']
+
+
+def test_compiled_dispatch():
+    @version('1.0.0')
+    def add(a, b=1, *, scale=1):
+        return (a + b) * scale
+
+    @version('2.0.0')
+    def add(a, b=1, *, scale=1):
+        return (a - b) * scale
+
+    add.compile()
+    assert add.compiled
+    assert add(3, 2) == 1
+    assert add(3, scale=2) == 4
+    assert add(3, 2, _version='1.0.0') == 5
+
+    add.add_version('3.0.0', lambda a, b=1, *, scale=1: (a * b) * scale)
+    assert add(3, 2) == 6
+
+    add.deprecate_version('3.0.0')
+    with warnings.catch_warnings(record=True) as w:
+        warnings.simplefilter('always')
+        assert add(3, 2) == 6
+        assert len(w) == 1
+
+    # Versions with differing signatures fall back to the generic path
+    add.add_version('4.0.0', lambda *args: sum(args))
+    assert add(1, 2, 3) == 6
+    assert add(3, 2, _version='1.0.0') == 5
+
+
+def test_compiled_method_dispatch():
+    class Calculator:
+        @version('1.0.0')
+        def compute(self, a, b):
+            return a + b
+
+        @version('2.0.0')
+        def compute(self, a, b):
+            return a * b
+
+    class ScientificCalculator(Calculator):
+        @version('3.0.0')
+        def compute(self, a, b):
+            return a**b
+
+    Calculator.compute.compile()
+    calc = Calculator()
+    assert calc.compute(3, 2) == 6
+    assert calc.compute(3, 2, _version='1.0.0') == 5
+    assert ScientificCalculator().compute(3, 2) == 9
+    assert ScientificCalculator().compute(3, 2, _version='2.0.0') == 6
+
+
+def test_frozen_registry():
+    @version('1.0.0')
+    def func(a):
+        return f'Version 1.0.0: {a}'
+
+    @version('2.0.0')
+    def func(a):
+        return f'Version 2.0.0: {a}'
+
+    freeze()
+    try:
+        assert is_frozen()
+        assert func.compiled
+        assert func('x') == 'Version 2.0.0: x'
+        assert func('x', _version='1.0.0') == 'Version 1.0.0: x'
+        with pytest.raises(VersionNotFoundError):
+            func('x', _version='3.0.0')
+
+        with pytest.raises(RegistryFrozenError):
+            func.add_version('3.0.0', lambda a: a)
+        with pytest.raises(RegistryFrozenError):
+            func.remove_version('1.0.0')
+        with pytest.raises(RegistryFrozenError):
+            func.deprecate_version('1.0.0')
+        with pytest.raises(RegistryFrozenError):
+
+            @version('3.0.0')
+            def func(a):
+                return a
+
+        with pytest.raises(TypeError):
+            func.versions['3.0.0'] = lambda a: a
+
+        key = 'tests.test_core.test_frozen_registry.created_while_frozen'
+        with pytest.raises(RegistryFrozenError):
+            VersionedFunction(key)
+        assert key not in _version_registry
+    finally:
+        unfreeze()
+
+    assert not is_frozen()
+    func.add_version('3.0.0', lambda a: f'Version 3.0.0: {a}')
+    assert func('x') == 'Version 3.0.0: x'
+
+
+def test_deprecation_is_tracked_per_function():
+    def shared():
+        return 'Shared implementation'
+
+    first = VersionedFunction('deprecation_first')
+    second = VersionedFunction('deprecation_second')
+    first.add_version('1.0.0', shared)
+    second.add_version('1.0.0', shared)
+
+    first.deprecate_version('1.0.0')
+
+    assert first.deprecated_versions == ['1.0.0']
+    assert second.deprecated_versions == []
+    with warnings.catch_warnings():
+        warnings.simplefilter('error')
+        assert second() == 'Shared implementation'
+
+
+def test_version_info():
+    from datetime import datetime
+
+    @version('1.0.0')
+    def func():
+        return 'Version 1.0.0'
+
+    @version('2.0.0')
+    def func():
+        return 'Version 2.0.0'
+
+    sunset = datetime(2030, 1, 1)
+    func.deprecate_version('1.0.0', sunset=sunset)
+    info = func.version_info('1.0.0')
+    assert info.deprecated
+    assert info.sunset == sunset
+    assert not func.version_info('2.0.0').deprecated
+
+    with warnings.catch_warnings(record=True) as w:
+        warnings.simplefilter('always')
+        func(_version='1.0.0')
+        func(_version='1.0.0')
+        assert '2030-01-01' in str(w[0].message)
+    assert info.deprecated_calls == 2
+
+    with pytest.raises(VersionNotFoundError):
+        func.version_info('3.0.0')
+
+
+def test_deprecation_publishes_new_metadata():
+    @version('1.0.0')
+    def func():
+        return 'Version 1.0.0'
+
+    @version('2.0.0')
+    def func():
+        return 'Version 2.0.0'
+
+    before = func.version_info('1.0.0')
+    func.deprecate_version('1.0.0')
+    after = func.version_info('1.0.0')
+    assert after is not before
+    assert not before.deprecated
+    assert after.deprecated
+
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        func(_version='1.0.0')
+    func.deprecate_version('1.0.0')
+    assert func.version_info('1.0.0').deprecated_calls == 1
+
+
+def test_version_ranges():
+    @version('1.0.0')
+    def func():
+        return 'Version 1.0.0'
+
+    @version('1.2.0')
+    def func():
+        return 'Version 1.2.0'
+
+    @version('2.0.0')
+    def func():
+        return 'Version 2.0.0'
+
+    assert func(_version='^1.0') == 'Version 1.2.0'
+    assert func(_version='~1.0') == 'Version 1.0.0'
+    assert func(_version='>=1.0,<2') == 'Version 1.2.0'
+    assert func.resolve_version('1.x') == '1.2.0'
+    assert func.resolve_version('2.0.0') == '2.0.0'
+
+    pinned = func.bind('^1.0')
+    assert pinned() == 'Version 1.2.0'
+    assert func['^1.0'] is pinned
+
+    # Resolved ranges follow added and removed versions
+    func.add_version('1.5.0', lambda: 'Version 1.5.0')
+    assert func(_version='^1.0') == 'Version 1.5.0'
+    assert pinned() == 'Version 1.5.0'
+    func.remove_version('1.5.0')
+    assert func(_version='^1.0') == 'Version 1.2.0'
+    assert pinned() == 'Version 1.2.0'
+
+    with pytest.raises(VersionNotFoundError):
+        func(_version='^3.0')
+    with pytest.raises(VersionNotFoundError):
+        func.bind('not a range')
+
+
+def test_resolved_ranges_survive_republishing():
+    @version('1.0.0')
+    def func():
+        return 'Version 1.0.0'
+
+    @version('1.1.0')
+    def func():
+        return 'Version 1.1.0'
+
+    assert func.resolve_version('^1.0') == '1.1.0'
+    ranges = func._snapshot.ranges
+    func.deprecate_version('1.0.0')
+    func.enable_metrics()
+    func.disable_metrics()
+    assert func._snapshot.ranges is ranges
+    assert ranges == {'^1.0': '1.1.0'}
+
+    func.add_version('1.2.0', lambda: 'Version 1.2.0')
+    assert func._snapshot.ranges == {}
+    assert func.resolve_version('^1.0') == '1.2.0'
+
+
+def test_version_ranges_compiled():
+    @version('1.0.0')
+    def func(x):
+        return f'Version 1.0.0: {x}'
+
+    @version('1.1.0')
+    def func(x):
+        return f'Version 1.1.0: {x}'
+
+    func.compile()
+    assert func(1, _version='^1.0') == 'Version 1.1.0: 1'
+    func.deprecate_version('1.1.0')
+    with pytest.warns(DeprecationWarning):
+        assert func.bind('~1.1')(2) == 'Version 1.1.0: 2'
+
+
+def test_concurrent_readers_and_writers():
+    import threading
+
+    @version('1.0.0')
+    def func(x):
+        return x
+
+    errors = []
+    stop = threading.Event()
+
+    def read():
+        try:
+            while not stop.is_set():
+                assert func(1) == 1
+                assert func(2, _version='^1.0') == 2
+                assert func.available_versions[0] == '1.0.0'
+        except Exception as e:
+            errors.append(e)
+
+    def write(prefix):
+        try:
+            for minor in range(200):
+                version_id = f'{prefix}.{minor}.0'
+                func.add_version(version_id, lambda x: x)
+                func.deprecate_version(version_id)
+                func.remove_version(version_id)
+        except Exception as e:
+            errors.append(e)
+
+    readers = [threading.Thread(target=read) for _ in range(4)]
+    writers = [threading.Thread(target=write, args=(prefix,)) for prefix in (3, 4)]
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', DeprecationWarning)
+        for thread in readers + writers:
+            thread.start()
+        for thread in writers:
+            thread.join()
+        stop.set()
+        for thread in readers:
+            thread.join()
+
+    assert not errors
+    assert func.available_versions == ['1.0.0']
+
+
+def test_async_versions_are_native_coroutine_functions():
+    import inspect
+
+    @version('1.0.0')
+    async def fetch(x):
+        return f'Version 1.0.0: {x}'
+
+    @version('2.0.0')
+    async def fetch(x, scale=2):
+        return f'Version 2.0.0: {x * scale}'
+
+    class Client:
+        @version('1.0.0')
+        async def get(self):
+            return 'get 1.0.0'
+
+        @classmethod
+        @version('1.0.0')
+        async def create(cls):
+            return 'create 1.0.0'
+
+        @staticmethod
+        @version('1.0.0')
+        async def ping():
+            return 'ping 1.0.0'
+
+    class SubClient(Client):
+        @version('2.0.0')
+        async def get(self):
+            return 'get 2.0.0'
+
+    assert isinstance(fetch, AsyncVersionedFunction)
+    for func in (fetch, Client().get, Client.create, Client.ping, SubClient().get):
+        assert inspect.iscoroutinefunction(func)
+        assert asyncio.iscoroutinefunction(func)
+    assert str(inspect.signature(fetch)) == '(x, scale=2)'
+
+    # The implementation's own coroutine is returned, not a wrapper around it
+    coro = fetch(1, _version='1.0.0')
+    assert coro.cr_code is fetch.versions['1.0.0'].__code__
+    assert asyncio.run(coro) == 'Version 1.0.0: 1'
+    assert asyncio.run(fetch(1)) == 'Version 2.0.0: 2'
+    assert asyncio.run(SubClient().get(_version='1.0.0')) == 'get 1.0.0'
+
+
+def test_async_generator_versions():
+    import inspect
+
+    @version('1.0.0')
+    async def stream(n):
+        for i in range(n):
+            yield i
+
+    @version('2.0.0')
+    async def stream(n):
+        for i in range(n):
+            yield i * 2
+
+    assert inspect.isasyncgenfunction(stream)
+    assert not inspect.iscoroutinefunction(stream)
+
+    async def collect(**kwargs):
+        return [i async for i in stream(3, **kwargs)]
+
+    assert asyncio.run(collect()) == [0, 2, 4]
+    assert asyncio.run(collect(_version='1.0.0')) == [0, 1, 2]
+
+
+def test_sync_versions_are_not_coroutine_functions():
+    import inspect
+
+    @version('1.0.0')
+    def func():
+        return 'Version 1.0.0'
+
+    assert not isinstance(func, AsyncVersionedFunction)
+    assert not inspect.iscoroutinefunction(func)
+
+
+def test_optional_features_are_imported_lazily():
+    code = (
+        'import sys\n'
+        'from funcversion import version\n'
+        '@version("1.0.0")\n'
+        'def func(): pass\n'
+        'features = ["batch", "cache", "deprecation", "dispatch", "fallback", "hedging", "metrics", "routing",\n'
+        '            "shadow", "singleflight"]\n'
+        'assert not [f for f in features if "funcversion." + f in sys.modules]\n'
+        'func.route({"1.0.0": 1})\n'
+        'assert "funcversion.routing" in sys.modules\n'
+    )
+    subprocess.run([sys.executable, '-c', code], check=True)
@@ -0,0 +1,92 @@
+import logging
+import warnings
+
+import pytest
+
+from funcversion import version
+from funcversion.deprecation import (deprecation_summary,
+                                     emit_deprecation_summary,
+                                     set_deprecation_summary_interval)
+
+
+def _records(func):
+    return [record for record in deprecation_summary() if record.function == func.name]
+
+
+def test_warning_issued_once_per_call_site():
+    @version('1.0.0')
+    def func():
+        return 'Version 1.0.0'
+
+    @version('2.0.0')
+    def func():
+        return 'Version 2.0.0'
+
+    func.deprecate_version('1.0.0')
+
+    with warnings.catch_warnings(record=True) as w:
+        warnings.simplefilter('always')
+        for _ in range(5):
+            func(_version='1.0.0')
+        func(_version='1.0.0')
+
+    assert len(w) == 2
+    assert all(warning.filename == __file__ for warning in w)
+
+    records = _records(func)
+    assert [record.calls for record in records] == [5, 1]
+    assert records[0].suppressed == 4
+    assert func.version_info('1.0.0').deprecated_calls == 6
+
+
+def test_error_filter_keeps_raising():
+    @version('1.0.0')
+    def func():
+        return 'Version 1.0.0'
+
+    func.deprecate_version('1.0.0')
+
+    for _ in range(2):
+        with warnings.catch_warnings():
+            warnings.simplefilter('error')
+            with pytest.raises(DeprecationWarning):
+                func()
+
+
+def test_emit_deprecation_summary(caplog):
+    @version('1.0.0')
+    def func():
+        return 'Version 1.0.0'
+
+    func.deprecate_version('1.0.0')
+
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        for _ in range(3):
+            func()
+
+    with caplog.at_level(logging.WARNING, logger='funcversion'):
+        emit_deprecation_summary()
+
+    assert any(func.name in message and 'called 3 times' in message for message in caplog.messages)
+    assert _records(func) == []
+
+
+def test_periodic_deprecation_summary(caplog):
+    @version('1.0.0')
+    def func():
+        return 'Version 1.0.0'
+
+    func.deprecate_version('1.0.0')
+
+    set_deprecation_summary_interval(0)
+    try:
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore')
+            with caplog.at_level(logging.WARNING, logger='funcversion'):
+                for _ in range(2):
+                    func()
+    finally:
+        set_deprecation_summary_interval(None)
+
+    assert any(func.name in message for message in caplog.messages)
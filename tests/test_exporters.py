@@ -0,0 +1,109 @@
+import os
+import urllib.request
+import warnings
+
+import pytest
+
+from funcversion import version
+from funcversion.exporters import MetricsExporter
+
+
+@version('1.0.0')
+def scraped(x):
+    if x < 0:
+        raise ValueError(x)
+    return x
+
+
+@version('2.0.0')
+def scraped(x):
+    return x
+
+
+scraped.enable_metrics()
+scraped.deprecate_version('1.0.0')
+
+LABELS = 'function="tests.test_exporters.scraped",version="1.0.0"'
+
+
+def _call_deprecated(x):
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', DeprecationWarning)
+        try:
+            scraped(x, _version='1.0.0')
+        except ValueError:
+            pass
+
+
+def _samples(text):
+    return dict(line.rsplit(' ', 1) for line in text.splitlines() if line and not line.startswith('#'))
+
+
+def test_render_openmetrics():
+    exporter = MetricsExporter(buckets=(0.001, 10.0))
+    before = _samples(''.join(exporter.render()))
+    _call_deprecated(1)
+    _call_deprecated(-1)
+    text = ''.join(exporter.render())
+    samples = _samples(text)
+
+    assert text.endswith('# EOF\n')
+    assert '# TYPE funcversion_calls counter\n' in text
+    assert '# TYPE funcversion_call_duration_seconds histogram\n' in text
+    for name in ('funcversion_calls_total', 'funcversion_deprecated_calls_total'):
+        assert int(samples[f'{name}{{{LABELS}}}']) == int(before.get(f'{name}{{{LABELS}}}', 0)) + 2
+    assert int(samples[f'funcversion_errors_total{{{LABELS}}}']) >= 1
+    calls = samples[f'funcversion_calls_total{{{LABELS}}}']
+    assert samples[f'funcversion_call_duration_seconds_bucket{{{LABELS},le="+Inf"}}'] == calls
+    assert samples[f'funcversion_call_duration_seconds_count{{{LABELS}}}'] == calls
+    assert int(samples[f'funcversion_call_duration_seconds_bucket{{{LABELS},le="0.001"}}']) <= int(calls)
+
+
+def test_render_reuses_unchanged_series():
+    exporter = MetricsExporter()
+    scraped(1)
+    ''.join(exporter.render())
+    rendered = exporter._series[('tests.test_exporters.scraped', '2.0.0')]
+    ''.join(exporter.render())
+    assert exporter._series[('tests.test_exporters.scraped', '2.0.0')] is rendered
+    scraped(1)
+    ''.join(exporter.render())
+    assert exporter._series[('tests.test_exporters.scraped', '2.0.0')] is not rendered
+
+
+def test_text_format_and_textfile(tmp_path):
+    exporter = MetricsExporter()
+    text = ''.join(exporter.render(openmetrics=False))
+    assert '# TYPE funcversion_calls_total counter\n' in text
+    assert '# EOF' not in text
+
+    path = tmp_path / 'funcversion.prom'
+    exporter.write_textfile(str(path))
+    assert path.read_text().startswith('# TYPE funcversion_calls_total counter\n')
+    assert os.listdir(tmp_path) == ['funcversion.prom']
+
+    writer = exporter.write_periodically(str(path), interval=0.01)
+    writer.stop()
+    assert writer.error is None
+
+
+def test_serve_http():
+    server = MetricsExporter().serve(0, '127.0.0.1')
+    try:
+        url = f'http://127.0.0.1:{server.server_address[1]}/metrics'
+        request = urllib.request.Request(url, headers={'Accept': 'application/openmetrics-text; version=1.0.0'})
+        with urllib.request.urlopen(request, timeout=5) as response:
+            assert response.headers['Content-Type'].startswith('application/openmetrics-text')
+            assert response.read().decode().endswith('# EOF\n')
+        with urllib.request.urlopen(url, timeout=5) as response:
+            assert response.headers['Content-Type'].startswith('text/plain; version=0.0.4')
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_invalid_buckets():
+    with pytest.raises(ValueError):
+        MetricsExporter(buckets=())
+    with pytest.raises(ValueError):
+        MetricsExporter(buckets=(1.0, 0.5))
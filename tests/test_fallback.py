@@ -0,0 +1,234 @@
+import asyncio
+import time
+
+import pytest
+
+from funcversion import version
+from funcversion.exceptions import CircuitOpenError
+
+
+# The versions of fetch that currently raise ConnectionError
+broken = set()
+
+
+@version('1.0.0')
+def fetch(x):
+    if '1.0.0' in broken:
+        raise ConnectionError('v1 down')
+    return ('v1', x)
+
+
+@version('1.1.0')
+def fetch(x):
+    if '1.1.0' in broken:
+        raise ConnectionError('v1.1 down')
+    return ('v1.1', x)
+
+
+@version('2.0.0')
+def fetch(x):
+    if x < 0:
+        raise ValueError('negative')
+    if '2.0.0' in broken:
+        raise ConnectionError('v2 down')
+    return ('v2', x)
+
+
+@pytest.fixture(autouse=True)
+def reset_fetch():
+    broken.clear()
+    yield
+    broken.clear()
+    fetch.disable_fallback()
+    fetch.stop_routing()
+
+
+def test_falls_back_to_older_version():
+    broken.add('2.0.0')
+    fallback = fetch.enable_fallback(ConnectionError, depth=2)
+    assert fetch(1) == ('v1.1', 1)
+    broken.add('1.1.0')
+    assert fetch(2) == ('v1', 2)
+    assert fallback.fallbacks == 3
+    broken.clear()
+    assert fetch(3) == ('v2', 3)
+
+
+def test_depth_limits_the_chain():
+    broken.update({'2.0.0', '1.1.0'})
+    fetch.enable_fallback(ConnectionError, depth=1)
+    with pytest.raises(ConnectionError, match='v1.1 down'):
+        fetch(1)
+
+
+def test_other_exceptions_propagate():
+    fallback = fetch.enable_fallback(ConnectionError)
+    with pytest.raises(ValueError):
+        fetch(-1)
+    assert fallback.fallbacks == 0
+    assert fallback.breakers['2.0.0'].calls == 0
+
+
+def test_deprecated_versions_are_skipped():
+    @version('1.0.0')
+    def lookup(x):
+        return ('v1', x)
+
+    @version('1.1.0')
+    def lookup(x):
+        return ('v1.1', x)
+
+    @version('2.0.0')
+    def lookup(x):
+        raise ConnectionError('v2 down')
+
+    lookup.deprecate_version('1.1.0')
+    lookup.enable_fallback(ConnectionError, depth=1)
+    assert lookup(1) == ('v1', 1)
+
+
+def test_breaker_opens_and_probes():
+    broken.add('2.0.0')
+    fallback = fetch.enable_fallback(ConnectionError, min_calls=5, window=5, reset_timeout=0.05)
+    breaker = fallback.breakers['2.0.0']
+    for _ in range(5):
+        assert fetch(1) == ('v1.1', 1)
+    assert breaker.state == 'open'
+    assert breaker.trips == 1
+    calls = breaker.calls
+    assert fetch(1) == ('v1.1', 1)
+    assert breaker.calls == calls
+
+    # A failed probe keeps the breaker open
+    time.sleep(0.06)
+    assert breaker.state == 'half-open'
+    assert fetch(1) == ('v1.1', 1)
+    assert breaker.state == 'open'
+    assert breaker.calls == calls + 1
+
+    # A successful probe closes it
+    broken.clear()
+    time.sleep(0.06)
+    assert fetch(1) == ('v2', 1)
+    assert breaker.state == 'closed'
+    assert breaker.failure_rate == 0.0
+
+
+def test_all_breakers_open():
+    broken.update({'2.0.0', '1.1.0'})
+    fetch.enable_fallback(ConnectionError, min_calls=1, window=1)
+    with pytest.raises(ConnectionError):
+        fetch(1)
+    with pytest.raises(CircuitOpenError):
+        fetch(1)
+
+
+def test_pinned_calls_do_not_fall_back():
+    broken.add('2.0.0')
+    fetch.enable_fallback(ConnectionError)
+    with pytest.raises(ConnectionError):
+        fetch.bind('2.0.0')(1)
+
+
+def test_disable_fallback():
+    broken.add('2.0.0')
+    fallback = fetch.enable_fallback(ConnectionError)
+    assert fetch(1) == ('v1.1', 1)
+    assert fetch.disable_fallback() is fallback
+    with pytest.raises(ConnectionError):
+        fetch(1)
+    assert fetch.disable_fallback() is None
+
+
+def test_fallback_with_router():
+    broken.add('2.0.0')
+    fetch.route({'2.0.0': 1, '1.0.0': 1})
+    fetch.enable_fallback(ConnectionError)
+    results = {fetch(1)[0] for _ in range(50)}
+    assert results == {'v1.1', 'v1'}
+
+
+def test_invalid_settings():
+    with pytest.raises(ValueError):
+        fetch.enable_fallback(depth=-1)
+    with pytest.raises(ValueError):
+        fetch.enable_fallback(threshold=0)
+    with pytest.raises(ValueError):
+        fetch.enable_fallback(window=0)
+    with pytest.raises(ValueError):
+        fetch.enable_fallback(reset_timeout=0)
+
+
+def test_async_fallback():
+    @version('1.0.0')
+    async def load(x):
+        return ('v1', x)
+
+    @version('2.0.0')
+    async def load(x):
+        await asyncio.sleep(0)
+        raise TimeoutError('slow')
+
+    fallback = load.enable_fallback(TimeoutError, min_calls=2, window=2)
+    assert asyncio.run(load(1)) == ('v1', 1)
+    assert asyncio.run(load(2)) == ('v1', 2)
+    assert fallback.breakers['2.0.0'].state == 'open'
+    assert fallback.fallbacks == 2
+
+
+def test_call_running_when_breaker_opens_does_not_close_it():
+    release = asyncio.Event()
+
+    @version('1.0.0')
+    async def query(x):
+        return ('v1', x)
+
+    @version('2.0.0')
+    async def query(x):
+        if x == 'slow':
+            await release.wait()
+            return ('v2', x)
+        raise ConnectionError('v2 down')
+
+    fallback = query.enable_fallback(ConnectionError, min_calls=2, window=2, reset_timeout=0.05)
+    breaker = fallback.breakers['2.0.0']
+
+    async def main():
+        slow = asyncio.ensure_future(query('slow'))
+        await asyncio.sleep(0)
+        assert await query(1) == ('v1', 1)
+        assert await query(2) == ('v1', 2)
+        assert breaker.state == 'open'
+        # The call started before the breaker opened succeeds, but it isn't the probe
+        release.set()
+        assert await slow == ('v2', 'slow')
+        assert breaker.state == 'open'
+        # The probe admitted after the timeout closes it
+        await asyncio.sleep(0.06)
+        assert await query('slow') == ('v2', 'slow')
+        assert breaker.state == 'closed'
+
+    asyncio.run(main())
+
+
+class Client:
+    @version('1.0.0')
+    def get(self, path):
+        return ('v1', path)
+
+
+class RetryingClient(Client):
+    @version('2.0.0')
+    def get(self, path):
+        raise ConnectionError('v2 down')
+
+
+def test_fallback_through_view():
+    fallback = RetryingClient.get.enable_fallback(ConnectionError)
+    assert RetryingClient().get('/') == ('v1', '/')
+    assert fallback.fallbacks == 1
+    RetryingClient.__dict__['get']._owner_cache.clear()
+    assert RetryingClient().get('/') == ('v1', '/')
+    assert RetryingClient.get.disable_fallback() is fallback
+    with pytest.raises(ConnectionError):
+        RetryingClient().get('/')
@@ -0,0 +1,74 @@
+import asyncio
+
+import pytest
+
+from funcversion import version
+from funcversion.exceptions import VersionNotFoundError
+
+
+@version('1.0.0')
+async def answer(delay, fail=False):
+    await asyncio.sleep(0.1)
+    return 'stable'
+
+
+@version('2.0.0')
+async def answer(delay, fail=False):
+    await asyncio.sleep(delay)
+    if fail:
+        raise ValueError('Broken')
+    return 'new'
+
+
+def test_fast_primary_is_not_hedged():
+    hedge = answer.hedged(primary='2.0.0', backup='1.0.0', after_ms=500)
+    assert asyncio.run(hedge(0)) == 'new'
+    assert (hedge.calls, hedge.hedged, hedge.backup_wins) == (1, 0, 0)
+
+
+def test_slow_primary_is_hedged_and_cancelled():
+    cancelled = []
+
+    @version('1.0.0')
+    async def slow(delay):
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            cancelled.append(delay)
+            raise
+        return delay
+
+    @version('1.1.0')
+    async def slow(delay):
+        await asyncio.sleep(0.4)
+        return 'backup'
+
+    hedge = slow.hedged(primary='1.0.0', backup='1.1.0', after_ms=20)
+
+    async def main():
+        return await asyncio.gather(hedge(10.0), hedge(0.1))
+
+    # Both primaries outlast the hedge delay, so both calls start a backup. The first backup wins and its primary is
+    # cancelled; the second primary still finishes well before its backup.
+    assert asyncio.run(main()) == ['backup', 0.1]
+    assert cancelled == [10.0]
+    assert (hedge.calls, hedge.hedged, hedge.backup_wins) == (2, 2, 1)
+
+
+def test_failed_primary_waits_for_backup():
+    # The primary fails 40 ms after the backup started, 60 ms before the backup finishes
+    hedge = answer.hedged(primary='2.0.0', backup='1.0.0', after_ms=10)
+    assert asyncio.run(hedge(0.05, fail=True)) == 'stable'
+    assert (hedge.hedged, hedge.backup_wins) == (1, 1)
+
+    # Failing before the hedge delay is not hedged
+    hedge = answer.hedged(primary='2.0.0', backup='1.0.0', after_ms=500)
+    with pytest.raises(ValueError):
+        asyncio.run(hedge(0, fail=True))
+
+
+def test_hedged_validates_versions():
+    with pytest.raises(VersionNotFoundError):
+        answer.hedged(primary='3.0.0', backup='1.0.0')
+    with pytest.raises(ValueError):
+        answer.hedged(primary='2.0.0', backup='1.0.0', after_ms=-1)
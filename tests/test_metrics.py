@@ -0,0 +1,110 @@
+import asyncio
+
+import pytest
+
+from funcversion import metrics, version
+from funcversion.metrics import BUCKET_COUNT, bucket_index, bucket_upper_bound
+
+
+def test_bucket_bounds():
+    for value in (0, 1, 15, 16, 17, 100, 12_345, 10**9, 2**40 - 1):
+        index = bucket_index(value)
+        lower = bucket_upper_bound(index - 1) if index else 0
+        assert lower <= value < bucket_upper_bound(index)
+        assert value < 16 or bucket_upper_bound(index) - lower <= value / 16
+    assert bucket_index(2**50) == BUCKET_COUNT - 1
+
+
+def test_metrics_disabled_by_default():
+    @version('1.0.0')
+    def quiet(x):
+        return x
+
+    quiet(1)
+    assert 'tests.test_metrics.test_metrics_disabled_by_default.<locals>.quiet' not in metrics.snapshot()
+
+
+def test_metrics_count_calls_and_errors():
+    @version('1.0.0')
+    def divide(x):
+        return 1 / x
+
+    @version('2.0.0')
+    def divide(x):
+        return 2 / x
+
+    divide.enable_metrics()
+    divide(1)
+    divide(2)
+    divide(1, _version='1.0.0')
+    with pytest.raises(ZeroDivisionError):
+        divide(0)
+    divide.bind('1.0.0')(4)
+
+    result = metrics.snapshot(function=divide.name)[divide.name]
+    assert (result['2.0.0'].calls, result['2.0.0'].errors) == (3, 1)
+    assert (result['1.0.0'].calls, result['1.0.0'].errors) == (2, 0)
+    histogram = result['2.0.0'].histogram
+    assert sum(count for _, count in histogram.buckets()) == 3
+    assert 0 < histogram.percentile(50) <= histogram.percentile(100) == histogram.max_ns / 1e9
+    assert histogram.mean > 0
+
+    # Reading with reset starts over, disabling keeps what was recorded
+    metrics.snapshot(reset=True, function=divide.name)
+    divide(1)
+    divide.disable_metrics()
+    divide(1)
+    assert metrics.snapshot(function=divide.name)[divide.name]['2.0.0'].calls == 1
+
+
+def test_metrics_compiled_and_routed():
+    @version('1.0.0')
+    def split(x):
+        return x
+
+    @version('2.0.0')
+    def split(x):
+        return -x
+
+    split.compile()
+    split.enable_metrics()
+    split.route({'1.0.0': 1, '2.0.0': 1}, key=lambda x: x)
+    for x in range(100):
+        split(x)
+    result = metrics.snapshot(function=split.name)[split.name]
+    assert result['1.0.0'].calls + result['2.0.0'].calls == 100
+    assert result['1.0.0'].calls > 0 and result['2.0.0'].calls > 0
+
+
+def test_metrics_time_coroutines():
+    @version('1.0.0')
+    async def fetch():
+        await asyncio.sleep(0.01)
+        return 1
+
+    fetch.enable_metrics()
+    assert asyncio.run(fetch()) == 1
+    histogram = metrics.snapshot(function=fetch.name)[fetch.name]['1.0.0'].histogram
+    assert histogram.count == 1
+    assert histogram.mean >= 0.01
+
+
+class Base:
+    @version('1.0.0')
+    def describe(self):
+        return 'base'
+
+
+class Child(Base):
+    @version('2.0.0')
+    def describe(self):
+        return 'child'
+
+
+def test_metrics_inherited_versions():
+    Base.describe.enable_metrics()
+    assert Child().describe(_version='1.0.0') == 'base'
+    assert Child().describe() == 'child'
+    result = metrics.snapshot()
+    assert result[Base.describe.name]['1.0.0'].calls == 1
+    assert Child.describe.name not in result
@@ -0,0 +1,78 @@
+import multiprocessing
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from funcversion import VersionedFunction, version
+
+
+@version('1.0.0')
+def greet(name):
+    return f'Hello, {name}!'
+
+
+@version('2.0.0')
+def greet(name):
+    return f'Hi, {name}!'
+
+
+class Greeter:
+    @version('1.0.0')
+    def greet(self):
+        return 'Greeter 1.0.0'
+
+
+class LoudGreeter(Greeter):
+    @version('2.0.0')
+    def greet(self):
+        return 'LoudGreeter 2.0.0'
+
+
+def test_pickle_by_reference():
+    data = pickle.dumps(greet)
+    assert len(data) < 200
+    assert b'Hello' not in data
+    assert pickle.loads(data) is greet
+
+    pinned = pickle.loads(pickle.dumps(greet['^1.0']))
+    assert pinned is greet['^1.0']
+    assert pinned('Bob') == 'Hello, Bob!'
+
+
+def test_pickle_methods():
+    assert pickle.loads(pickle.dumps(LoudGreeter.greet)) is LoudGreeter.greet
+    bound = pickle.loads(pickle.dumps(LoudGreeter().greet))
+    assert bound(_version='1.0.0') == 'Greeter 1.0.0'
+    assert bound() == 'LoudGreeter 2.0.0'
+
+
+def test_pickle_compiled():
+    @version('1.0.0')
+    def compiled(x):
+        return x
+
+    compiled.compile()
+    assert pickle.loads(pickle.dumps(compiled)) is compiled
+
+
+def test_unregistered_function_is_not_picklable():
+    func = VersionedFunction('tests.test_pickle.unregistered')
+    func.add_version('1.0.0', lambda: None)
+    with pytest.raises(TypeError):
+        pickle.dumps(func)
+
+
+def test_unpickle_in_spawned_process():
+    with ProcessPoolExecutor(1, mp_context=multiprocessing.get_context('spawn')) as pool:
+        assert pool.submit(greet, 'Ann').result() == 'Hi, Ann!'
+        assert pool.submit(greet['1.0.0'], 'Ann').result() == 'Hello, Ann!'
+        assert list(pool.map(greet, ['Bo', 'Cy'])) == ['Hi, Bo!', 'Hi, Cy!']
+
+
+def test_pickle_inherited_pinned_version():
+    pinned = pickle.loads(pickle.dumps(LoudGreeter.greet['1.0.0']))
+    assert pinned is LoudGreeter.greet['1.0.0']
+    assert pinned(LoudGreeter()) == 'Greeter 1.0.0'
+    own = pickle.loads(pickle.dumps(LoudGreeter.greet['2.0.0']))
+    assert own(LoudGreeter()) == 'LoudGreeter 2.0.0'
@@ -0,0 +1,72 @@
+import asyncio
+
+import pytest
+
+from funcversion import declare_release, use_release, use_versions, version
+from funcversion.exceptions import ReleaseExistsError, ReleaseNotFoundError, VersionNotFoundError
+from funcversion.releases import available_releases, get_release
+
+
+@version('1.0.0')
+def render():
+    return 'Render 1.0.0'
+
+
+@version('1.1.0')
+def render():
+    return 'Render 1.1.0'
+
+
+@version('1.0.0')
+def list_items():
+    return 'List 1.0.0'
+
+
+@version('2.0.0')
+def list_items():
+    return 'List 2.0.0'
+
+
+def test_releases_snapshot_versions():
+    declare_release('2026-01-01', {render: '1.0.0', list_items.name: '1.0.0'})
+    declare_release('2026-06-01', {render: '^1.0'})
+    declare_release('2026-09-01', {list_items: '2.0.0'})
+
+    assert get_release('2026-01-01')[render.name] == '1.0.0'
+    # Functions not mentioned keep the version they served in the previous release
+    assert get_release('2026-06-01')[list_items.name] == '1.0.0'
+    assert get_release('2026-09-01')[render.name] == '1.1.0'
+    assert available_releases()[-3:] == ['2026-01-01', '2026-06-01', '2026-09-01']
+
+    with use_release('2026-01-01'):
+        assert render() == 'Render 1.0.0'
+        assert list_items() == 'List 1.0.0'
+        # Explicit versions and nested scopes still take precedence
+        assert render(_version='1.1.0') == 'Render 1.1.0'
+        with use_versions({list_items: '2.0.0'}):
+            assert list_items() == 'List 2.0.0'
+    with use_release('2026-06-01'):
+        assert render() == 'Render 1.1.0'
+        assert list_items() == 'List 1.0.0'
+
+    async def handle(release_id):
+        async with use_release(release_id):
+            await asyncio.sleep(0.01)
+            return render(), list_items()
+
+    async def main():
+        return await asyncio.gather(handle('2026-01-01'), handle('2026-09-01'))
+
+    assert asyncio.run(main()) == [('Render 1.0.0', 'List 1.0.0'), ('Render 1.1.0', 'List 2.0.0')]
+
+
+def test_release_errors():
+    declare_release('2025-01-01')
+    with pytest.raises(ReleaseExistsError):
+        declare_release('2025-01-01')
+    with pytest.raises(ReleaseNotFoundError):
+        use_release('1999-01-01')
+    with pytest.raises(VersionNotFoundError):
+        declare_release('2025-02-01', {render: '^3.0'})
+    with pytest.raises(VersionNotFoundError):
+        declare_release('2025-03-01', {'module.missing': '1.0.0'})
@@ -0,0 +1,355 @@
+import asyncio
+import time
+
+import pytest
+
+from funcversion import use_versions, version
+from funcversion.exceptions import VersionNotFoundError
+
+
+def test_route_splits_by_weight():
+    @version('1.0.0')
+    def which():
+        return 1
+
+    @version('2.0.0')
+    def which():
+        return 2
+
+    @version('3.0.0')
+    def which():
+        return 3
+
+    which.route({'1.0.0': 80, '2.0.0': 20})
+    counts = {1: 0, 2: 0, 3: 0}
+    for _ in range(10_000):
+        counts[which()] += 1
+    assert 7_500 < counts[1] < 8_500
+    assert counts[3] == 0
+
+    # Pinned and scoped calls are not routed
+    assert which(_version='3.0.0') == 3
+    with use_versions({which: '3.0.0'}):
+        assert which() == 3
+
+    assert which.stop_routing() is not None
+    assert which() == 3
+
+
+def test_route_sticky_key():
+    @version('1.0.0')
+    def greet(user):
+        return 1
+
+    @version('2.0.0')
+    def greet(user):
+        return 2
+
+    greet.route({'1.0.0': 50, '2.0.0': 50}, key=lambda user: user)
+    first = [greet(user) for user in range(1_000)]
+    assert first == [greet(user) for user in range(1_000)]
+    assert 400 < first.count(1) < 600
+
+    # Raising a version's share only moves keys towards it
+    greet.route({'1.0.0': 25, '2.0.0': 75}, key=lambda user: user)
+    second = [greet(user) for user in range(1_000)]
+    assert all(b == 2 for a, b in zip(first, second) if a == 2)
+    assert 150 < second.count(1) < 350
+
+
+def test_route_updates_compiled_dispatch():
+    @version('1.0.0')
+    def compiled():
+        return 1
+
+    @version('2.0.0')
+    def compiled():
+        return 2
+
+    compiled.compile()
+    compiled.route({'1.0.0': 1})
+    assert compiled() == 1
+    compiled.route({'1.0.0': 0, '2.0.0': 1})
+    assert compiled() == 2
+    compiled.stop_routing()
+    assert compiled() == 2
+
+
+def test_route_resolves_ranges_and_warns_deprecated():
+    @version('1.0.0')
+    def legacy():
+        return 1
+
+    @version('1.1.0')
+    def legacy():
+        return 11
+
+    @version('2.0.0')
+    def legacy():
+        return 2
+
+    legacy.route({'^1.0': 1})
+    assert legacy() == 11
+    legacy.deprecate_version('1.1.0')
+    with pytest.warns(DeprecationWarning):
+        assert legacy() == 11
+
+
+def test_route_renormalizes_removed_versions():
+    @version('1.0.0')
+    def shrink():
+        return 1
+
+    @version('2.0.0')
+    def shrink():
+        return 2
+
+    @version('3.0.0')
+    def shrink():
+        return 3
+
+    shrink.route({'1.0.0': 50, '2.0.0': 50})
+    shrink.remove_version('1.0.0')
+    assert {shrink() for _ in range(100)} == {2}
+    # Without any routed version left, calls go to the latest version
+    shrink.remove_version('2.0.0')
+    assert shrink() == 3
+
+
+def test_route_rejects_invalid_weights():
+    @version('1.0.0')
+    def invalid():
+        return 1
+
+    with pytest.raises(ValueError):
+        invalid.route({'1.0.0': -1})
+    with pytest.raises(ValueError):
+        invalid.route({'1.0.0': 0})
+    with pytest.raises(VersionNotFoundError):
+        invalid.route({'9.0.0': 1})
+    assert invalid() == 1
+
+
+def test_select_fastest_prefers_faster_version():
+    @version('1.0.0')
+    def total(items):
+        time.sleep(0.002)
+        return sum(items)
+
+    @version('2.0.0')
+    def total(items):
+        return sum(items)
+
+    router = total.select_fastest(['1.0.0', '2.0.0'], min_samples=3, explore_every=10)
+    for _ in range(100):
+        assert total([1, 2]) == 3
+    assert router.fastest() == '2.0.0'
+    latencies = router.latencies()[None]
+    slow_mean, slow_samples = latencies['1.0.0']
+    fast_mean, fast_samples = latencies['2.0.0']
+    assert slow_mean > fast_mean
+    # Warm-up, then one exploring call every ten
+    assert 3 <= slow_samples <= 15
+    assert slow_samples + fast_samples == 100
+
+    # Pinned calls are not routed
+    assert total([1], _version='1.0.0') == 1
+    assert total.stop_routing() is router
+
+
+def test_select_fastest_buckets_by_key():
+    @version('1.0.0')
+    def scale(n):
+        if n >= 10:
+            time.sleep(0.002)
+        return 'loop'
+
+    @version('2.0.0')
+    def scale(n):
+        if n < 10:
+            time.sleep(0.002)
+        return 'vectorized'
+
+    router = scale.select_fastest(['1.0.0', '2.0.0'], key=lambda n: n >= 10, min_samples=2, explore_every=50)
+    for _ in range(20):
+        scale(1)
+        scale(100)
+    assert router.fastest(False) == '1.0.0'
+    assert router.fastest(True) == '2.0.0'
+    assert scale(1) == 'loop'
+    assert scale(100) == 'vectorized'
+
+
+def test_select_fastest_reexplores():
+    slow = {'1.0.0'}
+
+    @version('1.0.0')
+    def drift():
+        if '1.0.0' in slow:
+            time.sleep(0.002)
+
+    @version('2.0.0')
+    def drift():
+        if '2.0.0' in slow:
+            time.sleep(0.002)
+
+    router = drift.select_fastest(['1.0.0', '2.0.0'], window=2, min_samples=2, explore_every=3)
+    for _ in range(10):
+        drift()
+    assert router.fastest() == '2.0.0'
+    slow.clear()
+    slow.add('2.0.0')
+    for _ in range(10):
+        drift()
+    assert router.fastest() == '1.0.0'
+
+
+def test_select_fastest_overflow_bucket():
+    @version('1.0.0')
+    def keyed(n):
+        return n
+
+    @version('2.0.0')
+    def keyed(n):
+        return n
+
+    router = keyed.select_fastest(['1.0.0', '2.0.0'], key=lambda n: n, max_buckets=2)
+    assert [keyed(n) for n in range(5)] == list(range(5))
+    assert len(router.latencies()) == 3
+
+
+def test_select_fastest_async():
+    @version('1.0.0')
+    async def fetch():
+        await asyncio.sleep(0.002)
+        return 1
+
+    @version('2.0.0')
+    async def fetch():
+        return 2
+
+    router = fetch.select_fastest(['1.0.0', '2.0.0'], min_samples=2)
+
+    async def main():
+        return [await fetch() for _ in range(10)]
+
+    assert asyncio.run(main())[-1] == 2
+    assert router.fastest() == '2.0.0'
+
+
+def test_select_fastest_rejects_invalid_settings():
+    @version('1.0.0')
+    def gen():
+        yield 1
+
+    @version('2.0.0')
+    def gen():
+        yield 2
+
+    with pytest.raises(ValueError):
+        gen.select_fastest(['1.0.0', '2.0.0'])
+
+    @version('1.0.0')
+    def plain():
+        return 1
+
+    with pytest.raises(ValueError):
+        plain.select_fastest([])
+    with pytest.raises(ValueError):
+        plain.select_fastest(['1.0.0'], explore_every=0)
+    with pytest.raises(ValueError):
+        plain.select_fastest(['1.0.0'], explore_every=1)
+    with pytest.raises(VersionNotFoundError):
+        plain.select_fastest(['9.0.0'])
+    assert plain() == 1
+
+
+def test_select_fastest_explores_every_other_call_at_the_boundary():
+    @version('1.0.0')
+    def pair():
+        time.sleep(0.002)
+        return 1
+
+    @version('2.0.0')
+    def pair():
+        return 2
+
+    router = pair.select_fastest(['1.0.0', '2.0.0'], min_samples=1, explore_every=2)
+    served = [pair() for _ in range(20)]
+    assert router.fastest() == '2.0.0'
+    # After warming up, every second call explores the slower version and the others serve the fastest one
+    assert served[4:].count(2) == 8
+
+
+def test_select_fastest_keeps_measurements_when_recompiled():
+    @version('1.0.0')
+    def learned():
+        time.sleep(0.002)
+        return 1
+
+    @version('2.0.0')
+    def learned():
+        return 2
+
+    @version('3.0.0')
+    def learned():
+        time.sleep(0.002)
+        return 3
+
+    @version('4.0.0')
+    def learned():
+        return 4
+
+    router = learned.select_fastest(['1.0.0', '2.0.0', '3.0.0'], min_samples=2)
+    for _ in range(10):
+        learned()
+    assert router.fastest() == '2.0.0'
+
+    # Republishing without changing the routed versions keeps the fastest version
+    learned.enable_metrics()
+    learned.enable_cache()
+    learned.deprecate_version('4.0.0')
+    learned.disable_cache()
+    learned.disable_metrics()
+    assert router.fastest() == '2.0.0'
+
+    # Removing a routed version picks the fastest again among the remaining ones
+    learned.remove_version('3.0.0')
+    assert router.fastest() is None
+    assert router.latencies()[None]['2.0.0'][1] > 0
+
+
+class Pricing:
+    @version('1.0.0')
+    def quote(self):
+        time.sleep(0.002)
+        return 1
+
+
+class DiscountPricing(Pricing):
+    @version('2.0.0')
+    def quote(self):
+        return 2
+
+
+def test_route_through_view():
+    router = DiscountPricing.quote.route({'1.0.0': 1})
+    assert DiscountPricing().quote() == 1
+    # Kept on the function defined on the subclass, so rebuilding the view keeps it
+    origin = DiscountPricing.__dict__['quote']
+    assert origin._router is router
+    origin._owner_cache.clear()
+    assert DiscountPricing().quote() == 1
+    assert DiscountPricing.quote.stop_routing() is router
+    assert DiscountPricing().quote() == 2
+
+
+def test_select_fastest_through_view():
+    router = DiscountPricing.quote.select_fastest(['1.0.0', '2.0.0'], min_samples=2)
+    for _ in range(10):
+        DiscountPricing().quote()
+    assert router.fastest() == '2.0.0'
+    DiscountPricing.__dict__['quote']._owner_cache.clear()
+    assert DiscountPricing.quote._router is router
+    assert DiscountPricing().quote() == 2
+    DiscountPricing.quote.stop_routing()
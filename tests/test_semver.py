@@ -0,0 +1,81 @@
+import itertools
+import subprocess
+import sys
+
+import pytest
+from packaging.version import Version
+
+from funcversion.exceptions import InvalidVersionError
+from funcversion.semver import parse_range, parse_version
+
+VERSIONS = [
+    '1', '1.0', '1.0.0', '1.0.1', '0.9', '10.2.33', '1.0a', '1.0.0a1', '1.0.0-alpha', '1.0.0-alpha.2',
+    '1.0.0b3', '1.0.0-beta', '1.0.0-rc1', '1.0.0rc.2', '1.0.0c1', '1.0.0.0', '1.0.post1', '1.0.0-1',
+    '1.0.dev1', '1.0a1.dev2', '1.0.0.post0.dev1', '1!0.1', '1.0+local.1', '1.0+abc', 'v1.0', '1.0.0RC1',
+]
+
+
+def test_ordering_matches_packaging():
+    for a, b in itertools.product(VERSIONS, repeat=2):
+        assert (parse_version(a) < parse_version(b)) == (Version(a) < Version(b)), (a, b)
+        assert (parse_version(a) == parse_version(b)) == (Version(a) == Version(b)), (a, b)
+
+
+@pytest.mark.parametrize('version_id', ['invalid_version', '1.0.0-foo', '', '1..0'])
+def test_invalid_versions(version_id):
+    with pytest.raises(InvalidVersionError):
+        parse_version(version_id)
+
+
+def test_packaging_is_imported_lazily():
+    code = (
+        'import sys\n'
+        'from funcversion import version\n'
+        '@version("1.0.0-rc1")\n'
+        'def func(): pass\n'
+        'assert "packaging" not in sys.modules\n'
+        '@version("1.0.0.post1")\n'
+        'def func(): pass\n'
+        'assert "packaging" in sys.modules\n'
+    )
+    subprocess.run([sys.executable, '-c', code], check=True)
+
+
+RANGE_VERSIONS = ['0.9.0', '1.0.0', '1.2.0', '1.2.5', '1.3.0', '2.0.0-rc1', '2.0.0', '2.1.0']
+
+
+@pytest.mark.parametrize(
+    'spec, expected',
+    [
+        ('^1.2', '1.3.0'),
+        ('^0.9', '0.9.0'),
+        ('~1.2', '1.2.5'),
+        ('~=1.2', '1.3.0'),
+        ('~=1.2.0', '1.2.5'),
+        ('1.x', '1.3.0'),
+        ('1.2.*', '1.2.5'),
+        ('*', '2.1.0'),
+        ('>=1.0,<2', '1.3.0'),
+        ('>=1.0 <2.0', '1.3.0'),
+        ('<2.0.0', '1.3.0'),
+        ('>1.0, !=1.3.0, <2', '1.2.5'),
+        ('==1.2', '1.2.0'),
+        ('1.2.0', '1.2.0'),
+        ('^3', None),
+    ],
+)
+def test_range_best_match(spec, expected):
+    keys = [parse_version(v) for v in RANGE_VERSIONS]
+    assert parse_range(spec).best_match(RANGE_VERSIONS, keys) == expected
+
+
+def test_range_falls_back_to_prereleases():
+    versions = ['1.0.0', '2.0.0-rc1']
+    keys = [parse_version(v) for v in versions]
+    assert parse_range('>=2.0.0-rc1').best_match(versions, keys) == '2.0.0-rc1'
+
+
+@pytest.mark.parametrize('spec', ['', '^', '1.x.2', '>=1.x', '~=1', 'latest'])
+def test_invalid_ranges(spec):
+    with pytest.raises(InvalidVersionError):
+        parse_range(spec)
@@ -0,0 +1,184 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from funcversion import version
+from funcversion.exceptions import VersionNotFoundError
+
+
+def _wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, 'Timed out'
+        time.sleep(0.001)
+
+
+def test_shadow_compares_candidate():
+    @version('1.0.0')
+    def square(x):
+        return x * x
+
+    @version('2.0.0')
+    def square(x):
+        if x == 3:
+            raise ValueError('Unsupported')
+        return 5 if x == 2 else x**2
+
+    shadow = square.shadow('2.0.0', sample_rate=1)
+    # The dark-launched latest version serves no traffic
+    assert [square(x) for x in range(4)] == [0, 1, 4, 9]
+    _wait_for(lambda: shadow.completed == 4)
+    assert (shadow.sampled, shadow.matches, shadow.mismatches, shadow.errors) == (4, 2, 1, 1)
+    assert [m.expected for m in shadow.recent_mismatches] == [4, 9]
+    assert isinstance(shadow.recent_mismatches[1].actual, ValueError)
+
+    # Pinned calls are not shadowed
+    assert square(2, _version='2.0.0') == 5
+    assert square.stop_shadow() is shadow
+    assert square(2) == 5
+    assert shadow.sampled == 4
+
+
+def test_shadow_older_candidate_and_compare():
+    @version('1.0.0')
+    def func(x):
+        return [x]
+
+    @version('2.0.0')
+    def func(x):
+        return (x,)
+
+    shadow = func.shadow('^1.0', sample_rate=1, compare=lambda a, b: list(a) == list(b))
+    assert func(1) == (1,)
+    _wait_for(lambda: shadow.completed == 1)
+    assert shadow.matches == 1
+    func.stop_shadow()
+
+
+def test_shadow_never_blocks_and_drops_when_full():
+    release = threading.Event()
+
+    @version('1.0.0')
+    def func(x):
+        return x
+
+    @version('2.0.0')
+    def func(x):
+        release.wait()
+        return x
+
+    shadow = func.shadow('2.0.0', sample_rate=1, max_pending=2)
+    start = time.perf_counter()
+    assert [func(x) for x in range(10)] == list(range(10))
+    assert time.perf_counter() - start < 1
+    assert (shadow.sampled, shadow.dropped) == (2, 8)
+    release.set()
+    _wait_for(lambda: shadow.completed == 2)
+    assert shadow.matches == 2
+    func.stop_shadow()
+
+
+def test_shadow_compiled():
+    @version('1.0.0')
+    def func(x):
+        return x
+
+    @version('2.0.0')
+    def func(x):
+        return -x
+
+    func.compile()
+    shadow = func.shadow('2.0.0', sample_rate=1)
+    assert func(1) == 1
+    _wait_for(lambda: shadow.completed == 1)
+    assert shadow.mismatches == 1
+    func.stop_shadow()
+    assert func(1) == -1
+
+
+def test_shadow_async():
+    @version('1.0.0')
+    async def fetch(x):
+        return x
+
+    @version('2.0.0')
+    async def fetch(x):
+        await asyncio.sleep(0.01)
+        return x
+
+    shadow = fetch.shadow('2.0.0', sample_rate=1)
+
+    async def main():
+        assert await fetch(1) == 1
+        assert shadow.completed == 0
+        await asyncio.sleep(0.05)
+
+    asyncio.run(main())
+    assert shadow.matches == 1
+    assert shadow.mean_latency_delta > 0
+    fetch.stop_shadow()
+
+
+def test_shadow_errors():
+    @version('1.0.0')
+    def func():
+        return None
+
+    with pytest.raises(VersionNotFoundError):
+        func.shadow('2.0.0')
+    with pytest.raises(ValueError):
+        func.shadow('1.0.0', sample_rate=2)
+
+
+def test_shadow_candidate_is_not_routed():
+    @version('1.0.0')
+    def split(x):
+        return ('v1', x)
+
+    @version('2.0.0')
+    def split(x):
+        return ('v2', x)
+
+    @version('3.0.0')
+    def split(x):
+        return ('v3', x)
+
+    split.route({'2.0.0': 1, '3.0.0': 1})
+    shadow = split.shadow('3.0.0', sample_rate=1, compare=lambda a, b: a[1] == b[1])
+    # The dark-launched candidate gets no routed traffic and is compared against the routed version
+    assert {split(x)[0] for x in range(20)} == {'v2'}
+    _wait_for(lambda: shadow.completed == 20)
+    assert shadow.matches == 20
+
+    # A router left with only the candidate serves as if there was no router
+    split.route({'3.0.0': 1})
+    assert split(1) == ('v2', 1)
+    split.stop_shadow()
+    assert {split(x)[0] for x in range(20)} == {'v3'}
+    split.stop_routing()
+
+
+class Parser:
+    @version('1.0.0')
+    def parse(self, text):
+        return text.split(',')
+
+
+class StrictParser(Parser):
+    @version('2.0.0')
+    def parse(self, text):
+        return [part.strip() for part in text.split(',')]
+
+
+def test_shadow_through_view():
+    shadow = StrictParser.parse.shadow('2.0.0', sample_rate=1)
+    # The subclass's candidate serves no traffic; the inherited version keeps serving
+    assert StrictParser().parse('a, b') == ['a', ' b']
+    _wait_for(lambda: shadow.completed == 1)
+    assert shadow.mismatches == 1
+    StrictParser.__dict__['parse']._owner_cache.clear()
+    assert StrictParser.parse._shadow is shadow
+    assert StrictParser.parse.stop_shadow() is shadow
+    assert StrictParser().parse('a, b') == ['a', 'b']
@@ -0,0 +1,107 @@
+import asyncio
+
+import pytest
+
+from funcversion import version
+
+
+def test_concurrent_identical_calls_share_one_execution():
+    started = []
+
+    @version('1.0.0')
+    async def lookup(key, scale=1):
+        started.append(key)
+        await asyncio.sleep(0.01)
+        return key * scale
+
+    lookup.enable_coalescing()
+
+    async def main():
+        return await asyncio.gather(*(lookup(k) for k in (1, 1, 2, 1)), lookup(1, scale=2), lookup([1]))
+
+    assert asyncio.run(main()) == [1, 1, 2, 1, 2, [1]]
+    # Unhashable arguments run on their own
+    assert sorted(started, key=repr) == [1, 1, 2, [1]]
+    flight = lookup.coalescing_info('1.0.0')
+    assert (flight.executions, flight.coalesced) == (3, 2)
+
+    # Without a ttl, finished calls are not reused
+    asyncio.run(main())
+    assert flight.executions == 6 and flight.reused == 0
+
+    lookup.disable_coalescing()
+    assert lookup.coalescing_info('1.0.0') is None
+
+
+def test_coalescing_is_per_version():
+    started = []
+
+    @version('1.0.0')
+    async def fetch(key):
+        started.append(('1.0.0', key))
+        await asyncio.sleep(0.01)
+        return 1
+
+    @version('2.0.0')
+    async def fetch(key):
+        started.append(('2.0.0', key))
+        await asyncio.sleep(0.01)
+        return 2
+
+    fetch.enable_coalescing()
+
+    async def main():
+        return await asyncio.gather(fetch('a'), fetch('a', _version='1.0.0'), fetch('a'), fetch('a', _version='1.0.0'))
+
+    assert asyncio.run(main()) == [2, 1, 2, 1]
+    assert sorted(started) == [('1.0.0', 'a'), ('2.0.0', 'a')]
+
+
+def test_ttl_reuses_results_but_not_exceptions():
+    started = []
+
+    @version('1.0.0')
+    async def quote(key):
+        started.append(key)
+        await asyncio.sleep(0)
+        if key < 0:
+            raise ValueError(key)
+        return key
+
+    quote.enable_coalescing(ttl=60)
+
+    async def main():
+        assert await quote(1) == 1
+        assert await quote(1) == 1
+        for _ in range(2):
+            with pytest.raises(ValueError):
+                await quote(-1)
+
+    asyncio.run(main())
+    assert started == [1, -1, -1]
+    assert quote.coalescing_info('1.0.0').reused == 1
+
+    with pytest.raises(ValueError):
+        quote.enable_coalescing(ttl=0)
+
+
+def test_cancelled_caller_does_not_cancel_shared_call():
+    finished = []
+
+    @version('1.0.0')
+    async def slow(key):
+        await asyncio.sleep(0.02)
+        finished.append(key)
+        return key
+
+    slow.enable_coalescing()
+
+    async def main():
+        first = asyncio.ensure_future(slow('k'))
+        second = asyncio.ensure_future(slow('k'))
+        await asyncio.sleep(0.005)
+        first.cancel()
+        return await second
+
+    assert asyncio.run(main()) == 'k'
+    assert finished == ['k']